@@ -0,0 +1,91 @@
+import random
+import timeit
+
+from PIL import Image, ImageDraw
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+
+
+class PerCharacterCodeImageGenerator(CodeImageGenerator):
+    def generate_image(self, code_file: CodeFile) -> Image.Image:
+        lines = code_file.content.splitlines(keepends=True)
+        content_width = max((sum(self._get_char_offset(char) for char in line) for line in lines), default=0)
+        content_height = len(lines) * self.point_height
+
+        image = Image.new(
+            "RGB",
+            (max(self.image_min_width, content_width), max(self.image_min_height, content_height)),
+            self.background_color
+        )
+        draw = ImageDraw.Draw(image)
+
+        for line_index, line in enumerate(lines):
+            x_offset = 0
+            y_offset = line_index * self.point_height
+            for char in line:
+                color = self.background_color if char in (' ', '\t', '\n') else self.text_color
+                draw.rectangle(
+                    [x_offset, y_offset, x_offset + self.point_width, y_offset + self.point_height],
+                    fill=color
+                )
+                x_offset += self._get_char_offset(char)
+
+        return image
+
+    def _get_char_offset(self, char: str) -> int:
+        return self.tab_size * self.point_width if char == '\t' else self.point_width
+
+
+def generate_source(line_count: int, seed: int = 0) -> str:
+    generator = random.Random(seed)
+    lines = []
+    for _ in range(line_count):
+        indentation = "\t" * generator.randint(0, 3) + " " * generator.choice((0, 2, 4))
+        words = [
+            "".join(generator.choice("abcdefghijklmnopqrstuvwxyz(){};=") for _ in range(generator.randint(1, 10)))
+            for _ in range(generator.randint(0, 8))
+        ]
+        lines.append(indentation + " ".join(words))
+    return "\n".join(lines)
+
+
+def run_benchmark(line_count: int = 2000, repeat: int = 3):
+    code_file = CodeFile(generate_source(line_count), "benchmark.txt")
+    renderers = {
+        "per-character": PerCharacterCodeImageGenerator(400, 300, 3, 5),
+        "vectorized": CodeImageGenerator(400, 300, 3, 5),
+    }
+
+    reference = renderers["per-character"].generate_image(code_file).tobytes()
+    if renderers["vectorized"].generate_image(code_file).tobytes() != reference:
+        raise AssertionError("Vectorized output differs from the per-character renderer.")
+
+    timings = {}
+    for name, renderer in renderers.items():
+        timings[name] = min(timeit.repeat(lambda: renderer.generate_image(code_file), number=1, repeat=repeat))
+        print(f"{name:>14}: {timings[name] * 1000:9.1f} ms for {line_count} lines")
+
+    print(f"{'speedup':>14}: {timings['per-character'] / timings['vectorized']:9.1f}x")
+
+
+def run_thumbnail_benchmark(line_count: int = 20_000, thumbnail_size: tuple[int, int] = (500, 1000), repeat: int = 3):
+    code_file = CodeFile(generate_source(line_count), "benchmark.txt")
+    renderers = {
+        "resampled": CodeImageGenerator(400, 300, 3, 5),
+        "coverage": CodeImageGenerator(400, 300, 3, 5, coverage_thumbnails=True),
+    }
+
+    timings = {}
+    for name, renderer in renderers.items():
+        timings[name] = min(timeit.repeat(
+            lambda: renderer.generate_thumbnail(code_file, thumbnail_size), number=1, repeat=repeat
+        ))
+        print(f"{name:>14}: {timings[name] * 1000:9.1f} ms for a {line_count} line thumbnail")
+
+    print(f"{'speedup':>14}: {timings['resampled'] / timings['coverage']:9.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
+    run_thumbnail_benchmark()
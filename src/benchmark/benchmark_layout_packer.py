@@ -0,0 +1,69 @@
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+from PIL import Image
+
+from src.main.python.image_composition.image_concatenator import ImageConcatenator
+from src.main.python.image_composition.layout_packer import ShelfPacker, SkylinePacker
+
+THUMBNAIL_SIZE = (120, 240)
+COLUMNS = 20
+
+
+def lognormal_sizes(count: int, generator: random.Random) -> List[Tuple[int, int]]:
+    # Most source files are short, a few are very long: heights follow a log-normal distribution.
+    heights = (min(THUMBNAIL_SIZE[1], max(10, int(generator.lognormvariate(3.5, 0.8)))) for _ in range(count))
+    return [(generator.randint(40, THUMBNAIL_SIZE[0]), height) for height in heights]
+
+
+def uniform_sizes(count: int, generator: random.Random) -> List[Tuple[int, int]]:
+    return [(generator.randint(10, THUMBNAIL_SIZE[0]), generator.randint(10, THUMBNAIL_SIZE[1])) for _ in range(count)]
+
+
+def bimodal_sizes(count: int, generator: random.Random) -> List[Tuple[int, int]]:
+    return [
+        (THUMBNAIL_SIZE[0], THUMBNAIL_SIZE[1] if generator.random() < 0.1 else generator.randint(10, 30))
+        for _ in range(count)
+    ]
+
+
+DISTRIBUTIONS: Dict[str, Callable[[int, random.Random], List[Tuple[int, int]]]] = {
+    "lognormal": lognormal_sizes,
+    "uniform": uniform_sizes,
+    "bimodal": bimodal_sizes,
+}
+
+
+def compose(images: List[Image.Image], packer) -> Tuple[float, float, Tuple[int, int]]:
+    concatenator = ImageConcatenator(columns=COLUMNS, packer=packer)
+    concatenator.images = images
+
+    start = time.perf_counter()
+    layout = concatenator.layout()
+    composite = concatenator.concatenate()
+    return time.perf_counter() - start, layout.fill_ratio, composite.size
+
+
+def run_benchmark(image_count: int = 2_000, seed: int = 0):
+    canvas_width = COLUMNS * THUMBNAIL_SIZE[0]
+    layouts = {
+        "grid": None,
+        "shelf": ShelfPacker(canvas_width),
+        "skyline": SkylinePacker(canvas_width),
+    }
+
+    print(f"{image_count} thumbnails up to {THUMBNAIL_SIZE[0]}x{THUMBNAIL_SIZE[1]}, canvas {canvas_width} px wide")
+    for name, distribution in DISTRIBUTIONS.items():
+        # Sorted tallest first, as the pipeline delivers them; the grid takes its cell size from the first image.
+        sizes = sorted(distribution(image_count, random.Random(seed)), key=lambda size: size[1], reverse=True)
+        images = [Image.new("RGB", size, (188, 190, 196)) for size in sizes]
+
+        for layout_name, packer in layouts.items():
+            elapsed, fill_ratio, canvas_size = compose(images, packer)
+            print(f"{name:>10} {layout_name:>8}: fill {fill_ratio:6.1%}  "
+                  f"canvas {canvas_size[0]}x{canvas_size[1]:<7} compose {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
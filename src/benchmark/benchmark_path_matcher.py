@@ -0,0 +1,52 @@
+import fnmatch
+import random
+import timeit
+from pathlib import PurePosixPath
+
+from src.main.python.code_loading.path_matcher import PathMatcher
+
+IGNORE_PATTERNS = [
+    "**/__pycache__/**", "**/venv/**", "**/.venv/**", "**/node_modules/**", "**/build/**", "**/dist/**",
+    "**/.git/**", "**/.idea/**", "**/.vscode/**", "**/target/**", "**/out/**", "**/bin/**", "**/obj/**",
+    "**/coverage/**", "**/.tox/**", "**/.mypy_cache/**", "**/.pytest_cache/**", "*.min.js", "*.map",
+    "*.lock", "*.log", "*.tmp", "*.bak", "*.swp", "*_pb2.py", "*.generated.*", "vendor", "third_party",
+    "*.snap", "**/migrations/**", "**/fixtures/**", "*.egg-info",
+]
+DIRECTORY_NAMES = ["src", "lib", "core", "api", "util", "model", "view", "service", "test", "build", "venv", "web"]
+FILE_EXTENSIONS = [".py", ".js", ".java", ".min.js", ".log", ".txt"]
+
+
+def generate_deep_tree(path_count: int, max_depth: int = 12, seed: int = 0) -> list[str]:
+    generator = random.Random(seed)
+    paths = []
+    for index in range(path_count):
+        depth = generator.randint(1, max_depth)
+        directories = [generator.choice(DIRECTORY_NAMES) for _ in range(depth)]
+        filename = f"file_{index}{generator.choice(FILE_EXTENSIONS)}"
+        paths.append("/home/user/repository/" + "/".join(directories + [filename]))
+    return paths
+
+
+def fnmatch_is_ignored(path: str, patterns: list[str]) -> bool:
+    name = PurePosixPath(path).name
+    return any(fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def run_benchmark(path_count: int = 50_000, repeat: int = 3):
+    paths = generate_deep_tree(path_count)
+    matcher = PathMatcher(IGNORE_PATTERNS)
+
+    fnmatch_time = min(timeit.repeat(
+        lambda: [fnmatch_is_ignored(path, IGNORE_PATTERNS) for path in paths], number=1, repeat=repeat
+    ))
+    compiled_time = min(timeit.repeat(lambda: [matcher.matches(path) for path in paths], number=1, repeat=repeat))
+    ignored = sum(matcher.matches(path) for path in paths)
+
+    print(f"{len(IGNORE_PATTERNS)} patterns, {path_count} paths up to 12 levels deep, {ignored} ignored")
+    print(f"{'fnmatch':>10}: {fnmatch_time * 1000:9.1f} ms")
+    print(f"{'compiled':>10}: {compiled_time * 1000:9.1f} ms")
+    print(f"{'speedup':>10}: {fnmatch_time / compiled_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
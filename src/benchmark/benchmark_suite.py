@@ -0,0 +1,258 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.benchmark.synthetic_repository import SyntheticRepository, SyntheticRepositorySpec
+from src.main.python.code_loading.directory_walker import DirectoryWalker
+from src.main.python.code_loading.file_system_loader import FileSystemLoader
+from src.main.python.code_loading.mapped_file_reader import MappedFileReader
+from src.main.python.image_composition.html_image_composer import HtmlImageComposer
+from src.main.python.image_composition.image_concatenator import ImageConcatenator
+from src.main.python.image_composition.image_writer import ImageWriter
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+
+FILE_PATTERNS = ["*.py", "*.java", "*.js"]
+HTML_THUMBNAIL_SIZE = (500, 1000)
+CONCATENATION_THUMBNAIL_SIZE = (200, 200)
+DEFAULT_BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+
+@dataclass
+class StageResult:
+    name: str
+    seconds: float
+    items: int
+    bytes: int
+    pixels: int
+    peak_rss_mb: float
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes / 1024 ** 2 / self.seconds if self.seconds else 0.0
+
+
+def create_loader() -> FileSystemLoader:
+    return FileSystemLoader(DirectoryWalker(), MappedFileReader())
+
+
+def create_generator() -> CodeImageGenerator:
+    return CodeImageGenerator(400, 300, 3, 5, coverage_thumbnails=True, image_mode="P")
+
+
+def content_size(code_file) -> int:
+    return len(code_file.raw_content) if code_file.raw_content is not None else len(code_file.content)
+
+
+def measure_discovery(repository: str, output: str) -> tuple[float, int, int, int]:
+    start = time.perf_counter()
+    code_files = create_loader().load_code_files([repository], FILE_PATTERNS)
+    seconds = time.perf_counter() - start
+    return seconds, len(code_files), sum(map(content_size, code_files)), 0
+
+
+def measure_rendering(repository: str, output: str) -> tuple[float, int, int, int]:
+    code_files = create_loader().load_code_files([repository], FILE_PATTERNS)
+    generator = create_generator()
+
+    pixels = 0
+    start = time.perf_counter()
+    for code_file in code_files:
+        image = generator.generate_image(code_file)
+        pixels += image.width * image.height
+    seconds = time.perf_counter() - start
+    return seconds, len(code_files), sum(map(content_size, code_files)), pixels
+
+
+def render_thumbnails(repository: str, thumbnail_size: tuple[int, int]) -> list:
+    generator = create_generator()
+    code_files = create_loader().load_code_files([repository], FILE_PATTERNS)
+    return [(generator.generate_thumbnail(code_file, thumbnail_size), code_file) for code_file in code_files]
+
+
+def measure_composition(repository: str, output: str) -> tuple[float, int, int, int]:
+    thumbnails = render_thumbnails(repository, HTML_THUMBNAIL_SIZE)
+    composer = HtmlImageComposer(output, columns=20, thumbnail_size=HTML_THUMBNAIL_SIZE,
+                                 writer=ImageWriter(palette=True))
+
+    start = time.perf_counter()
+    for thumbnail, code_file in thumbnails:
+        composer.add_thumbnail(thumbnail, code_file)
+    composer.generate_html()
+    seconds = time.perf_counter() - start
+
+    written_bytes = sum(path.stat().st_size for path in Path(output).rglob("*") if path.is_file())
+    pixels = sum(thumbnail.width * thumbnail.height for thumbnail, _ in thumbnails)
+    return seconds, len(thumbnails), written_bytes, pixels
+
+
+def measure_concatenation(repository: str, output: str) -> tuple[float, int, int, int]:
+    thumbnails = render_thumbnails(repository, CONCATENATION_THUMBNAIL_SIZE)
+    concatenator = ImageConcatenator(columns=20, max_thumbnail_size=CONCATENATION_THUMBNAIL_SIZE)
+
+    start = time.perf_counter()
+    for thumbnail, code_file in thumbnails:
+        concatenator.add_thumbnail(thumbnail, code_file)
+    composite = concatenator.concatenate()
+    seconds = time.perf_counter() - start
+    return seconds, len(thumbnails), 0, composite.width * composite.height
+
+
+STAGES: Dict[str, Callable[[str, str], tuple[float, int, int, int]]] = {
+    "discovery": measure_discovery,
+    "rendering": measure_rendering,
+    "composition": measure_composition,
+    "concatenation": measure_concatenation,
+}
+
+
+def run_stage(name: str, repository: str) -> StageResult:
+    with tempfile.TemporaryDirectory() as output:
+        seconds, items, byte_count, pixels = STAGES[name](repository, output)
+
+    # ru_maxrss is reported in kilobytes on Linux; every stage runs in a fresh process,
+    # so this is the peak of that stage including its untimed setup.
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return StageResult(name, seconds, items, byte_count, pixels, peak_rss_mb)
+
+
+def run_isolated(name: str, repository: str, repeat: int) -> StageResult:
+    results = []
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results.append(executor.submit(run_stage, name, repository).result())
+    return min(results, key=lambda result: result.seconds)
+
+
+def find_regressions(results: List[StageResult], baseline: dict, threshold: float) -> List[str]:
+    regressions = []
+    for result in results:
+        reference = baseline["stages"].get(result.name)
+        if not reference:
+            continue
+
+        for metric in ("seconds", "peak_rss_mb"):
+            current, previous = getattr(result, metric), reference[metric]
+            if previous and current > previous * (1 + threshold):
+                regressions.append(
+                    f"{result.name} {metric}: {current:.3f} vs baseline {previous:.3f} "
+                    f"(+{(current / previous - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def host_description() -> dict:
+    # Timings and peak memory only compare meaningfully on the machine and interpreter that recorded them.
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "system": platform.system(),
+        "python": platform.python_version()
+    }
+
+
+def to_baseline(spec: SyntheticRepositorySpec, results: List[StageResult]) -> dict:
+    return {
+        "host": host_description(),
+        "spec": asdict(spec),
+        "stages": {
+            result.name: {
+                **asdict(result),
+                "items_per_second": result.items_per_second,
+                "megabytes_per_second": result.megabytes_per_second
+            }
+            for result in results
+        }
+    }
+
+
+def print_results(results: List[StageResult]):
+    print(f"{'stage':>14} {'seconds':>9} {'files/s':>9} {'MB/s':>8} {'Mpixels':>9} {'peak RSS':>10}")
+    for result in results:
+        print(f"{result.name:>14} {result.seconds:9.3f} {result.items_per_second:9.1f} "
+              f"{result.megabytes_per_second:8.2f} {result.pixels / 1e6:9.1f} {result.peak_rss_mb:7.1f} MB")
+
+
+def parse_arguments(arguments: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark each pipeline stage on a synthetic repository.")
+    parser.add_argument("--files", type=int, default=SyntheticRepositorySpec.file_count)
+    parser.add_argument("--max-lines", type=int, default=SyntheticRepositorySpec.max_lines)
+    parser.add_argument("--max-line-length", type=int, default=SyntheticRepositorySpec.max_line_length)
+    parser.add_argument("--max-depth", type=int, default=SyntheticRepositorySpec.max_depth)
+    parser.add_argument("--tab-ratio", type=float, default=SyntheticRepositorySpec.tab_ratio)
+    parser.add_argument("--binary-ratio", type=float, default=SyntheticRepositorySpec.binary_ratio)
+    parser.add_argument("--latin1-ratio", type=float, default=SyntheticRepositorySpec.latin1_ratio)
+    parser.add_argument("--seed", type=int, default=SyntheticRepositorySpec.seed)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=1, help="run each stage this often and keep the fastest run")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before reporting")
+    return parser.parse_args(arguments)
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    options = parse_arguments(arguments)
+    spec = SyntheticRepositorySpec(
+        file_count=options.files,
+        max_lines=options.max_lines,
+        max_line_length=options.max_line_length,
+        max_depth=options.max_depth,
+        tab_ratio=options.tab_ratio,
+        binary_ratio=options.binary_ratio,
+        latin1_ratio=options.latin1_ratio,
+        seed=options.seed
+    )
+
+    repository = tempfile.mkdtemp(prefix="code-visualizer-benchmark-")
+    try:
+        stats = SyntheticRepository(spec).generate(repository)
+        print(f"Synthetic repository: {stats.source_files} source files, {stats.binary_files} binary, "
+              f"{stats.latin1_files} Latin-1, {stats.lines} lines, {stats.bytes / 1024 ** 2:.1f} MB")
+        results = [run_isolated(name, repository, options.repeat) for name in options.stages]
+    finally:
+        shutil.rmtree(repository)
+
+    print_results(results)
+
+    if options.save_baseline:
+        options.baseline.write_text(json.dumps(to_baseline(spec, results), indent=2) + "\n")
+        print(f"Baseline written to {options.baseline}")
+        return 0
+
+    if not options.baseline.exists():
+        return 0
+
+    baseline = json.loads(options.baseline.read_text())
+    if baseline["spec"] != asdict(spec):
+        print("Baseline was recorded with a different repository spec; skipping the comparison.")
+        return 0
+    if baseline.get("host") != host_description():
+        print("Baseline was recorded on a different host; skipping the comparison. "
+              "Record a local one with --save-baseline.")
+        return 0
+
+    regressions = find_regressions(results, baseline, options.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+DIRECTORY_NAMES = ["src", "lib", "core", "api", "util", "model", "view", "service", "internal", "web"]
+SOURCE_EXTENSIONS = [".py", ".java", ".js"]
+IDENTIFIER_CHARACTERS = "abcdefghijklmnopqrstuvwxyz_"
+PUNCTUATION = "(){}[];=.,:+-*/<>"
+LATIN1_CHARACTERS = "äöüßéèàçñ"
+
+
+@dataclass(frozen=True)
+class SyntheticRepositorySpec:
+    file_count: int = 500
+    min_lines: int = 5
+    max_lines: int = 400
+    max_line_length: int = 100
+    max_depth: int = 6
+    tab_ratio: float = 0.3
+    binary_ratio: float = 0.02
+    latin1_ratio: float = 0.05
+    seed: int = 0
+
+
+@dataclass
+class SyntheticRepositoryStats:
+    source_files: int = 0
+    binary_files: int = 0
+    latin1_files: int = 0
+    lines: int = 0
+    bytes: int = 0
+
+
+class SyntheticRepository:
+    def __init__(self, spec: SyntheticRepositorySpec = SyntheticRepositorySpec()):
+        self.spec = spec
+        self.random = random.Random(spec.seed)
+
+    def generate(self, root: str) -> SyntheticRepositoryStats:
+        stats = SyntheticRepositoryStats()
+        for index in range(self.spec.file_count):
+            directory = Path(root).joinpath(*self._directory_parts())
+            directory.mkdir(parents=True, exist_ok=True)
+
+            kind = self.random.random()
+            if kind < self.spec.binary_ratio:
+                data = self._binary_content()
+                stats.binary_files += 1
+            else:
+                lines = self._source_lines()
+                if kind < self.spec.binary_ratio + self.spec.latin1_ratio:
+                    data = "\n".join(lines).encode("latin-1")
+                    stats.latin1_files += 1
+                else:
+                    data = "\n".join(lines).encode("utf-8")
+                stats.source_files += 1
+                stats.lines += len(lines)
+
+            extension = self.random.choice(SOURCE_EXTENSIONS)
+            (directory / f"file_{index}{extension}").write_bytes(data)
+            stats.bytes += len(data)
+        return stats
+
+    def _directory_parts(self) -> list[str]:
+        depth = self.random.randint(0, self.spec.max_depth)
+        return [self.random.choice(DIRECTORY_NAMES) for _ in range(depth)]
+
+    def _source_lines(self) -> list[str]:
+        use_tabs = self.random.random() < self.spec.tab_ratio
+        indentation_unit = "\t" if use_tabs else "    "
+        lines = []
+        depth = 0
+        for _ in range(self.random.randint(self.spec.min_lines, self.spec.max_lines)):
+            depth = max(0, min(8, depth + self.random.choice((-1, 0, 0, 1))))
+            if self.random.random() < 0.1:
+                lines.append("")
+                continue
+
+            indentation = indentation_unit * depth
+            length = self.random.randint(1, max(1, self.spec.max_line_length - len(indentation)))
+            lines.append(indentation + self._statement(length))
+        return lines
+
+    def _statement(self, length: int) -> str:
+        tokens = []
+        size = 0
+        while size < length:
+            token = "".join(self.random.choice(IDENTIFIER_CHARACTERS) for _ in range(self.random.randint(1, 12)))
+            if self.random.random() < 0.3:
+                token += self.random.choice(PUNCTUATION)
+            if self.random.random() < 0.02:
+                token += self.random.choice(LATIN1_CHARACTERS)
+            tokens.append(token)
+            size += len(token) + 1
+        return " ".join(tokens)[:length]
+
+    def _binary_content(self) -> bytes:
+        return bytes(self.random.getrandbits(8) for _ in range(self.random.randint(64, 4096))) + b"\0"
@@ -1,3 +1,4 @@
+import hashlib
 from dataclasses import dataclass
 from typing import Optional
 
@@ -6,3 +7,25 @@ from typing import Optional
 class CodeFile:
     content: str
     filename: Optional[str] = None
+    raw_content: Optional[bytes] = None
+    object_id: Optional[str] = None
+
+    def content_hash(self) -> str:
+        # Hashes are git blob ids, so content read from a git object database already knows its hash.
+        if self.object_id:
+            return self.object_id
+
+        data = self.raw_content
+        if data is None:
+            data = self.content.encode("utf-8", "surrogatepass")
+
+        digest = hashlib.sha1(b"blob %d\0" % len(data))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def __getstate__(self) -> dict:
+        # Memory-mapped content cannot be pickled, so it is copied when sent to worker processes.
+        state = self.__dict__.copy()
+        if state["raw_content"] is not None:
+            state["raw_content"] = bytes(state["raw_content"])
+        return state
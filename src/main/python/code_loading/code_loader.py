@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import List
+from typing import Iterator, List
 
 from src.main.python.code_loading.code_file import CodeFile
 
@@ -13,3 +13,11 @@ class CodeLoader:
         ignore_patterns: List[str] = None
     ) -> List[CodeFile]:
         pass
+
+    def iter_code_files(
+        self,
+        file_source: List[str],
+        file_pattern: List[str],
+        ignore_patterns: List[str] = None
+    ) -> Iterator[CodeFile]:
+        yield from self.load_code_files(file_source, file_pattern, ignore_patterns)
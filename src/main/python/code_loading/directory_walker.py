@@ -0,0 +1,92 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from src.main.python.code_loading.gitignore_rules import GitignoreRules
+from src.main.python.code_loading.path_matcher import PathMatcher
+
+RulesChain = Tuple[GitignoreRules, ...]
+
+
+class DirectoryWalker:
+    GITIGNORE_FILENAME = ".gitignore"
+    GIT_DIRECTORY_NAME = ".git"
+
+    def __init__(self, max_workers: int = 8, use_gitignore: bool = True):
+        self.max_workers = max_workers
+        self.use_gitignore = use_gitignore
+
+    def walk(
+            self,
+            root: str,
+            file_matcher: PathMatcher,
+            ignore_matcher: Optional[PathMatcher] = None
+    ) -> Iterator[str]:
+        ignore_matcher = PathMatcher.of(ignore_matcher)
+        level = [(str(root), ())]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while level:
+                next_level = []
+                scans = executor.map(
+                    lambda directory: self._scan_directory(*directory, file_matcher, ignore_matcher),
+                    level
+                )
+                for files, subdirectories in scans:
+                    yield from files
+                    next_level.extend(subdirectories)
+                level = next_level
+
+    def _scan_directory(
+            self,
+            directory: str,
+            rules: RulesChain,
+            file_matcher: PathMatcher,
+            ignore_matcher: PathMatcher
+    ) -> Tuple[List[str], List[Tuple[str, RulesChain]]]:
+        try:
+            with os.scandir(directory) as scanner:
+                entries = sorted(scanner, key=lambda entry: entry.name)
+        except OSError:
+            return [], []
+
+        if self.use_gitignore and any(entry.name == self.GITIGNORE_FILENAME for entry in entries):
+            rules = rules + (GitignoreRules.from_file(os.path.join(directory, self.GITIGNORE_FILENAME)),)
+
+        files = []
+        subdirectories = []
+        for entry in entries:
+            is_directory = self._is_directory(entry)
+            if self._is_excluded(entry, is_directory, rules, ignore_matcher):
+                continue
+
+            if is_directory:
+                if not entry.is_symlink():
+                    subdirectories.append((entry.path, rules))
+            elif file_matcher.matches(entry.name):
+                files.append(entry.path)
+
+        return files, subdirectories
+
+    def _is_excluded(
+            self,
+            entry: os.DirEntry,
+            is_directory: bool,
+            rules: RulesChain,
+            ignore_matcher: PathMatcher
+    ) -> bool:
+        if ignore_matcher.matches(entry.path):
+            return True
+
+        if not self.use_gitignore:
+            return False
+
+        if is_directory and entry.name == self.GIT_DIRECTORY_NAME:
+            return True
+        return GitignoreRules.is_ignored(rules, entry.path, is_directory)
+
+    @staticmethod
+    def _is_directory(entry: os.DirEntry) -> bool:
+        try:
+            return entry.is_dir()
+        except OSError:
+            return False
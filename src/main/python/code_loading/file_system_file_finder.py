@@ -1,12 +1,16 @@
 from pathlib import Path
 
+from src.main.python.code_loading.directory_walker import DirectoryWalker
+from src.main.python.code_loading.path_matcher import PathMatcher
+
 
 class FileSystemFileFinder:
     DIRECTORY_NOT_FOUND_ERROR = "The directory {directory} does not exist."
     EMPTY_FILE_PATTERN_ERROR = "No file patterns provided. Please provide at least one file pattern."
 
-    def __init__(self, directory):
+    def __init__(self, directory, walker=None):
         self.directory = Path(directory)
+        self.walker = walker or DirectoryWalker(use_gitignore=False)
 
     def find_files(self, extensions):
         if not self.directory.exists():
@@ -15,12 +19,4 @@ class FileSystemFileFinder:
         if not extensions:
             raise ValueError(self.EMPTY_FILE_PATTERN_ERROR)
 
-        files = []
-        for ext in extensions:
-            self.add_file_by_extension(files, ext)
-
-        return files
-
-    def add_file_by_extension(self, files, ext):
-        for file in self.directory.rglob(ext):
-            files.append(file)
+        return [Path(file) for file in self.walker.walk(str(self.directory), PathMatcher(extensions))]
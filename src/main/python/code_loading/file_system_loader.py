@@ -1,90 +1,116 @@
 import os
-import fnmatch
-from typing import List, Iterable
+from typing import List, Iterable, Iterator, Optional, Union
 from pathlib import Path
 
 from src.main.python.code_loading.code_file import CodeFile
 from src.main.python.code_loading.code_loader import CodeLoader
+from src.main.python.code_loading.directory_walker import DirectoryWalker
+from src.main.python.code_loading.mapped_file_reader import MappedFileReader
+from src.main.python.code_loading.path_matcher import PathMatcher
+
+Patterns = Union[List[str], PathMatcher]
 
 
 class FileSystemLoader(CodeLoader):
+    def __init__(
+            self,
+            directory_walker: Optional[DirectoryWalker] = None,
+            file_reader: Optional[MappedFileReader] = None
+    ):
+        self.directory_walker = directory_walker
+        self.file_reader = file_reader
+
     def load_code_files(
             self,
             source_paths: List[str],
             file_patterns: List[str],
             ignore_patterns: List[str] = None
     ) -> List[CodeFile]:
-        ignore_patterns = ignore_patterns or []
-        code_files = []
+        return list(self.iter_code_files(source_paths, file_patterns, ignore_patterns))
+
+    def iter_code_files(
+            self,
+            source_paths: List[str],
+            file_patterns: List[str],
+            ignore_patterns: List[str] = None
+    ) -> Iterator[CodeFile]:
+        file_matcher = PathMatcher(file_patterns)
+        ignore_matcher = PathMatcher(ignore_patterns or [])
         for path in source_paths:
-            code_files.extend(self._process_path(path, file_patterns, ignore_patterns))
-        return code_files
+            yield from self._process_path(path, file_matcher, ignore_matcher)
+
+    def load_file(self, file_path: str) -> CodeFile:
+        return self._read_file(Path(file_path)) or CodeFile(content="", filename=file_path)
 
     def _process_path(
             self,
             path: str,
-            file_patterns: List[str],
-            ignore_patterns: List[str]
-    ) -> List[CodeFile]:
+            file_patterns: Patterns,
+            ignore_patterns: Patterns
+    ) -> Iterator[CodeFile]:
         resolved_path = Path(path).resolve()
 
         if not resolved_path.exists() or self._is_ignored(resolved_path, ignore_patterns):
-            return []
+            return
 
         if resolved_path.is_file():
-            return self._process_single_file(resolved_path, file_patterns, ignore_patterns)
+            yield from self._process_single_file(resolved_path, file_patterns)
 
-        if resolved_path.is_dir():
-            return self._process_directory(resolved_path, file_patterns, ignore_patterns)
-
-        return []
+        elif resolved_path.is_dir():
+            yield from self._process_directory(resolved_path, file_patterns, ignore_patterns)
 
     def _process_directory(
             self,
             directory: Path,
-            file_patterns: List[str],
-            ignore_patterns: List[str]
-    ) -> List[CodeFile]:
-        matched_files = []
+            file_patterns: Patterns,
+            ignore_patterns: Patterns
+    ) -> Iterator[CodeFile]:
+        if self.directory_walker:
+            for file_path in self.directory_walker.walk(str(directory), file_patterns, ignore_patterns):
+                code_file = self._read_file(Path(file_path))
+                if code_file:
+                    yield code_file
+            return
+
         for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if not self._is_ignored(Path(root) / d, ignore_patterns)]
-
-            matched_files.extend(
-                self._find_matching_files(
-                    Path(root),
-                    files,
-                    file_patterns,
-                    ignore_patterns
-                )
+            dirs[:] = [d for d in dirs if not self._is_ignored(os.path.join(root, d), ignore_patterns)]
+
+            yield from self._find_matching_files(
+                Path(root),
+                files,
+                file_patterns,
+                ignore_patterns
             )
-        return matched_files
 
     def _find_matching_files(
             self,
             directory: Path,
             filenames: Iterable[str],
-            file_patterns: List[str],
-            ignore_patterns: List[str]
-    ) -> List[CodeFile]:
-        return [
-            self._load_file_content(directory / filename)
+            file_patterns: Patterns,
+            ignore_patterns: Patterns
+    ) -> Iterator[CodeFile]:
+        code_files = (
+            self._read_file(directory / filename)
             for filename in filenames
             if (self._filename_matches_patterns(filename, file_patterns) and
                 not self._is_ignored(directory / filename, ignore_patterns))
-        ]
-
-    def _is_ignored(self, path: Path, patterns: List[str]) -> bool:
-        path_str = str(path)
-        return any(
-            fnmatch.fnmatch(path_str, pattern) or
-            fnmatch.fnmatch(path.name, pattern)
-            for pattern in patterns
         )
+        return (code_file for code_file in code_files if code_file)
+
+    def _is_ignored(self, path: Union[Path, str], patterns: Patterns) -> bool:
+        return PathMatcher.of(patterns).matches(path)
+
+    def _process_single_file(self, file_path: Path, file_patterns: Patterns) -> List[CodeFile]:
+        if not self._filename_matches_patterns(file_path.name, file_patterns):
+            return []
+
+        code_file = self._read_file(file_path)
+        return [code_file] if code_file else []
 
-    def _process_single_file(self, file_path: Path, file_patterns: List[str]) -> List[CodeFile]:
-        if self._filename_matches_patterns(file_path.name, file_patterns):
-            return [self._load_file_content(file_path)]
-        return []
+    def _read_file(self, file_path: Path) -> Optional[CodeFile]:
+        if self.file_reader:
+            return self.file_reader.read(file_path)
+        return self._load_file_content(file_path)
 
     def _load_file_content(self, file_path: Path) -> CodeFile:
         try:
@@ -93,5 +119,5 @@ class FileSystemLoader(CodeLoader):
         except UnicodeDecodeError:
             return CodeFile(content="", filename=str(file_path))
 
-    def _filename_matches_patterns(self, filename: str, patterns: List[str]) -> bool:
-        return any(fnmatch.fnmatch(filename, pattern) for pattern in patterns)
+    def _filename_matches_patterns(self, filename: str, patterns: Patterns) -> bool:
+        return PathMatcher.of(patterns).matches(filename)
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Iterator, List, Optional
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.code_loading.file_system_loader import FileSystemLoader
+from src.main.python.code_loading.git_repository import GitRepository
+from src.main.python.code_loading.mapped_file_reader import MappedFileReader
+from src.main.python.code_loading.path_matcher import PathMatcher
+
+
+@dataclass(frozen=True)
+class FileState:
+    filename: str
+    content_hash: Optional[str]
+
+
+class GitFileLoader(FileSystemLoader):
+    def __init__(
+            self,
+            file_reader: Optional[MappedFileReader] = None,
+            include_untracked: bool = True
+    ):
+        super().__init__(file_reader=file_reader or MappedFileReader())
+        self.include_untracked = include_untracked
+
+    def iter_code_files(
+            self,
+            source_paths: List[str],
+            file_patterns: List[str],
+            ignore_patterns: List[str] = None
+    ) -> Iterator[CodeFile]:
+        for file_state in self.iter_file_states(source_paths, file_patterns, ignore_patterns):
+            code_file = self.read_file(file_state.filename)
+            if code_file:
+                yield code_file
+
+    def read_file(self, filename: str) -> Optional[CodeFile]:
+        return self._read_file(Path(filename))
+
+    def iter_file_states(
+            self,
+            source_paths: List[str],
+            file_patterns: List[str],
+            ignore_patterns: List[str] = None
+    ) -> Iterator[FileState]:
+        file_matcher = PathMatcher(file_patterns)
+        ignore_matcher = PathMatcher(ignore_patterns or [])
+        for source_path in source_paths:
+            repository = GitRepository.discover(source_path)
+            yield from self._list_source(repository, source_path, file_matcher, ignore_matcher)
+
+    def _list_source(
+            self,
+            repository: GitRepository,
+            source_path: str,
+            file_matcher: PathMatcher,
+            ignore_matcher: PathMatcher
+    ) -> Iterator[FileState]:
+        source = Path(source_path).resolve()
+        pathspec = repository.relative_path(source_path)
+
+        # Blob ids are content hashes of the index; they only describe files whose work tree copy is unmodified.
+        content_hashes = repository.tracked_files(pathspec)
+        for path in repository.modified_files(pathspec):
+            content_hashes[path] = None
+        for path in repository.deleted_files(pathspec):
+            content_hashes.pop(path, None)
+        if self.include_untracked:
+            content_hashes.update((path, None) for path in repository.untracked_files(pathspec))
+
+        for path in sorted(content_hashes):
+            file_path = repository.root / path
+            if self._is_selected(file_path, source, file_matcher, ignore_matcher):
+                yield FileState(str(file_path), content_hashes[path])
+
+    def _is_selected(
+            self,
+            file_path: Path,
+            source: Path,
+            file_matcher: PathMatcher,
+            ignore_matcher: PathMatcher
+    ) -> bool:
+        if not self._filename_matches_patterns(file_path.name, file_matcher):
+            return False
+
+        # Git lists files only, so ignored directories are checked through the file's ancestors.
+        relative_path = PurePosixPath(file_path.relative_to(source).as_posix())
+        candidates = [file_path, *(source / parent for parent in relative_path.parents)]
+        return not any(self._is_ignored(candidate, ignore_matcher) for candidate in candidates)
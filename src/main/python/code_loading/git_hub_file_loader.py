@@ -1,20 +1,59 @@
+import time
+import tarfile
 import requests
 import re
-import fnmatch
-from typing import List, Optional
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterator, List, Optional, Union
+from pathlib import Path, PurePosixPath
+from urllib.parse import quote
+
+from requests.adapters import HTTPAdapter
 
 from src.main.python.code_loading.code_file import CodeFile
 from src.main.python.code_loading.code_loader import CodeLoader
+from src.main.python.code_loading.path_matcher import PathMatcher
+
+Patterns = Union[List[str], PathMatcher]
 
 
 class GitHubFileLoader(CodeLoader):
     GITHUB_API_URL = "https://api.github.com"
     GITHUB_RAW_URL = "https://raw.githubusercontent.com"
+    GITHUB_ARCHIVE_URL = "{api_url}/repos/{owner}/{repo}/tarball/{ref}"
+    ARCHIVE_STREAM_MODE = "r|gz"
 
-    def __init__(self, token: Optional[str] = None):
+    RATE_LIMIT_STATUS_CODES = (403, 429)
+    RATE_LIMIT_REMAINING_HEADER = "X-RateLimit-Remaining"
+    RATE_LIMIT_RESET_HEADER = "X-RateLimit-Reset"
+    RETRY_AFTER_HEADER = "Retry-After"
+    MAX_RATE_LIMIT_RETRIES = 5
+
+    def __init__(
+            self,
+            token: Optional[str] = None,
+            use_tree_api: bool = False,
+            use_archive: bool = False,
+            max_workers: int = 8,
+            max_rate_limit_wait: float = 900,
+            api_url: str = GITHUB_API_URL,
+            raw_url: str = GITHUB_RAW_URL,
+            archive_url: str = GITHUB_ARCHIVE_URL
+    ):
         self.token = token
+        self.use_tree_api = use_tree_api
+        self.use_archive = use_archive
+        self.archive_url = archive_url
+        self.max_workers = max_workers
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.api_url = api_url.rstrip("/")
+        self.raw_url = raw_url.rstrip("/")
+
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         if token:
             self.session.headers.update({"Authorization": f"token {token}"})
 
@@ -24,45 +63,73 @@ class GitHubFileLoader(CodeLoader):
             file_pattern: List[str],
             ignore_patterns: List[str] = None
     ) -> List[CodeFile]:
-        ignore_patterns = ignore_patterns or []
-        code_files = []
+        return list(self.iter_code_files(urls, file_pattern, ignore_patterns))
+
+    def iter_code_files(
+            self,
+            urls: List[str],
+            file_pattern: List[str],
+            ignore_patterns: List[str] = None
+    ) -> Iterator[CodeFile]:
+        file_matcher = PathMatcher(file_pattern)
+        ignore_matcher = PathMatcher(ignore_patterns or [])
         for url in urls:
             if 'github.com' not in url:
                 continue
 
             if '/blob/' in url:
-                if not self._is_ignored(url, ignore_patterns):
-                    code_files.append(self._load_single_file(url, file_pattern))
+                if not self._is_ignored(url, ignore_matcher):
+                    yield self._load_single_file(url, file_matcher)
             else:
                 repo_info = self._extract_repo_info(url)
-                if repo_info:
-                    code_files.extend(self._scan_repository(
+                if not repo_info:
+                    continue
+
+                if self.use_archive:
+                    yield from self._stream_repository_archive(
+                        owner=repo_info['owner'],
+                        repo=repo_info['repo'],
+                        ref=repo_info['ref'],
+                        path=repo_info['path'],
+                        file_pattern=file_matcher,
+                        ignore_patterns=ignore_matcher
+                    )
+                elif self.use_tree_api:
+                    yield from self._scan_repository_tree(
+                        owner=repo_info['owner'],
+                        repo=repo_info['repo'],
+                        ref=repo_info['ref'],
+                        path=repo_info['path'],
+                        file_pattern=file_matcher,
+                        ignore_patterns=ignore_matcher
+                    )
+                else:
+                    yield from self._scan_repository(
                         owner=repo_info['owner'],
                         repo=repo_info['repo'],
                         path=repo_info.get('path', ''),
-                        file_pattern=file_pattern,
-                        ignore_patterns=ignore_patterns
-                    ))
-        return code_files
+                        file_pattern=file_matcher,
+                        ignore_patterns=ignore_matcher
+                    )
 
-    def _load_single_file(self, file_url: str, file_pattern: List[str]) -> CodeFile:
+    def _load_single_file(self, file_url: str, file_pattern: Patterns) -> CodeFile:
         filename = Path(file_url).name
         if not self._matches_pattern(filename, file_pattern):
             return CodeFile(content="", filename=filename)
 
-        raw_url = file_url.replace('github.com', self.GITHUB_RAW_URL).replace('/blob/', '/')
-        response = self.session.get(raw_url)
-        response.raise_for_status()
+        raw_url = re.sub(r"^.*?github\.com", lambda _: self.raw_url, file_url).replace('/blob/', '/', 1)
+        response = self._get(raw_url)
         return CodeFile(content=response.text, filename=filename)
 
     def _extract_repo_info(self, url: str) -> Optional[dict]:
-        pattern = r"github\.com/([^/]+)/([^/]+)(/tree/[^/]+/(.*))?"
+        pattern = r"github\.com/([^/]+)/([^/]+)(/tree/([^/]+)(/(.*))?)?"
         match = re.search(pattern, url)
         if match:
             return {
                 'owner': match.group(1),
                 'repo': match.group(2),
-                'path': match.group(4) if match.group(4) else ''
+                'ref': match.group(4),
+                'path': (match.group(6) or '').strip('/')
             }
         return None
 
@@ -71,12 +138,12 @@ class GitHubFileLoader(CodeLoader):
             owner: str,
             repo: str,
             path: str,
-            file_pattern: List[str],
-            ignore_patterns: List[str]
+            file_pattern: Patterns,
+            ignore_patterns: Patterns,
+            ref: Optional[str] = None
     ) -> List[CodeFile]:
-        api_url = f"{self.GITHUB_API_URL}/repos/{owner}/{repo}/contents/{path}"
-        response = self.session.get(api_url)
-        response.raise_for_status()
+        api_url = f"{self.api_url}/repos/{owner}/{repo}/contents/{quote(path)}"
+        response = self._get(api_url, params={'ref': ref} if ref else None)
 
         code_files = []
         for item in response.json():
@@ -86,7 +153,7 @@ class GitHubFileLoader(CodeLoader):
 
             if item['type'] == 'file':
                 if self._matches_pattern(item['name'], file_pattern):
-                    file_content = self.session.get(item['download_url']).text
+                    file_content = self._get(item['download_url']).text
                     code_files.append(CodeFile(content=file_content, filename=item_path))
 
             elif item['type'] == 'dir':
@@ -95,17 +162,152 @@ class GitHubFileLoader(CodeLoader):
                     repo=repo,
                     path=item_path,
                     file_pattern=file_pattern,
-                    ignore_patterns=ignore_patterns
+                    ignore_patterns=ignore_patterns,
+                    ref=ref
                 ))
 
         return code_files
 
-    def _is_ignored(self, path: str, patterns: List[str]) -> bool:
-        return any(
-            fnmatch.fnmatch(path, pattern) or
-            fnmatch.fnmatch(Path(path).name, pattern)
-            for pattern in patterns
-        )
+    def _scan_repository_tree(
+            self,
+            owner: str,
+            repo: str,
+            ref: Optional[str],
+            path: str,
+            file_pattern: Patterns,
+            ignore_patterns: Patterns
+    ) -> List[CodeFile]:
+        ref = ref or self._get(f"{self.api_url}/repos/{owner}/{repo}").json()['default_branch']
+        tree = self._get(f"{self.api_url}/repos/{owner}/{repo}/git/trees/{ref}", params={'recursive': '1'}).json()
+
+        if tree.get('truncated'):
+            return self._scan_repository(owner, repo, path, file_pattern, ignore_patterns, ref)
+
+        blob_paths = [
+            item['path']
+            for item in tree['tree']
+            if (item['type'] == 'blob' and
+                self._is_tree_entry_selected(item['path'], path, file_pattern, ignore_patterns))
+        ]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            contents = executor.map(lambda blob_path: self._download_blob(owner, repo, ref, blob_path), blob_paths)
+            return [CodeFile(content=content, filename=blob_path) for blob_path, content in zip(blob_paths, contents)]
+
+    def _stream_repository_archive(
+            self,
+            owner: str,
+            repo: str,
+            ref: Optional[str],
+            path: str,
+            file_pattern: Patterns,
+            ignore_patterns: Patterns
+    ) -> Iterator[CodeFile]:
+        archive_location = self.archive_url.format(api_url=self.api_url, owner=owner, repo=repo, ref=ref or '')
+        if Path(archive_location).is_file():
+            with open(archive_location, 'rb') as archive_file:
+                yield from self._extract_archive(archive_file, path, file_pattern, ignore_patterns)
+            return
+
+        with self._get(archive_location.rstrip('/'), stream=True) as response:
+            response.raw.decode_content = True
+            yield from self._extract_archive(response.raw, path, file_pattern, ignore_patterns)
+
+    def _extract_archive(
+            self,
+            archive_stream,
+            path: str,
+            file_pattern: Patterns,
+            ignore_patterns: Patterns
+    ) -> Iterator[CodeFile]:
+        with tarfile.open(fileobj=archive_stream, mode=self.ARCHIVE_STREAM_MODE) as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+
+                # GitHub archives wrap everything in a single "<owner>-<repo>-<sha>/" directory.
+                _, _, blob_path = member.name.partition('/')
+                if not blob_path or not self._is_tree_entry_selected(blob_path, path, file_pattern, ignore_patterns):
+                    continue
+
+                content = archive.extractfile(member).read()
+                yield CodeFile(content=self._decode(content), filename=blob_path)
+
+    def _decode(self, content: bytes) -> str:
+        try:
+            return content.decode('utf-8')
+        except UnicodeDecodeError:
+            return ""
+
+    def _is_tree_entry_selected(
+            self,
+            blob_path: str,
+            root_path: str,
+            file_pattern: Patterns,
+            ignore_patterns: Patterns
+    ) -> bool:
+        entry = PurePosixPath(blob_path)
+        if root_path and not entry.is_relative_to(root_path):
+            return False
+
+        if not self._matches_pattern(entry.name, file_pattern):
+            return False
+
+        # The contents API never descends into ignored directories, so ancestors are checked as well.
+        ancestors = [str(parent) for parent in entry.parents if str(parent) != '.']
+        return not any(self._is_ignored(candidate, ignore_patterns) for candidate in [blob_path, *ancestors])
+
+    def _download_blob(self, owner: str, repo: str, ref: str, blob_path: str) -> str:
+        return self._get(f"{self.raw_url}/{owner}/{repo}/{quote(ref)}/{quote(blob_path)}").text
+
+    def _get(self, url: str, params: Optional[dict] = None, stream: bool = False) -> requests.Response:
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES):
+            response = self.session.get(url, params=params, stream=stream)
+            wait_seconds = self._rate_limit_wait(response)
+            if wait_seconds is None:
+                break
+            # A streamed response holds its pooled connection until it is closed.
+            response.close()
+            if attempt == self.MAX_RATE_LIMIT_RETRIES - 1:
+                break
+            time.sleep(wait_seconds)
+
+        response.raise_for_status()
+        return response
+
+    def _rate_limit_wait(self, response: requests.Response) -> Optional[float]:
+        if response.status_code not in self.RATE_LIMIT_STATUS_CODES:
+            return None
+
+        retry_after = self._retry_after_seconds(response.headers.get(self.RETRY_AFTER_HEADER))
+        if retry_after is not None:
+            return min(retry_after, self.max_rate_limit_wait)
+
+        if response.headers.get(self.RATE_LIMIT_REMAINING_HEADER) != "0":
+            return None
+
+        reset_at = float(response.headers.get(self.RATE_LIMIT_RESET_HEADER, time.time()))
+        return min(max(reset_at - time.time(), 0) + 1, self.max_rate_limit_wait)
+
+    def _retry_after_seconds(self, retry_after: Optional[str]) -> Optional[float]:
+        # Retry-After is either a number of seconds or an HTTP date.
+        if retry_after is None:
+            return None
+        try:
+            return max(float(retry_after), 0)
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(retry_at.timestamp() - time.time(), 0)
+
+    def _is_ignored(self, path: str, patterns: Patterns) -> bool:
+        return PathMatcher.of(patterns).matches(path)
 
-    def _matches_pattern(self, filename: str, patterns: List[str]) -> bool:
-        return any(fnmatch.fnmatch(filename, pattern) for pattern in patterns)
+    def _matches_pattern(self, filename: str, patterns: Patterns) -> bool:
+        return PathMatcher.of(patterns).matches(filename)
@@ -0,0 +1,160 @@
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.code_loading.code_loader import CodeLoader
+from src.main.python.code_loading.git_file_loader import FileState
+from src.main.python.code_loading.git_object_reader import GitObjectReader
+from src.main.python.code_loading.git_repository import GitRepository, TreeEntry
+from src.main.python.code_loading.mapped_file_reader import MappedFileReader
+from src.main.python.code_loading.path_matcher import PathMatcher
+
+
+class GitObjectLoader(CodeLoader):
+    BLOB_TYPE = "blob"
+    SYMBOLIC_LINK_MODE = "120000"
+    UNKNOWN_FILE_ERROR = "'{filename}' is not part of a listed revision."
+
+    def __init__(
+            self,
+            revision: str = "HEAD",
+            batch_size: int = 256,
+            cache_bytes: int = 256 * 1024 ** 2,
+            binary_detector: Optional[MappedFileReader] = None
+    ):
+        self.revision = revision
+        self.batch_size = batch_size
+        self.cache_bytes = cache_bytes
+        self.binary_detector = binary_detector or MappedFileReader()
+
+        self._readers: Dict[Path, GitObjectReader] = {}
+        self._listed_objects: Dict[str, Tuple[GitRepository, str]] = {}
+        self._blob_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._blob_cache_size = 0
+        self._binary_objects = set()
+
+    def __enter__(self) -> "GitObjectLoader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+
+    @property
+    def objects_read(self) -> int:
+        return sum(reader.objects_read for reader in self._readers.values())
+
+    def load_code_files(
+            self,
+            source_paths: List[str],
+            file_patterns: List[str],
+            ignore_patterns: List[str] = None
+    ) -> List[CodeFile]:
+        return list(self.iter_code_files(source_paths, file_patterns, ignore_patterns))
+
+    def iter_code_files(
+            self,
+            source_paths: List[str],
+            file_patterns: List[str],
+            ignore_patterns: List[str] = None
+    ) -> Iterator[CodeFile]:
+        file_states = self.iter_file_states(source_paths, file_patterns, ignore_patterns)
+        while batch := list(islice(file_states, self.batch_size)):
+            self.prefetch([state.filename for state in batch])
+            for state in batch:
+                code_file = self.read_file(state.filename)
+                if code_file:
+                    yield code_file
+
+    def iter_file_states(
+            self,
+            source_paths: List[str],
+            file_patterns: List[str],
+            ignore_patterns: List[str] = None
+    ) -> Iterator[FileState]:
+        file_matcher = PathMatcher(file_patterns)
+        ignore_matcher = PathMatcher(ignore_patterns or [])
+        for source_path in source_paths:
+            repository = GitRepository.discover(source_path)
+            pathspec = repository.relative_path(source_path)
+            source = repository.root / pathspec
+            for entry in repository.tree_entries(self.revision, pathspec):
+                file_path = repository.root / entry.path
+                if self._is_selected(entry, file_path, source, file_matcher, ignore_matcher):
+                    filename = str(file_path)
+                    self._listed_objects[filename] = (repository, entry.object_id)
+                    yield FileState(filename, entry.object_id)
+
+    def load_file(self, filename: str) -> CodeFile:
+        return self.read_file(filename) or CodeFile(content="", filename=filename)
+
+    def read_file(self, filename: str) -> Optional[CodeFile]:
+        if filename not in self._listed_objects:
+            raise ValueError(self.UNKNOWN_FILE_ERROR.format(filename=filename))
+
+        repository, object_id = self._listed_objects[filename]
+        data = self.read_objects([(repository, object_id)]).get(object_id)
+        if data is None:
+            return None
+        return CodeFile(content="", filename=filename, raw_content=data, object_id=object_id)
+
+    def prefetch(self, filenames: List[str]):
+        # One batched round trip fills the blob cache, so the read_file calls that follow are served from memory.
+        self.read_objects([self._listed_objects[filename] for filename in filenames if filename in self._listed_objects])
+
+    def read_objects(self, objects: List[Tuple[GitRepository, str]]) -> Dict[str, bytes]:
+        # Identical blobs share one object id, so every blob is fetched once per cache lifetime,
+        # regardless of how many paths or revisions refer to it.
+        blobs = {}
+        missing: Dict[Path, List[str]] = {}
+        for repository, object_id in objects:
+            if object_id in self._blob_cache:
+                self._blob_cache.move_to_end(object_id)
+                blobs[object_id] = self._blob_cache[object_id]
+            elif object_id not in self._binary_objects:
+                missing.setdefault(repository.root, []).append(object_id)
+
+        for root, object_ids in missing.items():
+            for object_id, data in self._reader(root).read(list(dict.fromkeys(object_ids))):
+                if data is None or self.binary_detector.is_binary(data):
+                    self._binary_objects.add(object_id)
+                    continue
+                blobs[object_id] = data
+                self._cache(object_id, data)
+        return blobs
+
+    def _cache(self, object_id: str, data: bytes):
+        self._blob_cache[object_id] = data
+        self._blob_cache_size += len(data)
+        while self._blob_cache_size > self.cache_bytes and len(self._blob_cache) > 1:
+            _, evicted = self._blob_cache.popitem(last=False)
+            self._blob_cache_size -= len(evicted)
+
+    def _reader(self, root: Path) -> GitObjectReader:
+        if root not in self._readers:
+            self._readers[root] = GitObjectReader(str(root))
+        return self._readers[root]
+
+    def _is_selected(
+            self,
+            entry: TreeEntry,
+            file_path: Path,
+            source: Path,
+            file_matcher: PathMatcher,
+            ignore_matcher: PathMatcher
+    ) -> bool:
+        if entry.object_type != self.BLOB_TYPE or entry.mode == self.SYMBOLIC_LINK_MODE:
+            return False
+        if not file_matcher.matches(file_path.name):
+            return False
+
+        # Like the file system loaders, ignore patterns see absolute paths and prune whole directories.
+        relative_path = PurePosixPath(file_path.relative_to(source).as_posix())
+        candidates = [file_path, *(source / parent for parent in relative_path.parents)]
+        return not any(ignore_matcher.matches(candidate) for candidate in candidates)
@@ -0,0 +1,73 @@
+import subprocess
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+class GitObjectReader:
+    GIT_EXECUTABLE = "git"
+    MISSING_OBJECT_SUFFIX = b" missing"
+    UNEXPECTED_OUTPUT_ERROR = "Unexpected output from git cat-file: {header!r}."
+
+    def __init__(self, repository_root: str):
+        self.repository_root = Path(repository_root)
+        self.objects_read = 0
+        self._process: Optional[subprocess.Popen] = None
+
+    def __enter__(self) -> "GitObjectReader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def read(self, object_ids: List[str]) -> List[Tuple[str, Optional[bytes]]]:
+        if not object_ids:
+            return []
+
+        process = self._ensure_process()
+        # Requests are written from a separate thread: git blocks once its output pipe is full,
+        # so writing every request before reading any answer could deadlock on large batches.
+        feeder = threading.Thread(target=self._write_requests, args=(process, object_ids), daemon=True)
+        feeder.start()
+        try:
+            return [self._read_object(process) for _ in object_ids]
+        finally:
+            feeder.join()
+
+    def close(self):
+        if self._process is None:
+            return
+        self._process.stdin.close()
+        self._process.wait()
+        self._process.stdout.close()
+        self._process = None
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self._process is None:
+            self._process = subprocess.Popen(
+                [self.GIT_EXECUTABLE, "cat-file", "--batch"],
+                cwd=self.repository_root,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE
+            )
+        return self._process
+
+    @staticmethod
+    def _write_requests(process: subprocess.Popen, object_ids: List[str]):
+        process.stdin.write("".join(f"{object_id}\n" for object_id in object_ids).encode("ascii"))
+        process.stdin.flush()
+
+    def _read_object(self, process: subprocess.Popen) -> Tuple[str, Optional[bytes]]:
+        header = process.stdout.readline().rstrip(b"\n")
+        if header.endswith(self.MISSING_OBJECT_SUFFIX):
+            return header[:-len(self.MISSING_OBJECT_SUFFIX)].decode("ascii"), None
+
+        fields = header.split(b" ")
+        if len(fields) != 3:
+            raise ValueError(self.UNEXPECTED_OUTPUT_ERROR.format(header=header))
+
+        object_id, _, size = fields
+        data = process.stdout.read(int(size))
+        process.stdout.read(1)
+        self.objects_read += 1
+        return object_id.decode("ascii"), data
@@ -0,0 +1,118 @@
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+
+@dataclass(frozen=True)
+class TreeEntry:
+    mode: str
+    object_type: str
+    object_id: str
+    path: str
+
+
+@dataclass(frozen=True)
+class CommitInfo:
+    commit: str
+    timestamp: int
+    subject: str
+
+
+class GitRepository:
+    GIT_EXECUTABLE = "git"
+    NOT_A_REPOSITORY_ERROR = "'{path}' is not inside a git work tree."
+    FIELD_SEPARATOR = b"\0"
+    LOG_FIELD_SEPARATOR = "\x1f"
+
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+
+    @classmethod
+    def discover(cls, path: str) -> "GitRepository":
+        resolved_path = Path(path).resolve()
+        # Paths of older revisions may be gone from the work tree, so the nearest existing directory is used.
+        directory = resolved_path
+        while not directory.is_dir() and directory != directory.parent:
+            directory = directory.parent
+        try:
+            output = subprocess.run(
+                [cls.GIT_EXECUTABLE, "rev-parse", "--show-toplevel"],
+                cwd=directory,
+                capture_output=True,
+                check=True
+            ).stdout
+        except (OSError, subprocess.CalledProcessError) as error:
+            raise ValueError(cls.NOT_A_REPOSITORY_ERROR.format(path=path)) from error
+        return cls(output.decode("utf-8").strip())
+
+    def run(self, *arguments: str) -> bytes:
+        return subprocess.run(
+            [self.GIT_EXECUTABLE, *arguments],
+            cwd=self.root,
+            capture_output=True,
+            check=True
+        ).stdout
+
+    def head(self) -> str:
+        return self.run("rev-parse", "HEAD").decode("ascii").strip()
+
+    def resolve_revision(self, revision: str) -> str:
+        return self.run("rev-parse", "--verify", f"{revision}^{{commit}}").decode("ascii").strip()
+
+    def commits(self, revision: str = "HEAD", first_parent: bool = True) -> List[CommitInfo]:
+        arguments = ["log", "--reverse", "-z", f"--format=%H{self.LOG_FIELD_SEPARATOR}%ct{self.LOG_FIELD_SEPARATOR}%s"]
+        if first_parent:
+            arguments.append("--first-parent")
+
+        commits = []
+        for entry in self._split(self.run(*arguments, revision, "--")):
+            commit, timestamp, subject = entry.decode("utf-8", "replace").split(self.LOG_FIELD_SEPARATOR, 2)
+            commits.append(CommitInfo(commit, int(timestamp), subject))
+        return commits
+
+    def tracked_files(self, pathspec: Optional[str] = None) -> Dict[str, str]:
+        # "<mode> <object id> <stage>\t<path>": the object id is the blob stored in the index.
+        tracked = {}
+        for entry in self._split(self.run("ls-files", "--stage", "-z", *self._pathspecs(pathspec))):
+            metadata, _, path = entry.partition(b"\t")
+            mode, object_id, _ = metadata.split(b" ")
+            if mode != b"160000":
+                tracked[self._decode_path(path)] = object_id.decode("ascii")
+        return tracked
+
+    def tree_entries(self, revision: str, pathspec: Optional[str] = None) -> List[TreeEntry]:
+        # "<mode> <type> <object id>\t<path>" for every blob reachable from the revision's tree.
+        arguments = ["ls-tree", "-r", "-z", "--full-tree", revision, *(["--", pathspec] if pathspec else [])]
+        entries = []
+        for entry in self._split(self.run(*arguments)):
+            metadata, _, path = entry.partition(b"\t")
+            mode, object_type, object_id = metadata.decode("ascii").split(" ")
+            entries.append(TreeEntry(mode, object_type, object_id, self._decode_path(path)))
+        return entries
+
+    def untracked_files(self, pathspec: Optional[str] = None) -> List[str]:
+        output = self.run("ls-files", "--others", "--exclude-standard", "-z", *self._pathspecs(pathspec))
+        return [self._decode_path(path) for path in self._split(output)]
+
+    def modified_files(self, pathspec: Optional[str] = None) -> Set[str]:
+        output = self.run("diff", "--name-only", "--no-renames", "-z", *self._pathspecs(pathspec))
+        return {self._decode_path(path) for path in self._split(output)}
+
+    def deleted_files(self, pathspec: Optional[str] = None) -> Set[str]:
+        output = self.run("ls-files", "--deleted", "-z", *self._pathspecs(pathspec))
+        return {self._decode_path(path) for path in self._split(output)}
+
+    def relative_path(self, path: str) -> str:
+        relative = Path(path).resolve().relative_to(self.root).as_posix()
+        return "" if relative == "." else relative
+
+    def _pathspecs(self, pathspec: Optional[str]) -> List[str]:
+        return ["--", f":(literal){pathspec}"] if pathspec else []
+
+    def _split(self, output: bytes) -> List[bytes]:
+        return [entry for entry in output.split(self.FIELD_SEPARATOR) if entry]
+
+    @staticmethod
+    def _decode_path(path: bytes) -> str:
+        return path.decode("utf-8", "surrogateescape")
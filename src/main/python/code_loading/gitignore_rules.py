@@ -0,0 +1,78 @@
+import os
+import re
+from typing import List, Optional, Tuple
+
+from src.main.python.code_loading.path_matcher import PathMatcher
+
+
+class GitignoreRules:
+    COMMENT_PREFIX = "#"
+    NEGATION_PREFIX = "!"
+    ESCAPE_PREFIX = "\\"
+    DESCENDANTS_SUFFIX = "/**"
+    DESCENDANTS_EXPRESSION = "/.+"
+
+    def __init__(self, base_directory: str, rules: List[Tuple[re.Pattern, bool, bool]]):
+        self.base_directory = base_directory
+        self.rules = rules
+
+    @classmethod
+    def from_file(cls, gitignore_path: str) -> "GitignoreRules":
+        with open(gitignore_path, "r", encoding="utf-8", errors="replace") as gitignore_file:
+            return cls.parse(os.path.dirname(gitignore_path), gitignore_file.read())
+
+    @classmethod
+    def parse(cls, base_directory: str, text: str) -> "GitignoreRules":
+        rules = []
+        for line in text.splitlines():
+            rule = cls._parse_line(line)
+            if rule:
+                rules.append(rule)
+        return cls(base_directory, rules)
+
+    @classmethod
+    def _parse_line(cls, line: str) -> Optional[Tuple[re.Pattern, bool, bool]]:
+        pattern = line.rstrip()
+        if not pattern or pattern.startswith(cls.COMMENT_PREFIX):
+            return None
+
+        negated = pattern.startswith(cls.NEGATION_PREFIX)
+        if negated:
+            pattern = pattern[1:]
+        elif pattern.startswith(cls.ESCAPE_PREFIX):
+            pattern = pattern[1:]
+
+        directory_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if not pattern:
+            return None
+
+        # Unlike PathMatcher, git lets "dir/**" match only what is inside "dir", so negations below it still apply.
+        if pattern.endswith(cls.DESCENDANTS_SUFFIX) and len(pattern) > len(cls.DESCENDANTS_SUFFIX):
+            parent = pattern[:-len(cls.DESCENDANTS_SUFFIX)].lstrip("/")
+            expression = PathMatcher.translate(parent) + cls.DESCENDANTS_EXPRESSION
+        # A slash anywhere but at the end ties the pattern to the directory holding the .gitignore file.
+        elif "/" in pattern:
+            expression = PathMatcher.translate(pattern.lstrip("/"))
+        else:
+            expression = PathMatcher.ANY_DIRECTORIES + PathMatcher.translate(pattern)
+        return re.compile(expression, re.DOTALL), negated, directory_only
+
+    def match(self, path: str, is_directory: bool) -> Optional[bool]:
+        relative_path = os.path.relpath(path, self.base_directory).replace(os.sep, "/")
+        ignored = None
+        for expression, negated, directory_only in self.rules:
+            if directory_only and not is_directory:
+                continue
+            if expression.fullmatch(relative_path):
+                ignored = not negated
+        return ignored
+
+    @staticmethod
+    def is_ignored(chain: Tuple["GitignoreRules", ...], path: str, is_directory: bool) -> bool:
+        ignored = False
+        for rules in chain:
+            result = rules.match(path, is_directory)
+            if result is not None:
+                ignored = result
+        return ignored
@@ -0,0 +1,30 @@
+import mmap
+import os
+from typing import Optional, Union
+from pathlib import Path
+
+from src.main.python.code_loading.code_file import CodeFile
+
+
+class MappedFileReader:
+    BINARY_MARKER = b"\0"
+
+    def __init__(self, mmap_threshold: int = 64 * 1024, sniff_size: int = 8000):
+        self.mmap_threshold = mmap_threshold
+        self.sniff_size = sniff_size
+
+    def read(self, file_path: Union[Path, str]) -> Optional[CodeFile]:
+        with open(file_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if not size or size < self.mmap_threshold:
+                data = file.read()
+            else:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.is_binary(data):
+            return None
+        return CodeFile(content="", filename=str(file_path), raw_content=data)
+
+    def is_binary(self, data) -> bool:
+        # Same heuristic as git: a NUL byte near the start of the file marks it as binary.
+        return data.find(self.BINARY_MARKER, 0, self.sniff_size) != -1
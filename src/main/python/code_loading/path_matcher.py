@@ -0,0 +1,110 @@
+import os
+import re
+from functools import lru_cache
+from pathlib import PurePath
+from typing import Iterable, Union
+
+
+class PathMatcher:
+    ANY_DIRECTORIES = "(?:.*/)?"
+    ANY_SUFFIX = "(?:/.*)?"
+    NEVER_MATCHES = r"(?!)"
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = tuple(patterns)
+        flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+        self._regex = re.compile(self._combine(self.patterns), flags | re.DOTALL)
+
+    @classmethod
+    def of(cls, patterns: Union["PathMatcher", Iterable[str], None]) -> "PathMatcher":
+        if isinstance(patterns, PathMatcher):
+            return patterns
+        return cls._compile(tuple(patterns or ()))
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _compile(cls, patterns: tuple) -> "PathMatcher":
+        return cls(patterns)
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def matches(self, path: Union[str, PurePath]) -> bool:
+        return self._regex.fullmatch(self._normalize(path)) is not None
+
+    @staticmethod
+    def _normalize(path: Union[str, PurePath]) -> str:
+        path_str = str(path)
+        if os.sep != "/":
+            path_str = path_str.replace(os.sep, "/")
+        return path_str.rstrip("/") or path_str
+
+    def _combine(self, patterns: tuple) -> str:
+        if not patterns:
+            return self.NEVER_MATCHES
+
+        anchored = [self.translate(pattern) for pattern in patterns if pattern.startswith("/")]
+        floating = [
+            self.translate(pattern[3:] if pattern.startswith("**/") else pattern)
+            for pattern in patterns
+            if not pattern.startswith("/")
+        ]
+
+        alternatives = []
+        if floating:
+            alternatives.append(f"{self.ANY_DIRECTORIES}(?:{'|'.join(floating)})")
+        alternatives.extend(anchored)
+        return "|".join(f"(?:{alternative})" for alternative in alternatives)
+
+    @classmethod
+    def translate(cls, pattern: str) -> str:
+        pattern = pattern.replace(os.sep, "/") if os.sep != "/" else pattern
+        trailing_any = pattern.endswith("/**")
+        if trailing_any:
+            pattern = pattern[:-3]
+
+        parts = []
+        index = 0
+        while index < len(pattern):
+            char = pattern[index]
+            if pattern.startswith("**/", index):
+                parts.append(cls.ANY_DIRECTORIES)
+                index += 3
+            elif pattern.startswith("**", index):
+                parts.append(".*")
+                index += 2
+            elif char == "*":
+                parts.append("[^/]*")
+                index += 1
+            elif char == "?":
+                parts.append("[^/]")
+                index += 1
+            elif char == "[":
+                character_class, index = cls._translate_character_class(pattern, index)
+                parts.append(character_class)
+            else:
+                parts.append(re.escape(char))
+                index += 1
+
+        # "dir/**" also matches "dir" itself, so whole directories can be pruned before they are walked.
+        if trailing_any:
+            parts.append(cls.ANY_SUFFIX)
+        return "".join(parts)
+
+    @staticmethod
+    def _translate_character_class(pattern: str, start: int) -> tuple[str, int]:
+        end = start + 1
+        if end < len(pattern) and pattern[end] in "!]":
+            end += 1
+        while end < len(pattern) and pattern[end] != "]":
+            end += 1
+
+        if end >= len(pattern):
+            return re.escape("["), start + 1
+
+        content = pattern[start + 1:end].replace("\\", "\\\\")
+        if content.startswith("!"):
+            content = "^" + content[1:]
+        elif content.startswith("^"):
+            content = "\\" + content
+        return f"[{content}]", end + 1
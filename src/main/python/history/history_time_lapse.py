@@ -0,0 +1,199 @@
+import json
+from dataclasses import asdict, dataclass
+from itertools import islice
+from math import ceil
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from PIL import Image
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.code_loading.git_object_loader import GitObjectLoader
+from src.main.python.code_loading.git_repository import CommitInfo, GitRepository
+from src.main.python.image_composition.image_writer import ImageWriter
+from src.main.python.image_composition.time_lapse_composer import TimeLapseComposer
+from src.main.python.image_generation.parallel_image_renderer import ParallelImageRenderer
+
+
+@dataclass(frozen=True)
+class TimeLapseFrame:
+    commit: CommitInfo
+    files: Dict[str, str]
+    repository: GitRepository
+
+
+class HistoryTimeLapse:
+    FRAMES_DIRECTORY_NAME = "frames"
+    FRAME_FILENAME = "frame_{index:05d}{extension}"
+    TEMPLATES_DIRECTORY_NAME = "../../resources/templates"
+    STYLESHEET_FILENAME = "styles.css"
+    BASE_TEMPLATE_FILENAME = "base.html"
+    VIEWER_SCRIPT_FILENAME = "time_lapse.js"
+    DATA_SCRIPT_FILENAME = "time_lapse_data.js"
+    OUTPUT_HTML_FILENAME = "index.html"
+
+    COLUMNS_PLACEHOLDER = "{{ columns }}"
+    GRID_ITEMS_PLACEHOLDER = "{{ grid_items }}"
+    SCRIPTS_PLACEHOLDER = "{{ scripts }}"
+
+    ANIMATION_FORMATS = {".gif": "GIF", ".webp": "WEBP"}
+    UNSUPPORTED_ANIMATION_ERROR = "Unsupported animation file '{path}', expected one of: {extensions}."
+    INVALID_STEP_ERROR = "Frame step must be positive, got {step}."
+    INVALID_MAX_FRAMES_ERROR = "Maximum frame count must be positive, got {max_frames}."
+
+    def __init__(
+            self,
+            loader: GitObjectLoader,
+            renderer: ParallelImageRenderer,
+            composer: Optional[TimeLapseComposer] = None,
+            step: int = 1,
+            max_frames: Optional[int] = None,
+            batch_size: int = 256
+    ):
+        if step < 1:
+            raise ValueError(self.INVALID_STEP_ERROR.format(step=step))
+        if max_frames is not None and max_frames < 1:
+            raise ValueError(self.INVALID_MAX_FRAMES_ERROR.format(max_frames=max_frames))
+
+        self.loader = loader
+        self.renderer = renderer
+        self.composer = composer or TimeLapseComposer()
+        self.step = step
+        self.max_frames = max_frames
+        self.batch_size = batch_size
+        self.rendered_blobs = 0
+        self.template_directory = Path(__file__).parent / self.TEMPLATES_DIRECTORY_NAME
+
+    def collect_frames(
+            self,
+            source_paths: List[str],
+            file_patterns: List[str],
+            ignore_patterns: List[str] = None,
+            revision: str = "HEAD"
+    ) -> List[TimeLapseFrame]:
+        # The history of the first source decides which commits become frames.
+        repository = GitRepository.discover(source_paths[0])
+        frames = []
+        for commit in self.select_commits(repository.commits(revision)):
+            self.loader.revision = commit.commit
+            file_states = self.loader.iter_file_states(source_paths, file_patterns, ignore_patterns)
+            files = {state.filename: state.content_hash for state in file_states}
+            frames.append(TimeLapseFrame(commit, files, repository))
+        return frames
+
+    def select_commits(self, commits: List[CommitInfo]) -> List[CommitInfo]:
+        step = self.step
+        if self.max_frames and len(commits) > self.max_frames:
+            if self.max_frames == 1:
+                return commits[-1:]
+            # Every step spans at most (n - 1) / (max_frames - 1) commits, so the slice plus the
+            # appended last commit never exceeds max_frames.
+            step = max(step, ceil((len(commits) - 1) / (self.max_frames - 1)))
+
+        selected = commits[::step]
+        if commits and selected[-1] != commits[-1]:
+            selected.append(commits[-1])
+        return selected
+
+    def render_tiles(self, frames: List[TimeLapseFrame]):
+        # Frames share most of their blobs, so the work is bounded by distinct object ids, not frames times files.
+        sources_by_object: Dict[str, Tuple[GitRepository, str]] = {}
+        for frame in frames:
+            for filename, object_id in frame.files.items():
+                if object_id not in self.composer.tiles:
+                    sources_by_object.setdefault(object_id, (frame.repository, filename))
+
+        for thumbnail, code_file in self.renderer.render_thumbnails(
+                self._read_blobs(sources_by_object), self.composer.thumbnail_size
+        ):
+            self.composer.add_thumbnail(thumbnail, code_file)
+            self.rendered_blobs += 1
+
+    def _read_blobs(self, sources_by_object: Dict[str, Tuple[GitRepository, str]]) -> Iterator[CodeFile]:
+        object_ids = iter(sources_by_object)
+        while batch := list(islice(object_ids, self.batch_size)):
+            blobs = self.loader.read_objects([(sources_by_object[object_id][0], object_id) for object_id in batch])
+            for object_id in batch:
+                if object_id in blobs:
+                    yield CodeFile(
+                        content="",
+                        filename=sources_by_object[object_id][1],
+                        raw_content=blobs[object_id],
+                        object_id=object_id
+                    )
+
+    def compose(self, frames: List[TimeLapseFrame]) -> Iterator[Image.Image]:
+        self.render_tiles(frames)
+        self.composer.assign_slots(frame.files for frame in frames)
+        return self.composer.compose_frames(frame.files for frame in frames)
+
+    def save_animation(self, frames: List[TimeLapseFrame], path: str, frame_duration: int = 200):
+        image_format = self.ANIMATION_FORMATS.get(Path(path).suffix.lower())
+        if image_format is None:
+            raise ValueError(self.UNSUPPORTED_ANIMATION_ERROR.format(
+                path=path,
+                extensions=", ".join(self.ANIMATION_FORMATS)
+            ))
+
+        images = self.compose(frames)
+        first_frame = next(images, None)
+        if first_frame is None:
+            return
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Pillow stores only the changed region of each GIF frame, which suits frames that differ in a few cells.
+        first_frame.save(
+            path,
+            format=image_format,
+            save_all=True,
+            append_images=images,
+            duration=frame_duration,
+            loop=0,
+            lossless=True
+        )
+
+    def save_html(
+            self,
+            frames: List[TimeLapseFrame],
+            output_directory: str,
+            writer: Optional[ImageWriter] = None,
+            frame_duration: int = 200
+    ):
+        writer = writer or ImageWriter(palette=True)
+        output_path = Path(output_directory)
+        frames_directory = output_path / self.FRAMES_DIRECTORY_NAME
+        frames_directory.mkdir(parents=True, exist_ok=True)
+
+        entries = []
+        for index, (frame, image) in enumerate(zip(frames, self.compose(frames))):
+            filename = self.FRAME_FILENAME.format(index=index, extension=writer.file_extension)
+            writer.write(image, frames_directory / filename)
+            entries.append({"image": f"{self.FRAMES_DIRECTORY_NAME}/{filename}", **asdict(frame.commit)})
+        writer.close()
+
+        width, height = self.composer.canvas_size()
+        data = {"width": width, "height": height, "frameDuration": frame_duration, "frames": entries}
+        (output_path / self.DATA_SCRIPT_FILENAME).write_text(f"window.TIME_LAPSE = {json.dumps(data)};\n")
+
+        self._copy_template(output_path, self.STYLESHEET_FILENAME, {self.COLUMNS_PLACEHOLDER: "1"})
+        self._copy_template(output_path, self.VIEWER_SCRIPT_FILENAME, {})
+        self._copy_template(output_path, self.BASE_TEMPLATE_FILENAME, {
+            self.GRID_ITEMS_PLACEHOLDER: '<div class="time-lapse" id="time-lapse"></div>',
+            self.SCRIPTS_PLACEHOLDER: (
+                f'<script src="{self.DATA_SCRIPT_FILENAME}"></script>\n'
+                f'    <script src="{self.VIEWER_SCRIPT_FILENAME}"></script>'
+            )
+        }, self.OUTPUT_HTML_FILENAME)
+        print(f"Time-lapse generated at: {(output_path / self.OUTPUT_HTML_FILENAME).absolute()}")
+
+    def _copy_template(
+            self,
+            output_path: Path,
+            template_filename: str,
+            replacements: dict,
+            output_filename: Optional[str] = None
+    ):
+        content = (self.template_directory / template_filename).read_text()
+        for placeholder, value in replacements.items():
+            content = content.replace(placeholder, value)
+        (output_path / (output_filename or template_filename)).write_text(content)
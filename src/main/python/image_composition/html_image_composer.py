@@ -1,8 +1,14 @@
+import json
+import os
 from pathlib import Path
+from typing import Optional, TextIO
 
 from PIL import Image
 
 from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_composition.image_writer import ImageWriter
+from src.main.python.image_composition.layout_packer import LayoutPacker, Placement
+from src.main.python.image_generation.ink_palette import InkPalette
 
 
 class HtmlImageComposer:
@@ -12,12 +18,23 @@ class HtmlImageComposer:
     STYLESHEET_FILENAME = "styles.css"
     BASE_TEMPLATE_FILENAME = "base.html"
     OUTPUT_HTML_FILENAME = "index.html"
-    IMAGE_FILE_EXTENSION = ".png"
+    MANIFEST_FILENAME = "manifest.json"
+    REPORT_SCRIPT_FILENAME = "report.js"
+    VIRTUAL_GRID_SCRIPT_FILENAME = "virtual_grid.js"
     UNNAMED_FILE_PREFIX = "image_"
     UNNAMED_FILE_DISPLAY_NAME = "unnamed"
 
     COLUMNS_PLACEHOLDER = "{{ columns }}"
     GRID_ITEMS_PLACEHOLDER = "{{ grid_items }}"
+    SCRIPTS_PLACEHOLDER = "{{ scripts }}"
+
+    PACKED_LAYOUT_TEMPLATE = '<div class="packed-layout" style="width: {width}px; height: {height}px;">'
+    PACKED_ITEM_ATTRIBUTES = ' packed-item" style="left: {x}px; top: {y}px; width: {width}px; height: {height}px;'
+    VIRTUAL_GRID_MARKUP = (
+        '<input class="report-filter" id="report-filter" type="search" placeholder="Filter by path">\n'
+        '        <div class="virtual-grid" id="virtual-grid"><div class="virtual-grid-content"></div></div>'
+    )
+    VIRTUAL_PACKER_ERROR = "A virtual report lays out its own rows and cannot be combined with a packer."
 
     BORDER_COLOR = (0, 0, 0)
     BORDER_WIDTH = 1
@@ -26,44 +43,212 @@ class HtmlImageComposer:
             self,
             output_directory: str = DEFAULT_OUTPUT_DIRECTORY_NAME,
             columns: int = 10,
-            thumbnail_size: tuple[int, int] = (500, 1000)
+            thumbnail_size: tuple[int, int] = (500, 1000),
+            incremental: bool = False,
+            packer: Optional[LayoutPacker] = None,
+            writer: Optional[ImageWriter] = None,
+            virtual: bool = False,
+            render_parameters: tuple = ()
     ):
+        if virtual and packer:
+            raise ValueError(self.VIRTUAL_PACKER_ERROR)
+
         self.columns = columns
+        self.virtual = virtual
+        self.packer = packer
+        self.writer = writer or ImageWriter()
         self.thumbnail_size = thumbnail_size
+        self.incremental = incremental
+        self.render_parameters = render_parameters
         self.output_directory = Path(output_directory)
         self.images_directory = self.output_directory / self.IMAGES_DIRECTORY_NAME
         self.template_directory = Path(__file__).parent / self.TEMPLATES_DIRECTORY_NAME
 
         self.image_paths = []
+        self.manifest_entries = []
+        self.used_filenames = set()
+        self.previous_entries = {}
+        self.previous_thumbnails = set()
+        self.reserved_filenames = set()
+        self.report_file: Optional[TextIO] = None
+        self.report_entry_count = 0
 
         self.images_directory.mkdir(parents=True, exist_ok=True)
+        if incremental:
+            self._load_manifest()
 
     def add_image(self, image: Image.Image, code_file: CodeFile):
-        processed_image = self._process_image(image)
+        self.add_thumbnail(InkPalette.thumbnail(image, self.thumbnail_size), code_file)
+
+    def add_thumbnail(self, thumbnail: Image.Image, code_file: CodeFile):
+        content_hash = code_file.content_hash() if self.incremental else None
+        if code_file.filename and self.has_current_thumbnail(code_file.filename, content_hash):
+            self.add_existing_thumbnail(code_file.filename)
+            return
+
+        processed_image = self._add_border(thumbnail)
         filename = self._generate_filename(code_file)
         save_path = self.images_directory / filename
-        processed_image.save(save_path)
-        self.image_paths.append((save_path, code_file.filename))
+        self.writer.write(processed_image, save_path)
+        self._record_image(save_path, code_file.filename, content_hash, processed_image.size)
+
+    def has_current_thumbnail(self, filename: str, content_hash: Optional[str]) -> bool:
+        entry = self.previous_entries.get(filename)
+        return (
+            entry is not None and
+            entry["content_hash"] == content_hash and
+            entry["thumbnail"].endswith(self.writer.file_extension) and
+            (self.output_directory / entry["thumbnail"]).is_file()
+        )
+
+    def add_existing_thumbnail(self, filename: str):
+        entry = self.previous_entries[filename]
+        self._record_image(
+            self.output_directory / entry["thumbnail"],
+            filename,
+            entry["content_hash"],
+            (entry["width"], entry["height"])
+        )
+
+    def _record_image(
+            self,
+            save_path: Path,
+            filename: Optional[str],
+            content_hash: Optional[str],
+            size: tuple[int, int]
+    ):
+        self.image_paths.append((save_path, filename))
+        self.used_filenames.add(save_path.name)
+        self.manifest_entries.append({
+            "source": filename,
+            "content_hash": content_hash,
+            "thumbnail": save_path.relative_to(self.output_directory).as_posix(),
+            "width": size[0],
+            "height": size[1]
+        })
+        if self.virtual:
+            self._append_report_entry(self.manifest_entries[-1])
 
     def _generate_filename(self, code_file: CodeFile) -> str:
+        previous_entry = self.previous_entries.get(code_file.filename)
+        if previous_entry and previous_entry["thumbnail"].endswith(self.writer.file_extension):
+            return Path(previous_entry["thumbnail"]).name
+
         if code_file.filename:
-            return f"{Path(code_file.filename).stem}{self.IMAGE_FILE_EXTENSION}"
-        return f"{self.UNNAMED_FILE_PREFIX}{len(self.image_paths)}{self.IMAGE_FILE_EXTENSION}"
+            stem = Path(code_file.filename).stem
+        else:
+            stem = f"{self.UNNAMED_FILE_PREFIX}{len(self.image_paths)}"
 
-    def _process_image(self, image: Image.Image) -> Image.Image:
-        image.thumbnail(self.thumbnail_size)
-        return self._add_border(image)
+        filename = f"{stem}{self.writer.file_extension}"
+        duplicate_count = 0
+        while filename in self.used_filenames or filename in self.reserved_filenames:
+            duplicate_count += 1
+            filename = f"{stem}_{duplicate_count}{self.writer.file_extension}"
+        return filename
 
     def _add_border(self, image: Image.Image) -> Image.Image:
         new_width = image.width + self.BORDER_WIDTH
         new_height = image.height + self.BORDER_WIDTH
-        bordered_image = Image.new("RGB", (new_width, new_height), self.BORDER_COLOR)
+        bordered_image = InkPalette.new_like(image, (new_width, new_height), self.BORDER_COLOR)
         bordered_image.paste(image, (self.BORDER_WIDTH, self.BORDER_WIDTH))
         return bordered_image
 
     def generate_html(self):
+        self.writer.close()
         self._copy_stylesheet()
-        self._render_html_page()
+        if self.virtual:
+            self._finish_report()
+            self._render_virtual_page()
+        else:
+            self._render_html_page()
+        if self.incremental:
+            self._remove_stale_thumbnails()
+            self._write_manifest()
+
+    def _load_manifest(self):
+        manifest_path = self.output_directory / self.MANIFEST_FILENAME
+        if not manifest_path.exists():
+            return
+
+        manifest = json.loads(manifest_path.read_text())
+        entries = manifest["entries"]
+        self.previous_thumbnails = {entry["thumbnail"] for entry in entries}
+        if manifest.get("parameters") != self.parameter_signature():
+            # Thumbnails drawn with other settings are only kept around until they are cleaned up as stale.
+            return
+
+        self.previous_entries = {entry["source"]: entry for entry in entries if entry["source"]}
+        self.reserved_filenames = {Path(entry["thumbnail"]).name for entry in self.previous_entries.values()}
+
+    def _write_manifest(self):
+        manifest_path = self.output_directory / self.MANIFEST_FILENAME
+        manifest = {"parameters": self.parameter_signature(), "entries": self.manifest_entries}
+        manifest_path.write_text(json.dumps(manifest, indent=1))
+
+    def parameter_signature(self) -> str:
+        return repr((
+            tuple(self.thumbnail_size),
+            tuple(self.render_parameters),
+            self.writer.image_format,
+            self.writer.palette,
+            self.writer.lossless,
+            self.writer.quality
+        ))
+
+    def _remove_stale_thumbnails(self):
+        current_thumbnails = {entry["thumbnail"] for entry in self.manifest_entries}
+        for thumbnail in self.previous_thumbnails - current_thumbnails:
+            (self.output_directory / thumbnail).unlink(missing_ok=True)
+
+    def _report_path(self) -> Path:
+        return self.output_directory / self.REPORT_SCRIPT_FILENAME
+
+    def _append_report_entry(self, entry: dict):
+        # Entries go to disk as they arrive, so a report over many files never holds its markup in memory.
+        if self.report_file is None:
+            self.report_file = open(self._report_path().with_suffix(".tmp"), "w", encoding="utf-8")
+            self.report_file.write(self._report_header() + "\n")
+
+        separator = ",\n" if self.report_entry_count else ""
+        compact_entry = [entry["source"], entry["thumbnail"], entry["width"], entry["height"]]
+        self.report_file.write(separator + json.dumps(compact_entry, separators=(",", ":")))
+        self.report_entry_count += 1
+
+    def _report_header(self) -> str:
+        settings = json.dumps({"columns": self.columns, "unnamed": self.UNNAMED_FILE_DISPLAY_NAME})
+        return f'window.REPORT = {settings[:-1]}, "entries": ['
+
+    def _finish_report(self):
+        if self.report_file is None:
+            self._report_path().write_text(self._report_header() + "]};\n")
+            return
+
+        self.report_file.write("\n]};\n")
+        self.report_file.close()
+        self.report_file = None
+        os.replace(self._report_path().with_suffix(".tmp"), self._report_path())
+
+    def _render_virtual_page(self):
+        script_template_path = self.template_directory / self.VIRTUAL_GRID_SCRIPT_FILENAME
+        self._write_if_changed(
+            self.output_directory / self.VIRTUAL_GRID_SCRIPT_FILENAME,
+            script_template_path.read_text()
+        )
+
+        html_template = (self.template_directory / self.BASE_TEMPLATE_FILENAME).read_text()
+        final_html = html_template.replace(self.GRID_ITEMS_PLACEHOLDER, self.VIRTUAL_GRID_MARKUP).replace(
+            self.SCRIPTS_PLACEHOLDER,
+            f'<script src="{self.REPORT_SCRIPT_FILENAME}"></script>\n'
+            f'    <script src="{self.VIRTUAL_GRID_SCRIPT_FILENAME}"></script>'
+        )
+        output_html_path = self.output_directory / self.OUTPUT_HTML_FILENAME
+        self._write_if_changed(output_html_path, final_html)
+        print(f"HTML generated at: {output_html_path.absolute()}")
+
+    def _write_if_changed(self, path: Path, content: str):
+        if path.exists() and path.read_text() == content:
+            return
+        path.write_text(content)
 
     def _copy_stylesheet(self):
         stylesheet_template_path = self.template_directory / self.STYLESHEET_FILENAME
@@ -73,7 +258,7 @@ class HtmlImageComposer:
             str(self.columns)
         )
         output_stylesheet_path = self.output_directory / self.STYLESHEET_FILENAME
-        output_stylesheet_path.write_text(processed_stylesheet)
+        self._write_if_changed(output_stylesheet_path, processed_stylesheet)
 
     def _render_html_page(self):
         template_path = self.template_directory / self.BASE_TEMPLATE_FILENAME
@@ -82,23 +267,41 @@ class HtmlImageComposer:
         final_html = html_template.replace(
             self.GRID_ITEMS_PLACEHOLDER,
             "\n".join(grid_items)
-        )
+        ).replace(self.SCRIPTS_PLACEHOLDER, "")
 
         output_html_path = self.output_directory / self.OUTPUT_HTML_FILENAME
-        output_html_path.write_text(final_html)
+        self._write_if_changed(output_html_path, final_html)
         print(f"HTML generated at: {output_html_path.absolute()}")
 
     def _generate_grid_items(self) -> list[str]:
+        if not self.packer:
+            return [
+                self._create_grid_item(image_path, filename)
+                for image_path, filename in self.image_paths
+            ]
+
+        layout = self.packer.pack([(entry["width"], entry["height"]) for entry in self.manifest_entries])
+        packed_items = [
+            self._create_grid_item(*self.image_paths[placement.index], placement)
+            for placement in layout.placements
+        ]
         return [
-            self._create_grid_item(image_path, filename)
-            for image_path, filename in self.image_paths
+            self.PACKED_LAYOUT_TEMPLATE.format(width=layout.width, height=layout.height),
+            *packed_items,
+            "</div>"
         ]
 
-    def _create_grid_item(self, image_path: Path, filename: str) -> str:
+    def _create_grid_item(self, image_path: Path, filename: str, placement: Optional[Placement] = None) -> str:
         relative_image_path = image_path.relative_to(self.output_directory)
         display_name = Path(filename).name if filename else self.UNNAMED_FILE_DISPLAY_NAME
+        item_attributes = self.PACKED_ITEM_ATTRIBUTES.format(
+            x=placement.x,
+            y=placement.y,
+            width=placement.width,
+            height=placement.height
+        ) if placement else ""
         return f'''
-            <div class="grid-item">
+            <div class="grid-item{item_attributes}">
                 <img src="{relative_image_path}" alt="{filename}">
                 <div class="filename" data-original-filename="{filename}">
                     {display_name}
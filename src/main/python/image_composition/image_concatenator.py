@@ -1,45 +1,79 @@
+from typing import Optional
+
 from PIL import Image
 from math import ceil
 
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_composition.layout_packer import LayoutPacker, PackedLayout, Placement
+from src.main.python.image_generation.ink_palette import InkPalette
+
 class ImageConcatenator:
-    def __init__(self, columns: int = 4, max_thumbnail_size: tuple[int, int] = (200, 200)):
+    def __init__(
+            self,
+            columns: int = 4,
+            max_thumbnail_size: tuple[int, int] = (200, 200),
+            packer: Optional[LayoutPacker] = None
+    ):
         self.columns = columns
         self.max_thumbnail_size = max_thumbnail_size
+        self.packer = packer
         self.images = []
         self.border_color = (0, 0, 0)
         self.border_width = 1
 
-    def add_image(self, img: Image.Image):
-        thumbnail = self._add_border(self._resize_image(img))
-        self.images.append(thumbnail)
+    @property
+    def thumbnail_size(self) -> tuple[int, int]:
+        return self.max_thumbnail_size
+
+    def add_image(self, img: Image.Image, code_file: CodeFile = None):
+        self.add_thumbnail(self._resize_image(img), code_file)
+
+    def add_thumbnail(self, thumbnail: Image.Image, code_file: CodeFile = None):
+        self.images.append(self._add_border(thumbnail))
 
     def _resize_image(self, img: Image.Image) -> Image.Image:
-        img.thumbnail(self.max_thumbnail_size)
-        return img
+        return InkPalette.thumbnail(img, self.max_thumbnail_size)
 
     def _add_border(self, img: Image.Image) -> Image.Image:
         new_size = (
             img.width + 2 * self.border_width,
             img.height + 2 * self.border_width
         )
-        bordered = Image.new("RGB", new_size, self.border_color)
+        bordered = InkPalette.new_like(img, new_size, self.border_color)
         bordered.paste(img, (self.border_width, self.border_width))
         return bordered
 
+    def layout(self) -> PackedLayout:
+        sizes = [img.size for img in self.images]
+        if self.packer:
+            return self.packer.pack(sizes)
+
+        if not sizes:
+            return PackedLayout([], 0, 0)
+
+        rows = ceil(len(sizes) / self.columns)
+        thumb_width, thumb_height = sizes[0]
+        # Larger images spill into the next cell and are painted over, so only the cell itself stays visible.
+        placements = [
+            Placement(
+                index,
+                (index % self.columns) * thumb_width,
+                (index // self.columns) * thumb_height,
+                min(width, thumb_width),
+                min(height, thumb_height)
+            )
+            for index, (width, height) in enumerate(sizes)
+        ]
+        return PackedLayout(placements, self.columns * thumb_width, rows * thumb_height)
+
     def concatenate(self) -> Image.Image:
         if not self.images:
             return Image.new("RGB", (1, 1))
 
-        rows = ceil(len(self.images) / self.columns)
-        thumb_width, thumb_height = self.images[0].size
-
-        total_width = self.columns * thumb_width
-        total_height = rows * thumb_height
-        composite = Image.new("RGB", (total_width, total_height))
+        layout = self.layout()
+        composite = InkPalette.new_like(self.images[0], (layout.width, layout.height), self.border_color)
 
-        for index, img in enumerate(self.images):
-            x = (index % self.columns) * thumb_width
-            y = (index // self.columns) * thumb_height
-            composite.paste(img, (x, y))
+        for placement in layout.placements:
+            composite.paste(self.images[placement.index], (placement.x, placement.y))
 
         return composite
@@ -0,0 +1,89 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Deque, Optional
+
+from PIL import Image
+
+
+class ImageWriter:
+    PNG_FORMAT = "PNG"
+    WEBP_FORMAT = "WEBP"
+    FILE_EXTENSIONS = {PNG_FORMAT: ".png", WEBP_FORMAT: ".webp"}
+    MAX_PALETTE_COLORS = 256
+    UNSUPPORTED_FORMAT_ERROR = "Unsupported image format {image_format}, expected one of {formats}."
+
+    def __init__(
+            self,
+            image_format: str = PNG_FORMAT,
+            palette: bool = False,
+            workers: Optional[int] = None,
+            max_pending: Optional[int] = None,
+            compression_level: int = 6,
+            lossless: bool = True,
+            quality: int = 90
+    ):
+        image_format = image_format.upper()
+        if image_format not in self.FILE_EXTENSIONS:
+            raise ValueError(self.UNSUPPORTED_FORMAT_ERROR.format(
+                image_format=image_format,
+                formats=", ".join(self.FILE_EXTENSIONS)
+            ))
+
+        self.image_format = image_format
+        self.palette = palette
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 4 * self.workers
+        self.compression_level = compression_level
+        self.lossless = lossless
+        self.quality = quality
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque[Future] = deque()
+
+    @property
+    def file_extension(self) -> str:
+        return self.FILE_EXTENSIONS[self.image_format]
+
+    def write(self, image: Image.Image, path: Path):
+        # Waiting on the oldest write keeps the number of images held in memory bounded.
+        while len(self._pending) >= self.max_pending:
+            self._pending.popleft().result()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._pending.append(self._executor.submit(self.save, image, path))
+
+    def flush(self):
+        while self._pending:
+            self._pending.popleft().result()
+
+    def close(self):
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def save(self, image: Image.Image, path: Path):
+        if self.image_format == self.WEBP_FORMAT:
+            image.save(path, self.image_format, lossless=self.lossless, quality=self.quality)
+            return
+
+        if self.palette:
+            image = self.to_palette(image)
+        image.save(path, self.image_format, compress_level=self.compression_level)
+
+    def to_palette(self, image: Image.Image) -> Image.Image:
+        if image.mode != "RGB":
+            return image
+
+        colors = image.getcolors(self.MAX_PALETTE_COLORS)
+        if colors is None:
+            # Anti-aliased thumbnails only blend between background and ink, so 256 median-cut
+            # colors stay within a few levels of the original.
+            return image.quantize(self.MAX_PALETTE_COLORS, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+
+        palette_image = Image.new("P", (1, 1))
+        palette_image.putpalette([channel for _, color in colors for channel in color])
+        return image.quantize(palette=palette_image, dither=Image.Dither.NONE)
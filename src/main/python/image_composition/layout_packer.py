@@ -0,0 +1,130 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Placement:
+    index: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+@dataclass(frozen=True)
+class PackedLayout:
+    placements: List[Placement]
+    width: int
+    height: int
+
+    @property
+    def fill_ratio(self) -> float:
+        canvas_area = self.width * self.height
+        used_area = sum(placement.width * placement.height for placement in self.placements)
+        return used_area / canvas_area if canvas_area else 0.0
+
+
+class LayoutPacker(ABC):
+    INVALID_WIDTH_ERROR = "Canvas width must be positive, got {width}."
+    ITEM_TOO_WIDE_ERROR = "Item {index} is {item_width} pixels wide, which exceeds the canvas width of {width}."
+
+    def __init__(self, width: int):
+        if width < 1:
+            raise ValueError(self.INVALID_WIDTH_ERROR.format(width=width))
+        self.width = width
+
+    def pack(self, sizes: Sequence[Tuple[int, int]]) -> PackedLayout:
+        for index, (item_width, _) in enumerate(sizes):
+            if item_width > self.width:
+                raise ValueError(self.ITEM_TOO_WIDE_ERROR.format(index=index, item_width=item_width, width=self.width))
+
+        placements = sorted(self._place(sizes), key=lambda placement: placement.index)
+        used_width = max((placement.x + placement.width for placement in placements), default=0)
+        used_height = max((placement.y + placement.height for placement in placements), default=0)
+        return PackedLayout(placements, used_width, used_height)
+
+    @staticmethod
+    def order_by_height(sizes: Sequence[Tuple[int, int]]) -> List[int]:
+        return sorted(range(len(sizes)), key=lambda index: (-sizes[index][1], -sizes[index][0]))
+
+    @abstractmethod
+    def _place(self, sizes: Sequence[Tuple[int, int]]) -> List[Placement]:
+        pass
+
+
+class ShelfPacker(LayoutPacker):
+    def _place(self, sizes: Sequence[Tuple[int, int]]) -> List[Placement]:
+        # First-fit decreasing height: items go onto the first shelf with room left,
+        # and each new shelf is as tall as the first (tallest) item placed on it.
+        narrowest = min((item_width for item_width, _ in sizes), default=0)
+        open_shelves: List[List[int]] = []
+        bottom = 0
+        placements = []
+        for index in self.order_by_height(sizes):
+            item_width, item_height = sizes[index]
+            shelf = next((shelf for shelf in open_shelves if shelf[2] + item_width <= self.width), None)
+            if shelf is None:
+                shelf = [bottom, item_height, 0]
+                open_shelves.append(shelf)
+                bottom += item_height
+
+            placements.append(Placement(index, shelf[2], shelf[0], item_width, item_height))
+            shelf[2] += item_width
+            if shelf[2] + narrowest > self.width:
+                open_shelves.remove(shelf)
+        return placements
+
+
+class SkylinePacker(LayoutPacker):
+    def _place(self, sizes: Sequence[Tuple[int, int]]) -> List[Placement]:
+        # The skyline is a list of [x, y, width] segments covering the canvas from left to right.
+        skyline = [[0, 0, self.width]]
+        placements = []
+        for index in self.order_by_height(sizes):
+            item_width, item_height = sizes[index]
+            segment_index, y = self._find_position(skyline, item_width)
+            x = skyline[segment_index][0]
+            placements.append(Placement(index, x, y, item_width, item_height))
+            self._raise_skyline(skyline, segment_index, x, y + item_height, item_width)
+        return placements
+
+    def _find_position(self, skyline: List[List[int]], item_width: int) -> Tuple[int, int]:
+        best_index, best_y = 0, None
+        for segment_index, (x, _, _) in enumerate(skyline):
+            if x + item_width > self.width:
+                break
+
+            y = 0
+            remaining = item_width
+            for _, segment_y, segment_width in skyline[segment_index:]:
+                y = max(y, segment_y)
+                remaining -= segment_width
+                if remaining <= 0:
+                    break
+
+            if best_y is None or y < best_y:
+                best_index, best_y = segment_index, y
+        return best_index, best_y
+
+    @staticmethod
+    def _raise_skyline(skyline: List[List[int]], segment_index: int, x: int, y: int, item_width: int):
+        end = x + item_width
+        covered_end = segment_index
+        while covered_end < len(skyline) and skyline[covered_end][0] + skyline[covered_end][2] <= end:
+            covered_end += 1
+
+        replacement = [[x, y, item_width]]
+        if covered_end < len(skyline) and skyline[covered_end][0] < end:
+            segment_x, segment_y, segment_width = skyline[covered_end]
+            replacement.append([end, segment_y, segment_x + segment_width - end])
+            covered_end += 1
+        skyline[segment_index:covered_end] = replacement
+
+        merged = []
+        for segment in skyline:
+            if merged and merged[-1][1] == segment[1]:
+                merged[-1][2] += segment[2]
+            else:
+                merged.append(segment)
+        skyline[:] = merged
@@ -0,0 +1,84 @@
+import struct
+import zlib
+from typing import BinaryIO, Optional
+
+import numpy as np
+
+
+class PngStreamWriter:
+    SIGNATURE = b"\x89PNG\r\n\x1a\n"
+    COLOR_TYPES = {"L": (0, 1), "RGB": (2, 3), "P": (3, 1)}
+    BIT_DEPTH = 8
+    FILTER_NONE = 0
+    IDAT_CHUNK_SIZE = 1 << 16
+    UNSUPPORTED_MODE_ERROR = "Unsupported PNG mode {mode}, expected one of {modes}."
+    ROW_WIDTH_ERROR = "Rows must be {width} pixels wide, got {row_width}."
+    MISSING_PALETTE_ERROR = "Mode P requires a palette."
+
+    def __init__(
+            self,
+            output: BinaryIO,
+            width: int,
+            mode: str = "RGB",
+            palette: Optional[bytes] = None,
+            compression_level: int = 6
+    ):
+        if mode not in self.COLOR_TYPES:
+            raise ValueError(self.UNSUPPORTED_MODE_ERROR.format(mode=mode, modes=", ".join(self.COLOR_TYPES)))
+        if mode == "P" and not palette:
+            raise ValueError(self.MISSING_PALETTE_ERROR)
+
+        self.output = output
+        self.width = width
+        self.mode = mode
+        self.height = 0
+        self._compressor = zlib.compressobj(compression_level)
+        self._pending = bytearray()
+
+        self.output.write(self.SIGNATURE)
+        self._header_offset = self.output.tell()
+        self._write_header()
+        if palette:
+            self._write_chunk(b"PLTE", bytes(palette))
+
+    def write_rows(self, rows: np.ndarray):
+        _, channels = self.COLOR_TYPES[self.mode]
+        rows = np.ascontiguousarray(rows, dtype=np.uint8).reshape(len(rows), -1, channels)
+        if rows.shape[1] != self.width:
+            raise ValueError(self.ROW_WIDTH_ERROR.format(width=self.width, row_width=rows.shape[1]))
+
+        scanlines = np.empty((len(rows), 1 + self.width * channels), dtype=np.uint8)
+        scanlines[:, 0] = self.FILTER_NONE
+        scanlines[:, 1:] = rows.reshape(len(rows), -1)
+
+        self._pending += self._compressor.compress(scanlines.tobytes())
+        self.height += len(rows)
+        self._flush_pending(self.IDAT_CHUNK_SIZE)
+
+    def close(self) -> tuple[int, int]:
+        self._pending += self._compressor.flush()
+        self._flush_pending(1)
+        self._write_chunk(b"IEND", b"")
+
+        # The height is only known once every row is written, so the header is rewritten in place.
+        end_offset = self.output.tell()
+        self.output.seek(self._header_offset)
+        self._write_header()
+        self.output.seek(end_offset)
+        return self.width, self.height
+
+    def _flush_pending(self, minimum_size: int):
+        if len(self._pending) >= minimum_size:
+            self._write_chunk(b"IDAT", bytes(self._pending))
+            self._pending.clear()
+
+    def _write_header(self):
+        color_type, _ = self.COLOR_TYPES[self.mode]
+        header = struct.pack(">IIBBBBB", self.width, self.height, self.BIT_DEPTH, color_type, 0, 0, 0)
+        self._write_chunk(b"IHDR", header)
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes):
+        self.output.write(struct.pack(">I", len(data)))
+        self.output.write(chunk_type)
+        self.output.write(data)
+        self.output.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type))))
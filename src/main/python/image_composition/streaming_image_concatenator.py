@@ -0,0 +1,124 @@
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_composition.png_stream_writer import PngStreamWriter
+from src.main.python.image_generation.ink_palette import InkPalette
+
+
+class StreamingImageConcatenator:
+    def __init__(
+            self,
+            output_path: str,
+            columns: int = 4,
+            max_thumbnail_size: tuple[int, int] = (200, 200),
+            compression_level: int = 6
+    ):
+        self.output_path = output_path
+        self.columns = columns
+        self.max_thumbnail_size = max_thumbnail_size
+        self.compression_level = compression_level
+        self.border_color = (0, 0, 0)
+        self.border_width = 1
+
+        self.cell_size: Optional[tuple[int, int]] = None
+        self.image_count = 0
+        self.closed = False
+        self._output = None
+        self._writer: Optional[PngStreamWriter] = None
+        self._row: Optional[np.ndarray] = None
+        self._palette: Optional[list] = None
+        self._fill = self.border_color
+
+    @property
+    def thumbnail_size(self) -> tuple[int, int]:
+        return self.max_thumbnail_size
+
+    def __enter__(self) -> "StreamingImageConcatenator":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add_image(self, img: Image.Image, code_file: CodeFile = None):
+        self.add_thumbnail(InkPalette.thumbnail(img, self.max_thumbnail_size), code_file)
+
+    def add_thumbnail(self, thumbnail: Image.Image, code_file: CodeFile = None):
+        if self._writer is None:
+            self._open(thumbnail)
+
+        cell_width, cell_height = self.cell_size
+        column = self.image_count % self.columns
+        cell = self._row[:, column * cell_width:(column + 1) * cell_width]
+
+        # Like ImageConcatenator, every cell takes the size of the first bordered thumbnail;
+        # thumbnails are clipped to their own cell so a finished row never has to be revisited.
+        bordered_width = min(thumbnail.width + 2 * self.border_width, cell_width)
+        bordered_height = min(thumbnail.height + 2 * self.border_width, cell_height)
+        cell[:bordered_height, :bordered_width] = self._fill
+
+        pixels = np.asarray(self._to_row_mode(thumbnail))
+        inner = pixels[:cell_height - self.border_width, :cell_width - self.border_width]
+        cell[self.border_width:self.border_width + inner.shape[0],
+             self.border_width:self.border_width + inner.shape[1]] = inner
+
+        self.image_count += 1
+        if column == self.columns - 1:
+            self._flush_row()
+
+    def close(self) -> Optional[tuple[int, int]]:
+        if self.closed:
+            return None
+        if self._writer is None:
+            self._open(None)
+
+        if self.image_count % self.columns:
+            self._flush_row()
+
+        size = self._writer.close()
+        self._output.close()
+        self._row = None
+        self.closed = True
+        return size
+
+    def _open(self, first_thumbnail: Optional[Image.Image]):
+        if first_thumbnail is None:
+            self.cell_size = (1, 1)
+            width = 1
+        else:
+            self.cell_size = (
+                first_thumbnail.width + 2 * self.border_width,
+                first_thumbnail.height + 2 * self.border_width
+            )
+            width = self.columns * self.cell_size[0]
+
+        # Palette thumbnails stay one byte per pixel all the way into the PNG; the border uses its own index.
+        self._output = open(self.output_path, "wb")
+        if first_thumbnail is not None and first_thumbnail.mode == InkPalette.MODE:
+            self._palette = InkPalette.with_border_color(first_thumbnail.getpalette(), self.border_color)
+            self._fill = InkPalette.BORDER_INDEX
+            self._writer = PngStreamWriter(self._output, width, InkPalette.MODE, bytes(self._palette),
+                                           compression_level=self.compression_level)
+            self._row = np.full((self.cell_size[1], width), self._fill, dtype=np.uint8)
+        else:
+            self._writer = PngStreamWriter(self._output, width, compression_level=self.compression_level)
+            self._row = np.full((self.cell_size[1], width, 3), self._fill, dtype=np.uint8)
+        if first_thumbnail is None:
+            self._writer.write_rows(self._row)
+
+    def _to_row_mode(self, thumbnail: Image.Image) -> Image.Image:
+        if self._palette is None:
+            return thumbnail.convert("RGB")
+        if thumbnail.mode == InkPalette.MODE and thumbnail.getpalette()[:InkPalette.BORDER_INDEX * 3] == \
+                self._palette[:InkPalette.BORDER_INDEX * 3]:
+            return thumbnail
+
+        palette_image = Image.new(InkPalette.MODE, (1, 1))
+        palette_image.putpalette(self._palette)
+        return thumbnail.convert("RGB").quantize(palette=palette_image, dither=Image.Dither.NONE)
+
+    def _flush_row(self):
+        self._writer.write_rows(self._row)
+        self._row[:] = self._fill
@@ -0,0 +1,209 @@
+import json
+import os
+import shutil
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from math import ceil
+from pathlib import Path
+from typing import Deque, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_generation.ink_palette import InkPalette
+
+
+class PyramidLevel:
+    def __init__(self, composer: "TilePyramidComposer", index: int, width: int):
+        self.composer = composer
+        self.index = index
+        self.width = width
+        self.height = 0
+        self.strip = np.zeros((composer.tile_size, width, 3), dtype=np.uint8)
+        self.strip_rows = 0
+        self.tile_rows = 0
+
+    def append(self, rows: np.ndarray):
+        while len(rows):
+            count = min(len(rows), self.composer.tile_size - self.strip_rows)
+            self.strip[self.strip_rows:self.strip_rows + count] = rows[:count]
+            self.strip_rows += count
+            rows = rows[count:]
+            if self.strip_rows == self.composer.tile_size:
+                self.flush()
+
+    def flush(self):
+        if not self.strip_rows:
+            return
+
+        strip = self.strip[:self.strip_rows]
+        for column in range(ceil(self.width / self.composer.tile_size)):
+            tile = strip[:, column * self.composer.tile_size:(column + 1) * self.composer.tile_size]
+            if tile.any():
+                self.composer.save_tile(self.index, column, self.tile_rows, tile.copy())
+
+        self.composer.level(self.index + 1).append(self.downsample(strip))
+        self.height += self.strip_rows
+        self.tile_rows += 1
+        self.strip_rows = 0
+
+    @property
+    def fits_in_tile(self) -> bool:
+        return self.width <= self.composer.tile_size and self.height <= self.composer.tile_size
+
+    @staticmethod
+    def downsample(strip: np.ndarray) -> np.ndarray:
+        # Odd edges are padded by repeating the last row or column, so each level is half the size rounded up.
+        height, width, _ = strip.shape
+        padded = np.pad(strip, ((0, height % 2), (0, width % 2), (0, 0)), mode="edge").astype(np.uint16)
+        blocks = padded.reshape(len(padded) // 2, 2, padded.shape[1] // 2, 2, 3)
+        return ((blocks.sum(axis=(1, 3)) + 2) // 4).astype(np.uint8)
+
+
+class TilePyramidComposer:
+    TILES_DIRECTORY_NAME = "tiles"
+    TEMPLATES_DIRECTORY_NAME = "../../resources/templates"
+    DEFAULT_OUTPUT_DIRECTORY_NAME = "output"
+    STYLESHEET_FILENAME = "styles.css"
+    BASE_TEMPLATE_FILENAME = "base.html"
+    VIEWER_SCRIPT_FILENAME = "tile_viewer.js"
+    PYRAMID_SCRIPT_FILENAME = "pyramid.js"
+    OUTPUT_HTML_FILENAME = "index.html"
+    TILE_FILE_EXTENSION = ".png"
+    UNNAMED_FILE_DISPLAY_NAME = "unnamed"
+    INVALID_TILE_SIZE_ERROR = "Tile size must be an even number of pixels, got {tile_size}."
+
+    COLUMNS_PLACEHOLDER = "{{ columns }}"
+    GRID_ITEMS_PLACEHOLDER = "{{ grid_items }}"
+    SCRIPTS_PLACEHOLDER = "{{ scripts }}"
+
+    BORDER_WIDTH = 1
+
+    def __init__(
+            self,
+            output_directory: str = DEFAULT_OUTPUT_DIRECTORY_NAME,
+            columns: int = 10,
+            thumbnail_size: tuple[int, int] = (500, 1000),
+            tile_size: int = 256,
+            workers: Optional[int] = None,
+            compression_level: int = 1
+    ):
+        if tile_size < 2 or tile_size % 2:
+            raise ValueError(self.INVALID_TILE_SIZE_ERROR.format(tile_size=tile_size))
+
+        self.columns = columns
+        self.thumbnail_size = thumbnail_size
+        self.tile_size = tile_size
+        self.compression_level = compression_level
+        self.output_directory = Path(output_directory)
+        self.tiles_directory = self.output_directory / self.TILES_DIRECTORY_NAME
+        self.template_directory = Path(__file__).parent / self.TEMPLATES_DIRECTORY_NAME
+
+        self.cell_size = (thumbnail_size[0] + self.BORDER_WIDTH, thumbnail_size[1] + self.BORDER_WIDTH)
+        self.filenames: List[Optional[str]] = []
+        self.levels: List[PyramidLevel] = []
+        self.row = np.zeros((self.cell_size[1], columns * self.cell_size[0], 3), dtype=np.uint8)
+        self.tile_count = 0
+
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._pending_saves: Deque[Future] = deque()
+
+        # Tiles are regenerated on every run; leftovers from a larger map would otherwise stay visible.
+        shutil.rmtree(self.tiles_directory, ignore_errors=True)
+        self.tiles_directory.mkdir(parents=True)
+
+    def add_image(self, image: Image.Image, code_file: CodeFile):
+        self.add_thumbnail(InkPalette.thumbnail(image, self.thumbnail_size), code_file)
+
+    def add_thumbnail(self, thumbnail: Image.Image, code_file: CodeFile):
+        column = len(self.filenames) % self.columns
+        cell_width, cell_height = self.cell_size
+        pixels = np.asarray(thumbnail.convert("RGB"))[:cell_height - self.BORDER_WIDTH, :cell_width - self.BORDER_WIDTH]
+
+        left = column * cell_width + self.BORDER_WIDTH
+        self.row[self.BORDER_WIDTH:self.BORDER_WIDTH + pixels.shape[0], left:left + pixels.shape[1]] = pixels
+
+        self.filenames.append(code_file.filename if code_file else None)
+        if column == self.columns - 1:
+            self._flush_row()
+
+    def level(self, index: int) -> PyramidLevel:
+        if index == len(self.levels):
+            width = self.row.shape[1] if index == 0 else ceil(self.levels[index - 1].width / 2)
+            self.levels.append(PyramidLevel(self, index, width))
+        return self.levels[index]
+
+    def save_tile(self, level: int, column: int, row: int, pixels: np.ndarray):
+        while len(self._pending_saves) >= 4 * self.workers:
+            self._pending_saves.popleft().result()
+
+        tile_path = self.tiles_directory / str(level) / f"{column}_{row}{self.TILE_FILE_EXTENSION}"
+        self._pending_saves.append(self._executor.submit(self._write_tile, tile_path, pixels))
+        self.tile_count += 1
+
+    def _write_tile(self, tile_path: Path, pixels: np.ndarray):
+        tile_path.parent.mkdir(exist_ok=True)
+        Image.fromarray(pixels).save(tile_path, compress_level=self.compression_level)
+
+    def _flush_row(self):
+        self.level(0).append(self.row)
+        self.row[:] = 0
+
+    def generate_html(self):
+        level_count = self._finish_pyramid()
+        self._write_pyramid_script(level_count)
+        self._copy_template(self.STYLESHEET_FILENAME, {self.COLUMNS_PLACEHOLDER: "1"})
+        self._copy_template(self.VIEWER_SCRIPT_FILENAME, {})
+        self._copy_template(self.BASE_TEMPLATE_FILENAME, {
+            self.GRID_ITEMS_PLACEHOLDER: '<div class="tile-viewport" id="tile-viewport"></div>',
+            self.SCRIPTS_PLACEHOLDER: (
+                f'<script src="{self.PYRAMID_SCRIPT_FILENAME}"></script>\n'
+                f'    <script src="{self.VIEWER_SCRIPT_FILENAME}"></script>'
+            )
+        }, self.OUTPUT_HTML_FILENAME)
+        print(f"Tile viewer generated at: {(self.output_directory / self.OUTPUT_HTML_FILENAME).absolute()}")
+
+    def _finish_pyramid(self) -> int:
+        if len(self.filenames) % self.columns:
+            self._flush_row()
+
+        level_count = 0
+        if self.filenames:
+            while True:
+                current_level = self.level(level_count)
+                current_level.flush()
+                level_count += 1
+                if current_level.fits_in_tile:
+                    break
+
+        while self._pending_saves:
+            self._pending_saves.popleft().result()
+        self._executor.shutdown()
+        return level_count
+
+    def _write_pyramid_script(self, level_count: int):
+        pyramid = {
+            "width": self.levels[0].width if level_count else 0,
+            "height": self.levels[0].height if level_count else 0,
+            "tileSize": self.tile_size,
+            "levels": level_count,
+            "tilesDirectory": self.TILES_DIRECTORY_NAME,
+            "tileExtension": self.TILE_FILE_EXTENSION,
+            "columns": self.columns,
+            "cellWidth": self.cell_size[0],
+            "cellHeight": self.cell_size[1],
+            "files": [
+                Path(filename).name if filename else self.UNNAMED_FILE_DISPLAY_NAME
+                for filename in self.filenames
+            ]
+        }
+        script_path = self.output_directory / self.PYRAMID_SCRIPT_FILENAME
+        script_path.write_text(f"window.PYRAMID = {json.dumps(pyramid)};\n")
+
+    def _copy_template(self, template_filename: str, replacements: dict, output_filename: Optional[str] = None):
+        content = (self.template_directory / template_filename).read_text()
+        for placeholder, value in replacements.items():
+            content = content.replace(placeholder, value)
+        (self.output_directory / (output_filename or template_filename)).write_text(content)
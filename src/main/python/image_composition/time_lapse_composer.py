@@ -0,0 +1,79 @@
+from math import ceil
+from typing import Dict, Iterable, Iterator, Optional
+
+from PIL import Image
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_composition.image_concatenator import ImageConcatenator
+from src.main.python.image_generation.ink_palette import InkPalette
+
+FrameFiles = Dict[str, str]
+
+
+class TimeLapseComposer(ImageConcatenator):
+    def __init__(self, columns: int = 20, max_thumbnail_size: tuple[int, int] = (60, 60)):
+        super().__init__(columns, max_thumbnail_size)
+        self.cell_size = (
+            max_thumbnail_size[0] + 2 * self.border_width,
+            max_thumbnail_size[1] + 2 * self.border_width
+        )
+        self.tiles: Dict[str, Image.Image] = {}
+        self.slots: Dict[str, int] = {}
+        self.cells_painted = 0
+
+    def add_thumbnail(self, thumbnail: Image.Image, code_file: CodeFile = None):
+        # Tiles are keyed by content, so every distinct blob is drawn once for all frames that show it.
+        cell_width, cell_height = self.cell_size
+        tile = self._add_border(thumbnail)
+        if tile.width > cell_width or tile.height > cell_height:
+            tile = tile.crop((0, 0, min(tile.width, cell_width), min(tile.height, cell_height)))
+        self.tiles[code_file.content_hash()] = tile
+
+    def assign_slots(self, frames: Iterable[FrameFiles]):
+        # A file keeps its cell for the whole history, so frames only differ where files changed.
+        for files in frames:
+            for filename in sorted(files):
+                self.slots.setdefault(filename, len(self.slots))
+
+    def canvas_size(self) -> tuple[int, int]:
+        rows = max(1, ceil(len(self.slots) / self.columns))
+        return self.columns * self.cell_size[0], rows * self.cell_size[1]
+
+    def compose_frames(self, frames: Iterable[FrameFiles]) -> Iterator[Image.Image]:
+        canvas: Optional[Image.Image] = None
+        previous: FrameFiles = {}
+        for files in frames:
+            if canvas is None:
+                canvas = self._new_canvas()
+
+            for filename in previous.keys() - files.keys():
+                self._clear_cell(canvas, filename)
+            for filename, object_id in files.items():
+                if previous.get(filename) != object_id:
+                    self._paint_cell(canvas, filename, object_id)
+
+            previous = files
+            yield canvas.copy()
+
+    def _new_canvas(self) -> Image.Image:
+        sample = next(iter(self.tiles.values()), None)
+        if sample is None:
+            return Image.new("RGB", self.canvas_size(), self.border_color)
+        return InkPalette.new_like(sample, self.canvas_size(), self.border_color)
+
+    def _cell_origin(self, filename: str) -> tuple[int, int]:
+        slot = self.slots[filename]
+        return (slot % self.columns) * self.cell_size[0], (slot // self.columns) * self.cell_size[1]
+
+    def _clear_cell(self, canvas: Image.Image, filename: str):
+        x, y = self._cell_origin(filename)
+        fill = InkPalette.BORDER_INDEX if canvas.mode == InkPalette.MODE else self.border_color
+        canvas.paste(fill, (x, y, x + self.cell_size[0], y + self.cell_size[1]))
+
+    def _paint_cell(self, canvas: Image.Image, filename: str, object_id: str):
+        self._clear_cell(canvas, filename)
+        tile = self.tiles.get(object_id)
+        if tile is not None:
+            canvas.paste(tile, self._cell_origin(filename))
+        self.cells_painted += 1
+
@@ -1,9 +1,19 @@
-from PIL import Image, ImageDraw
+import math
+from typing import Optional
+
+import numpy as np
+from PIL import Image
 
 from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_generation.ink_palette import InkPalette
+from src.main.python.image_generation.line_layout import LineLayout
 
 
 class CodeImageGenerator:
+    INVALID_POINT_SIZE_ERROR = "Point width and height must be positive, got {point_width}x{point_height}."
+    INVALID_IMAGE_MODE_ERROR = "Image mode must be one of {modes}, got {image_mode}."
+    IMAGE_MODES = ("RGB", InkPalette.MODE)
+
     def __init__(
             self,
             image_min_width: int = 100,
@@ -12,8 +22,21 @@ class CodeImageGenerator:
             point_height: int = 3,
             background_color: tuple[int, int, int] = (30, 31, 34),
             text_color: tuple[int, int, int] = (188, 190, 196),
-            tab_size: int = 5
+            tab_size: int = 5,
+            coverage_thumbnails: bool = False,
+            image_mode: str = "RGB"
     ):
+        if point_width < 1 or point_height < 1:
+            raise ValueError(self.INVALID_POINT_SIZE_ERROR.format(
+                point_width=point_width,
+                point_height=point_height
+            ))
+        if image_mode not in self.IMAGE_MODES:
+            raise ValueError(self.INVALID_IMAGE_MODE_ERROR.format(
+                modes=", ".join(self.IMAGE_MODES),
+                image_mode=image_mode
+            ))
+
         self.image_min_width = image_min_width
         self.image_min_height = image_min_height
         self.point_width = point_width
@@ -21,57 +44,199 @@ class CodeImageGenerator:
         self.background_color = background_color
         self.text_color = text_color
         self.tab_size = tab_size
+        self.coverage_thumbnails = coverage_thumbnails
+        self.image_mode = image_mode
+        self.palette = InkPalette.colors(background_color, text_color)
+
+    def render_parameters(self) -> tuple:
+        return (
+            self.image_min_width,
+            self.image_min_height,
+            self.point_width,
+            self.point_height,
+            self.background_color,
+            self.text_color,
+            self.tab_size,
+            self.coverage_thumbnails,
+            self.image_mode
+        )
 
     def generate_image(self, code_file: CodeFile) -> Image.Image:
-        content_width, content_height = self._calculate_content_size(code_file.content)
-
-        image_width = max(self.image_min_width, content_width)
-        image_height = max(self.image_min_height, content_height)
-
-        image = Image.new("RGB", (image_width, image_height), self.background_color)
-        draw = ImageDraw.Draw(image)
-
-        if code_file.content:
-            self._draw_content(draw, code_file.content)
-
-        return image
-
-    def _calculate_content_size(self, content: str) -> tuple[int, int]:
-        if not content:
-            return (0, 0)
-
-        lines = content.splitlines(keepends=True)
-        max_line_width = 0
-
-        for line in lines:
-            line_width = 0
-            for char in line:
-                line_width += self._get_char_offset(char)
-            max_line_width = max(max_line_width, line_width)
-
-        total_height = len(lines) * self.point_height
-
-        return (max_line_width, total_height)
-
-    def _draw_content(self, draw: ImageDraw.Draw, content: str):
-        lines = content.splitlines(keepends=True)
-        y_offset = 0
-
-        for line in lines:
-            x_offset = 0
-            for char in line:
-                self._draw_char(draw, char, x_offset, y_offset)
-                x_offset += self._get_char_offset(char)
-            y_offset += self.point_height
-
-    def _draw_char(self, draw: ImageDraw.Draw, char: str, x: int, y: int):
-        color = self.text_color
-        if char in (' ', '\t', '\n'):
-            color = self.background_color
-        self._draw_point(draw, x, y, color)
-
-    def _draw_point(self, draw: ImageDraw.Draw, x: int, y: int, color: tuple[int, int, int]):
-        draw.rectangle([x, y, x + self.point_width, y + self.point_height], fill=color)
-
-    def _get_char_offset(self, char: str) -> int:
-        return self.tab_size * self.point_width if char == '\t' else self.point_width
+        return self.render_layout(self.compute_layout(code_file))
+
+    def generate_thumbnail(self, code_file: CodeFile, max_size: tuple[int, int]) -> Image.Image:
+        if self.coverage_thumbnails:
+            return self.render_thumbnail(self.compute_layout(code_file), max_size)
+
+        return InkPalette.thumbnail(self.generate_image(code_file), max_size)
+
+    def compute_layout(self, code_file: CodeFile) -> LineLayout:
+        if code_file.raw_content is not None:
+            return LineLayout.from_bytes(code_file.raw_content, self.tab_size, self.point_width, self.point_height)
+        return LineLayout.from_content(code_file.content, self.tab_size, self.point_width, self.point_height)
+
+    def calculate_image_size(self, layout: LineLayout) -> tuple[int, int]:
+        return (
+            max(self.image_min_width, layout.width),
+            max(self.image_min_height, layout.height)
+        )
+
+    def render_layout(self, layout: LineLayout) -> Image.Image:
+        image_width, image_height = self.calculate_image_size(layout)
+
+        if not layout.line_count:
+            return self._new_background_image((image_width, image_height))
+
+        ink_table, row_sources, column_sources = self._rasterize(layout, image_width, image_height)
+        ink_mask = ink_table[:, column_sources][row_sources]
+
+        if self.image_mode == InkPalette.MODE:
+            return InkPalette.from_indices(ink_mask.view(np.uint8) * np.uint8(InkPalette.INK_INDEX), self.palette)
+
+        image = Image.fromarray(ink_mask.view(np.uint8))
+        image.putpalette(self.background_color + self.text_color)
+        return image.convert("RGB")
+
+    def render_thumbnail(self, layout: LineLayout, max_size: tuple[int, int]) -> Image.Image:
+        image_size = self.calculate_image_size(layout)
+        thumbnail_size = self.thumbnail_size_for(image_size, max_size)
+        if thumbnail_size is None:
+            return self.render_layout(layout)
+
+        if not layout.line_count:
+            return self._new_background_image(thumbnail_size)
+
+        # Each thumbnail pixel gets the share of its source area covered by ink, so the
+        # full-size image is never built: only the small per-line ink table is touched.
+        ink_table, row_sources, column_sources = self._rasterize(layout, *image_size)
+        row_weights = self._aggregate_weights(row_sources, len(ink_table), image_size[1], thumbnail_size[1])
+        column_targets, column_table, column_weights = self._aggregate_weights(
+            column_sources, ink_table.shape[1], image_size[0], thumbnail_size[0]
+        )
+
+        column_matrix = np.zeros((ink_table.shape[1], thumbnail_size[0]), dtype=np.float32)
+        np.add.at(column_matrix, (column_table, column_targets), column_weights)
+        coverage = self._reduce_rows(ink_table, *row_weights, thumbnail_size[1]) @ column_matrix
+
+        if self.image_mode == InkPalette.MODE:
+            return InkPalette.from_indices(np.rint(coverage * InkPalette.INK_INDEX), self.palette)
+
+        background = np.array(self.background_color, dtype=np.float32)
+        ink_shift = np.array(self.text_color, dtype=np.float32) - background
+        pixels = background + coverage[:, :, np.newaxis] * ink_shift
+        return Image.fromarray(np.clip(np.rint(pixels), 0, 255).astype(np.uint8))
+
+    def _new_background_image(self, size: tuple[int, int]) -> Image.Image:
+        if self.image_mode == InkPalette.MODE:
+            return InkPalette.from_indices(np.full(size[::-1], InkPalette.BACKGROUND_INDEX), self.palette)
+        return Image.new("RGB", size, self.background_color)
+
+    @staticmethod
+    def thumbnail_size_for(image_size: tuple[int, int], max_size: tuple[int, int]) -> Optional[tuple[int, int]]:
+        # Same target size as Image.thumbnail, or None when the image already fits.
+        width, height = image_size
+        target_width, target_height = map(math.floor, max_size)
+        if target_width >= width and target_height >= height:
+            return None
+
+        def round_aspect(number: float, key) -> int:
+            return max(min(math.floor(number), math.ceil(number), key=key), 1)
+
+        aspect = width / height
+        if target_width / target_height >= aspect:
+            target_width = round_aspect(target_height * aspect, key=lambda n: abs(aspect - n / target_height))
+        else:
+            target_height = round_aspect(
+                target_width / aspect,
+                key=lambda n: 0 if n == 0 else abs(aspect - target_width / n)
+            )
+        return target_width, target_height
+
+    @staticmethod
+    def _box_weights(source_length: int, target_length: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        scale = source_length / target_length
+        breakpoints = np.union1d(
+            np.arange(source_length + 1, dtype=np.float64),
+            np.minimum(np.arange(target_length + 1) * scale, source_length)
+        )
+        lengths = np.diff(breakpoints)
+        midpoints = breakpoints[:-1] + lengths / 2
+        keep = lengths > 1e-9
+
+        sources = midpoints[keep].astype(np.int64)
+        targets = np.minimum((midpoints[keep] / scale).astype(np.int64), target_length - 1)
+        return sources, targets, lengths[keep] / scale
+
+    def _aggregate_weights(
+            self,
+            table_sources: np.ndarray,
+            table_length: int,
+            source_length: int,
+            target_length: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        sources, targets, weights = self._box_weights(source_length, target_length)
+        keys, inverse = np.unique(targets * table_length + table_sources[sources], return_inverse=True)
+        return keys // table_length, keys % table_length, np.bincount(inverse, weights)
+
+    @staticmethod
+    def _reduce_rows(
+            ink_table: np.ndarray,
+            targets: np.ndarray,
+            table_rows: np.ndarray,
+            weights: np.ndarray,
+            target_length: int,
+            chunk_size: int = 2048
+    ) -> np.ndarray:
+        reduced = np.zeros((target_length, ink_table.shape[1]), dtype=np.float32)
+        for start in range(0, len(targets), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            chunk_targets = targets[chunk]
+            weighted_rows = ink_table[table_rows[chunk]] * weights[chunk, np.newaxis].astype(np.float32)
+
+            first_rows = np.flatnonzero(np.concatenate(([True], chunk_targets[1:] != chunk_targets[:-1])))
+            reduced[chunk_targets[first_rows]] += np.add.reduceat(weighted_rows, first_rows, axis=0)
+        return reduced
+
+    def _rasterize(
+            self,
+            layout: LineLayout,
+            image_width: int,
+            image_height: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # The image is described as a small table of distinct pixel rows and columns plus, for every
+        # pixel row and column, the table entry it shows; the full mask is ink_table[rows][:, columns].
+        column_count = -(-image_width // self.point_width) + 1
+        occupancy_grid = layout.to_occupancy_grid(column_count)
+
+        # Every point is painted one pixel wider and taller than its cell, so the first column of a
+        # cell and the first row of a line show the previous cell or line wherever nothing covers them.
+        edge_grid = occupancy_grid.copy()
+        edge_grid[:, 1:] = np.where(
+            occupancy_grid[:, 1:] != LineLayout.TAB_PADDING,
+            occupancy_grid[:, 1:],
+            occupancy_grid[:, :-1]
+        )
+        line_cells = np.concatenate((occupancy_grid, edge_grid), axis=1)
+
+        seam_cells = line_cells.copy()
+        seam_cells[1:] = np.where(line_cells[1:] != LineLayout.TAB_PADDING, line_cells[1:], line_cells[:-1])
+
+        line_count = len(line_cells)
+        ink_table = np.concatenate((
+            line_cells,
+            seam_cells,
+            line_cells[-1:],
+            np.full((1, line_cells.shape[1]), LineLayout.TAB_PADDING, dtype=np.int8)
+        )) == LineLayout.INK
+
+        columns = np.arange(image_width)
+        column_sources = columns // self.point_width + np.where(columns % self.point_width == 0, column_count, 0)
+
+        rows = np.arange(image_height)
+        row_lines = rows // self.point_height
+        is_seam = rows % self.point_height == 0
+        row_sources = np.where(is_seam, line_count + row_lines, row_lines)
+        row_sources[row_lines >= line_count] = 2 * line_count + 1
+        row_sources[is_seam & (row_lines == line_count)] = 2 * line_count
+
+        return ink_table, row_sources, column_sources
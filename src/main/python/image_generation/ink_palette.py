@@ -0,0 +1,56 @@
+from typing import List
+
+import numpy as np
+from PIL import Image
+
+
+class InkPalette:
+    MODE = "P"
+    BACKGROUND_INDEX = 0
+    INK_INDEX = 254
+    BORDER_INDEX = 255
+
+    @classmethod
+    def colors(
+            cls,
+            background_color: tuple[int, int, int],
+            text_color: tuple[int, int, int],
+            border_color: tuple[int, int, int] = (0, 0, 0)
+    ) -> List[int]:
+        # Indices 0..254 blend linearly from background to ink, so averaging indices averages colors.
+        levels = np.arange(cls.INK_INDEX + 1)[:, np.newaxis] / cls.INK_INDEX
+        background = np.array(background_color)
+        ramp = np.rint(background + levels * (np.array(text_color) - background)).astype(int)
+        return ramp.flatten().tolist() + list(border_color)
+
+    @classmethod
+    def from_indices(cls, indices: np.ndarray, palette: List[int]) -> Image.Image:
+        image = Image.fromarray(indices.astype(np.uint8, copy=False))
+        image.putpalette(palette)
+        return image
+
+    @classmethod
+    def thumbnail(cls, image: Image.Image, max_size: tuple[int, int]) -> Image.Image:
+        if image.mode != cls.MODE:
+            image.thumbnail(max_size)
+            return image
+
+        # Pillow resizes palette images with nearest neighbour; the ramp lets the indices be
+        # resampled as grey levels instead. Overshoot past full ink must not reach the border entry.
+        indices = Image.fromarray(np.asarray(image))
+        indices.thumbnail(max_size)
+        return cls.from_indices(np.minimum(np.asarray(indices), cls.INK_INDEX), image.getpalette())
+
+    @classmethod
+    def with_border_color(cls, palette: List[int], border_color: tuple[int, int, int]) -> List[int]:
+        start = cls.BORDER_INDEX * 3
+        return palette[:start] + list(border_color) + palette[start + 3:]
+
+    @classmethod
+    def new_like(cls, image: Image.Image, size: tuple[int, int], border_color: tuple[int, int, int]) -> Image.Image:
+        if image.mode != cls.MODE:
+            return Image.new("RGB", size, border_color)
+
+        canvas = Image.new(cls.MODE, size, cls.BORDER_INDEX)
+        canvas.putpalette(cls.with_border_color(image.getpalette(), border_color))
+        return canvas
@@ -0,0 +1,234 @@
+from dataclasses import dataclass
+from typing import ClassVar, List, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True, eq=False)
+class LineLayout:
+    INK: ClassVar[int] = 1
+    BLANK: ClassVar[int] = 0
+    TAB_PADDING: ClassVar[int] = -1
+
+    TAB: ClassVar[int] = 0x09
+    LINE_FEED: ClassVar[int] = 0x0A
+    CARRIAGE_RETURN: ClassVar[int] = 0x0D
+    BLANK_CODE_POINTS: ClassVar[Tuple[int, ...]] = (0x20, TAB, LINE_FEED)
+    LINE_BREAK_CODE_POINTS: ClassVar[Tuple[int, ...]] = (
+        LINE_FEED, 0x0B, 0x0C, CARRIAGE_RETURN, 0x1C, 0x1D, 0x1E, 0x85, 0x2028, 0x2029
+    )
+    REPLACEMENT_CHARACTER: ClassVar[int] = 0xFFFD
+    INVALID_UTF8_BYTES: ClassVar[Tuple[int, ...]] = (0xC0, 0xC1, *range(0xF5, 0x100))
+    MULTI_BYTE_LINE_BREAKS: ClassVar[Tuple[Tuple[bytes, int], ...]] = (
+        (b"\xc2\x85", 0x85),
+        (b"\xe2\x80\xa8", 0x2028),
+        (b"\xe2\x80\xa9", 0x2029)
+    )
+
+    point_width: int
+    point_height: int
+    line_widths: np.ndarray
+    span_offsets: np.ndarray
+    span_starts: np.ndarray
+    span_lengths: np.ndarray
+    span_kinds: np.ndarray
+
+    @classmethod
+    def from_content(cls, content: str, tab_size: int, point_width: int, point_height: int) -> "LineLayout":
+        code_points = np.frombuffer(content.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        return cls.from_code_points(code_points, tab_size, point_width, point_height)
+
+    @classmethod
+    def from_bytes(cls, data, tab_size: int, point_width: int, point_height: int) -> "LineLayout":
+        code_units = np.frombuffer(data, dtype=np.uint8)
+        return cls.from_code_points(cls.decode_code_units(code_units), tab_size, point_width, point_height)
+
+    @classmethod
+    def decode_code_units(cls, code_units: np.ndarray) -> np.ndarray:
+        code_points = code_units.astype(np.uint32)
+        if not cls.is_utf8(code_units):
+            return code_points
+
+        # Only line breaks and blanks change the layout, so every other multi-byte character
+        # collapses into a single ink code point at the position of its lead byte.
+        code_points[code_units >= 0xC0] = cls.REPLACEMENT_CHARACTER
+        for sequence, code_point in cls.MULTI_BYTE_LINE_BREAKS:
+            code_points[cls._find_sequence(code_units, sequence)] = code_point
+        return code_points[(code_units & 0xC0) != 0x80]
+
+    @classmethod
+    def is_utf8(cls, code_units: np.ndarray) -> bool:
+        if np.isin(code_units, cls.INVALID_UTF8_BYTES).any():
+            return False
+
+        is_continuation = (code_units & 0xC0) == 0x80
+        lead_positions = np.flatnonzero(code_units >= 0xC0)
+        lead_bytes = code_units[lead_positions]
+        continuation_counts = (
+            (lead_bytes >= 0xC0).astype(np.int64) + (lead_bytes >= 0xE0) + (lead_bytes >= 0xF0)
+        )
+        if continuation_counts.sum() != is_continuation.sum():
+            return False
+
+        for offset in range(1, 4):
+            positions = lead_positions[continuation_counts >= offset] + offset
+            if (positions >= len(code_units)).any() or not is_continuation[positions].all():
+                return False
+        return True
+
+    @staticmethod
+    def _find_sequence(code_units: np.ndarray, sequence: bytes) -> np.ndarray:
+        candidate_count = len(code_units) - len(sequence) + 1
+        if candidate_count <= 0:
+            return np.zeros(0, dtype=np.int64)
+
+        found = np.ones(candidate_count, dtype=bool)
+        for offset, value in enumerate(sequence):
+            found &= code_units[offset:offset + candidate_count] == value
+        return np.flatnonzero(found)
+
+    @classmethod
+    def from_code_points(
+            cls,
+            code_points: np.ndarray,
+            tab_size: int,
+            point_width: int,
+            point_height: int
+    ) -> "LineLayout":
+        if not len(code_points):
+            return cls.empty(point_width, point_height)
+
+        # Mirrors str.splitlines(keepends=True): the break stays on its line and "\r\n" counts once.
+        ends_line = np.isin(code_points, cls.LINE_BREAK_CODE_POINTS)
+        ends_line[:-1] &= ~((code_points[:-1] == cls.CARRIAGE_RETURN) & (code_points[1:] == cls.LINE_FEED))
+        starts_line = np.concatenate(([True], ends_line[:-1]))
+        line_starts = np.flatnonzero(starts_line)
+        char_lines = (np.cumsum(starts_line) - 1).astype(np.int32)
+
+        is_tab = code_points == cls.TAB
+        advances = np.where(is_tab, tab_size, 1).astype(np.int64)
+        char_ends = np.cumsum(advances)
+        char_cells = char_ends - advances
+        char_cells -= char_cells[line_starts][char_lines]
+        line_widths = np.add.reduceat(advances, line_starts)
+        char_kinds = np.where(np.isin(code_points, cls.BLANK_CODE_POINTS), cls.BLANK, cls.INK).astype(np.int8)
+
+        # Zero-width tabs share a cell with their successor, which is drawn on top of them.
+        drawn = np.ones(len(code_points), dtype=bool)
+        drawn[:-1] = (char_lines[1:] != char_lines[:-1]) | (char_cells[1:] != char_cells[:-1])
+
+        segment_lines, segment_starts, segment_lengths, segment_kinds = cls._interleave_tab_padding(
+            char_lines[drawn], char_cells[drawn], char_kinds[drawn], is_tab[drawn], tab_size
+        )
+
+        starts_span = np.ones(len(segment_lines), dtype=bool)
+        starts_span[1:] = (segment_lines[1:] != segment_lines[:-1]) | (segment_kinds[1:] != segment_kinds[:-1])
+        span_indices = np.flatnonzero(starts_span)
+        span_lines = segment_lines[span_indices]
+
+        return cls(
+            point_width=point_width,
+            point_height=point_height,
+            line_widths=line_widths,
+            span_offsets=np.searchsorted(span_lines, np.arange(len(line_starts) + 1)),
+            span_starts=segment_starts[span_indices],
+            span_lengths=np.add.reduceat(segment_lengths, span_indices),
+            span_kinds=segment_kinds[span_indices]
+        )
+
+    @classmethod
+    def empty(cls, point_width: int, point_height: int) -> "LineLayout":
+        no_spans = np.zeros(0, dtype=np.int64)
+        return cls(
+            point_width=point_width,
+            point_height=point_height,
+            line_widths=no_spans,
+            span_offsets=np.zeros(1, dtype=np.int64),
+            span_starts=no_spans,
+            span_lengths=no_spans,
+            span_kinds=np.zeros(0, dtype=np.int8)
+        )
+
+    @staticmethod
+    def _interleave_tab_padding(
+            lines: np.ndarray,
+            starts: np.ndarray,
+            kinds: np.ndarray,
+            is_tab: np.ndarray,
+            tab_size: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        if tab_size <= 1:
+            return lines, starts, np.ones(len(lines), dtype=np.int64), kinds
+
+        padding_before = np.cumsum(is_tab) - is_tab
+        own_positions = np.arange(len(lines)) + padding_before
+        padding_positions = own_positions[is_tab] + 1
+
+        segment_count = len(lines) + len(padding_positions)
+        segment_lines = np.empty(segment_count, dtype=lines.dtype)
+        segment_starts = np.empty(segment_count, dtype=np.int64)
+        segment_lengths = np.ones(segment_count, dtype=np.int64)
+        segment_kinds = np.empty(segment_count, dtype=np.int8)
+
+        segment_lines[own_positions] = lines
+        segment_starts[own_positions] = starts
+        segment_kinds[own_positions] = kinds
+
+        segment_lines[padding_positions] = lines[is_tab]
+        segment_starts[padding_positions] = starts[is_tab] + 1
+        segment_lengths[padding_positions] = tab_size - 1
+        segment_kinds[padding_positions] = LineLayout.TAB_PADDING
+
+        return segment_lines, segment_starts, segment_lengths, segment_kinds
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_widths)
+
+    @property
+    def width(self) -> int:
+        return int(self.line_widths.max()) * self.point_width if self.line_count else 0
+
+    @property
+    def height(self) -> int:
+        return self.line_count * self.point_height
+
+    @property
+    def line_pixel_widths(self) -> np.ndarray:
+        return self.line_widths * self.point_width
+
+    @property
+    def indentation_widths(self) -> np.ndarray:
+        # Cells before the first ink span of each line; lines without ink are -1.
+        indentation = np.full(self.line_count, -1, dtype=np.int64)
+        is_ink = self.span_kinds == self.INK
+        span_lines = np.repeat(np.arange(self.line_count), np.diff(self.span_offsets))[is_ink]
+        ink_lines, first_spans = np.unique(span_lines, return_index=True)
+        indentation[ink_lines] = self.span_starts[is_ink][first_spans]
+        return indentation
+
+    def line_spans(self, line_index: int) -> List[Tuple[int, int, int]]:
+        span_range = slice(self.span_offsets[line_index], self.span_offsets[line_index + 1])
+        return list(zip(
+            self.span_starts[span_range].tolist(),
+            self.span_lengths[span_range].tolist(),
+            self.span_kinds[span_range].tolist()
+        ))
+
+    def to_occupancy_grid(self, column_count: int) -> np.ndarray:
+        grid = np.full((self.line_count, column_count), self.TAB_PADDING, dtype=np.int8)
+
+        drawn = self.span_kinds != self.TAB_PADDING
+        span_lines = np.repeat(np.arange(self.line_count), np.diff(self.span_offsets))[drawn]
+        lengths = self.span_lengths[drawn]
+
+        cell_count = int(lengths.sum())
+        span_firsts = np.cumsum(lengths) - lengths
+        cell_columns = (
+            np.arange(cell_count)
+            - np.repeat(span_firsts, lengths)
+            + np.repeat(self.span_starts[drawn], lengths)
+        )
+
+        grid[np.repeat(span_lines, lengths), cell_columns] = np.repeat(self.span_kinds[drawn], lengths)
+        return grid
@@ -0,0 +1,151 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from PIL import Image
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+from src.main.python.image_generation.render_cache import RenderCache
+
+EncodedImage = Tuple[str, Tuple[int, int], bytes, Optional[List[int]]]
+
+_worker_generator: Optional[CodeImageGenerator] = None
+
+
+def _initialize_worker(generator: CodeImageGenerator):
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _render_chunk(code_files: List[CodeFile], thumbnail_size: Optional[tuple[int, int]]) -> List[EncodedImage]:
+    return ParallelImageRenderer.render_encoded(_worker_generator, code_files, thumbnail_size)
+
+
+class ParallelImageRenderer:
+    INVALID_CHUNK_SIZE_ERROR = "Chunk size must be positive, got {chunk_size}."
+
+    def __init__(
+            self,
+            generator: CodeImageGenerator,
+            workers: Optional[int] = None,
+            chunk_size: int = 8,
+            max_pending_chunks: Optional[int] = None,
+            cache: Optional[RenderCache] = None
+    ):
+        if chunk_size < 1:
+            raise ValueError(self.INVALID_CHUNK_SIZE_ERROR.format(chunk_size=chunk_size))
+
+        self.generator = generator
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks or 2 * self.workers
+        self.cache = cache
+
+    def render(self, code_files: Iterable[CodeFile]) -> Iterator[Tuple[Image.Image, CodeFile]]:
+        return self._render(code_files, None)
+
+    def render_thumbnails(
+            self,
+            code_files: Iterable[CodeFile],
+            thumbnail_size: tuple[int, int]
+    ) -> Iterator[Tuple[Image.Image, CodeFile]]:
+        return self._render(code_files, thumbnail_size)
+
+    def _render(
+            self,
+            code_files: Iterable[CodeFile],
+            thumbnail_size: Optional[tuple[int, int]]
+    ) -> Iterator[Tuple[Image.Image, CodeFile]]:
+        if self.workers == 1:
+            for chunk in self._chunks(code_files):
+                yield from self._collect(*self._submit(None, chunk, thumbnail_size))
+            return
+
+        with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_initialize_worker,
+                initargs=(self.generator,)
+        ) as executor:
+            pending = deque()
+            for chunk in self._chunks(code_files):
+                pending.append(self._submit(executor, chunk, thumbnail_size))
+                if len(pending) >= self.max_pending_chunks:
+                    yield from self._collect(*pending.popleft())
+
+            while pending:
+                yield from self._collect(*pending.popleft())
+
+    def _chunks(self, code_files: Iterable[CodeFile]) -> Iterator[List[CodeFile]]:
+        iterator = iter(code_files)
+        while chunk := list(islice(iterator, self.chunk_size)):
+            yield chunk
+
+    def _submit(
+            self,
+            executor: Optional[ProcessPoolExecutor],
+            chunk: List[CodeFile],
+            thumbnail_size: Optional[tuple[int, int]]
+    ) -> tuple[List[CodeFile], List[Optional[str]], List[Optional[Image.Image]], Future]:
+        cache_keys = [self._cache_key(code_file, thumbnail_size) for code_file in chunk]
+        cached_images = [self.cache.get(key) if key else None for key in cache_keys]
+        misses = [code_file for code_file, image in zip(chunk, cached_images) if image is None]
+
+        if executor and misses:
+            future = executor.submit(_render_chunk, misses, thumbnail_size)
+        else:
+            future = Future()
+            future.set_result(self.render_encoded(self.generator, misses, thumbnail_size))
+
+        return chunk, cache_keys, cached_images, future
+
+    def _collect(
+            self,
+            chunk: List[CodeFile],
+            cache_keys: List[Optional[str]],
+            cached_images: List[Optional[Image.Image]],
+            future: Future
+    ) -> Iterator[Tuple[Image.Image, CodeFile]]:
+        rendered_images = iter(future.result())
+        for code_file, cache_key, image in zip(chunk, cache_keys, cached_images):
+            if image is None:
+                image = self.decode_image(next(rendered_images))
+                if cache_key:
+                    self.cache.put(cache_key, image)
+            yield image, code_file
+
+    def _cache_key(self, code_file: CodeFile, thumbnail_size: Optional[tuple[int, int]]) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return self.cache.key_for(code_file, self.generator, thumbnail_size)
+
+    @classmethod
+    def render_encoded(
+            cls,
+            generator: CodeImageGenerator,
+            code_files: List[CodeFile],
+            thumbnail_size: Optional[tuple[int, int]]
+    ) -> List[EncodedImage]:
+        encoded_images = []
+        for code_file in code_files:
+            if thumbnail_size:
+                image = generator.generate_thumbnail(code_file, thumbnail_size)
+            else:
+                image = generator.generate_image(code_file)
+            encoded_images.append(cls.encode_image(image))
+        return encoded_images
+
+    @staticmethod
+    def encode_image(image: Image.Image) -> EncodedImage:
+        palette = image.getpalette() if image.mode == "P" else None
+        return image.mode, image.size, image.tobytes(), palette
+
+    @staticmethod
+    def decode_image(encoded_image: EncodedImage) -> Image.Image:
+        mode, size, data, palette = encoded_image
+        image = Image.frombytes(mode, size, data)
+        if palette:
+            image.putpalette(palette)
+        return image
@@ -0,0 +1,119 @@
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+
+
+@dataclass(frozen=True)
+class CacheStatistics:
+    hits: int
+    misses: int
+    evictions: int
+    entry_count: int
+    size_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class RenderCache:
+    ENTRY_FILE_EXTENSION = ".png"
+    TEMPORARY_FILE_SUFFIX = ".tmp"
+    INVALID_SIZE_LIMIT_ERROR = "Cache size limit must be positive, got {max_bytes} bytes."
+
+    def __init__(self, directory: str, max_bytes: int = 1024 ** 3):
+        if max_bytes < 1:
+            raise ValueError(self.INVALID_SIZE_LIMIT_ERROR.format(max_bytes=max_bytes))
+
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries = self._load_entries()
+        self._size_bytes = sum(self._entries.values())
+
+    def key_for(
+            self,
+            code_file: CodeFile,
+            generator: CodeImageGenerator,
+            thumbnail_size: Optional[tuple[int, int]] = None
+    ) -> str:
+        digest = hashlib.sha256(code_file.content_hash().encode("ascii"))
+        digest.update(repr(generator.render_parameters()).encode("utf-8"))
+        digest.update(repr(thumbnail_size).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Image.Image]:
+        if key not in self._entries:
+            self.misses += 1
+            return None
+
+        entry_path = self._entry_path(key)
+        try:
+            with Image.open(entry_path) as cached_image:
+                cached_image.load()
+            os.utime(entry_path)
+        except OSError:
+            self._forget(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return cached_image
+
+    def put(self, key: str, image: Image.Image):
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(exist_ok=True)
+
+        temporary_path = entry_path.with_name(entry_path.name + self.TEMPORARY_FILE_SUFFIX)
+        image.save(temporary_path, format="PNG")
+        os.replace(temporary_path, entry_path)
+
+        self._size_bytes -= self._entries.pop(key, 0)
+        self._entries[key] = entry_path.stat().st_size
+        self._size_bytes += self._entries[key]
+        self._evict()
+
+    def statistics(self) -> CacheStatistics:
+        return CacheStatistics(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            entry_count=len(self._entries),
+            size_bytes=self._size_bytes
+        )
+
+    def _evict(self):
+        while self._size_bytes > self.max_bytes and len(self._entries) > 1:
+            key, _ = next(iter(self._entries.items()))
+            self._forget(key)
+            self.evictions += 1
+
+    def _forget(self, key: str):
+        self._size_bytes -= self._entries.pop(key)
+        self._entry_path(key).unlink(missing_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.ENTRY_FILE_EXTENSION}"
+
+    def _load_entries(self) -> "OrderedDict[str, int]":
+        entries = []
+        for entry_path in self.directory.glob(f"*/*{self.ENTRY_FILE_EXTENSION}"):
+            stat = entry_path.stat()
+            entries.append((stat.st_mtime_ns, entry_path.stem, stat.st_size))
+
+        entries.sort()
+        return OrderedDict((key, size) for _, key, size in entries)
@@ -1,41 +1,347 @@
-from image_composition.html_image_composer import HtmlImageComposer
-from image_generation.code_image_generator import CodeImageGenerator
+import argparse
+import os
+import re
+import sys
+from contextlib import closing, nullcontext
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.code_loading.code_loader import CodeLoader
+from src.main.python.code_loading.directory_walker import DirectoryWalker
 from src.main.python.code_loading.file_system_loader import FileSystemLoader
+from src.main.python.code_loading.git_file_loader import GitFileLoader
+from src.main.python.code_loading.git_object_loader import GitObjectLoader
+from src.main.python.code_loading.git_hub_file_loader import GitHubFileLoader
+from src.main.python.code_loading.mapped_file_reader import MappedFileReader
+from src.main.python.history.history_time_lapse import HistoryTimeLapse
+from src.main.python.image_composition.html_image_composer import HtmlImageComposer
+from src.main.python.image_composition.image_writer import ImageWriter
+from src.main.python.image_composition.layout_packer import ShelfPacker, SkylinePacker
+from src.main.python.image_composition.streaming_image_concatenator import StreamingImageConcatenator
+from src.main.python.image_composition.tile_pyramid_composer import TilePyramidComposer
+from src.main.python.image_composition.time_lapse_composer import TimeLapseComposer
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+from src.main.python.image_generation.parallel_image_renderer import ParallelImageRenderer
+from src.main.python.image_generation.render_cache import RenderCache
+from src.main.python.metrics.code_metrics import CodeMetrics
+from src.main.python.metrics.metrics_index import MetricsIndex
+from src.main.python.pipeline.streaming_pipeline import StreamingPipeline
+from src.main.python.profiling.profiler import Profiler
 
+LOADERS = ("filesystem", "git", "git-objects", "github")
+OUTPUT_MODES = ("html", "concatenated", "tiles", "history")
+PACKERS = {"grid": None, "shelf": ShelfPacker, "skyline": SkylinePacker}
+DEFAULT_OUTPUTS = {
+    "html": "output/html_output",
+    "concatenated": "output/overview.png",
+    "tiles": "output/tile_output",
+    "history": "output/history_output"
+}
+BYTE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+INVALID_SIZE_ERROR = "Expected WIDTHxHEIGHT, got '{value}'."
+INVALID_BYTE_COUNT_ERROR = "Expected a byte count such as 512M or 2G, got '{value}'."
+INCREMENTAL_MODE_ERROR = "--incremental is only supported for the html output mode."
+VIRTUAL_MODE_ERROR = "--virtual is only supported for the html output mode with the grid packer."
 
-def sort_images_by_height(images_with_files):
-    decorated = [(image.height, image, file) for image, file in images_with_files]
-    decorated.sort(reverse=True, key=lambda x: x[0])
-    return [(image, file) for height, image, file in decorated]
 
-if __name__ == "__main__":
-    #directory = r'D:\dev\spring-boot\spring-boot-project\spring-boot-actuator'
-    directory = r'D:/Python/dev/code-visualizer'
+def parse_size(value: str) -> tuple[int, int]:
+    match = re.fullmatch(r"(\d+)[xX](\d+)", value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(INVALID_SIZE_ERROR.format(value=value))
+    return int(match.group(1)), int(match.group(2))
+
+
+def parse_byte_count(value: str) -> int:
+    match = re.fullmatch(r"(\d+)\s*([KMGT]?)i?B?", value.strip(), re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(INVALID_BYTE_COUNT_ERROR.format(value=value))
+    return int(match.group(1)) * BYTE_UNITS[match.group(2).upper()]
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Render source files as abstract structure images.")
+    parser.add_argument("sources", nargs="+", help="directories, files or GitHub URLs to visualize")
+
+    loading = parser.add_argument_group("loading")
+    loading.add_argument("--loader", choices=LOADERS, default="filesystem")
+    loading.add_argument("--pattern", dest="patterns", action="append", help="file pattern, e.g. '*.py' (repeatable)")
+    loading.add_argument("--ignore", dest="ignore_patterns", action="append", default=[], help="ignore pattern (repeatable)")
+    loading.add_argument("--no-gitignore", dest="use_gitignore", action="store_false", help="do not honor .gitignore files")
+    loading.add_argument("--revision", default="HEAD",
+                         help="git-objects loader: commit, tag or branch to render without checking it out")
+    loading.add_argument("--no-untracked", dest="include_untracked", action="store_false",
+                         help="git loader: skip files git does not track")
+    loading.add_argument("--github-token", default=os.environ.get("GITHUB_TOKEN"))
+
+    rendering = parser.add_argument_group("rendering")
+    rendering.add_argument("--min-size", type=parse_size, default=(400, 300), help="minimum image size, WIDTHxHEIGHT")
+    rendering.add_argument("--point-size", type=parse_size, default=(3, 5), help="size of one character, WIDTHxHEIGHT")
+    rendering.add_argument("--tab-size", type=int, default=5)
+    rendering.add_argument("--image-mode", choices=CodeImageGenerator.IMAGE_MODES, default="P",
+                           help="P keeps one byte per pixel from rendering to the written PNGs")
+    rendering.add_argument("--exact-thumbnails", dest="coverage_thumbnails", action="store_false",
+                           help="render full images and resample them instead of rendering at thumbnail scale")
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--output-mode", choices=OUTPUT_MODES, default="html")
+    output.add_argument("--output", help="output directory, the PNG path for concatenated output, "
+                                         "or a GIF/WebP path for an animated history")
+    output.add_argument("--columns", type=int, default=20)
+    output.add_argument("--thumbnail-size", type=parse_size, help="maximum thumbnail size, WIDTHxHEIGHT")
+    output.add_argument("--packer", choices=list(PACKERS), default="grid", help="html layout")
+    output.add_argument("--image-format", type=str.upper, choices=ImageWriter.FILE_EXTENSIONS,
+                        default=ImageWriter.PNG_FORMAT)
+    output.add_argument("--incremental", action="store_true", help="reuse thumbnails of unchanged files")
+    output.add_argument("--virtual", action="store_true",
+                        help="html: stream a compact file list and render only the visible rows in the browser")
+    output.add_argument("--metrics-index", help="SQLite file for structural metrics, stored next to the output by default")
+    output.add_argument("--worst", type=int, default=0, metavar="N", help="print the N most deeply nested files")
+
+    history = parser.add_argument_group("history")
+    history.add_argument("--history-step", type=int, default=1, metavar="N", help="render every Nth commit")
+    history.add_argument("--max-frames", type=int, help="raise the step so that at most this many frames are rendered")
+    history.add_argument("--frame-duration", type=int, default=200, metavar="MS", help="milliseconds per frame")
+
+    performance = parser.add_argument_group("performance")
+    performance.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="render processes")
+    performance.add_argument("--chunk-size", type=int, default=8, help="files per render task")
+    performance.add_argument("--cache-dir", help="directory of the persistent render cache")
+    performance.add_argument("--cache-size", type=parse_byte_count, default=2 * 1024 ** 3)
+    performance.add_argument("--memory-budget", type=parse_byte_count,
+                             help="bound for thumbnails in flight between renderer and writer, e.g. 512M")
+    performance.add_argument("--profile", action="store_true", help="print stage timings when done")
+    performance.add_argument("--profile-output", help="directory for profile.json and trace.json")
+    return parser
+
+
+def create_loader(options: argparse.Namespace) -> CodeLoader:
+    if options.loader == "github":
+        return GitHubFileLoader(token=options.github_token, use_archive=True)
+    if options.loader == "git":
+        return GitFileLoader(MappedFileReader(), options.include_untracked)
+    if options.loader == "git-objects":
+        return GitObjectLoader(options.revision)
+    return FileSystemLoader(DirectoryWalker(use_gitignore=options.use_gitignore), MappedFileReader())
+
+
+def thumbnail_size_for(options: argparse.Namespace) -> tuple[int, int]:
+    if options.thumbnail_size:
+        return options.thumbnail_size
+    if options.output_mode == "history":
+        return 60, 60
+    return (200, 200) if options.output_mode == "concatenated" else (500, 1000)
+
+
+def pending_thumbnail_limit(options: argparse.Namespace) -> Optional[int]:
+    if not options.memory_budget:
+        return None
+
+    width, height = thumbnail_size_for(options)
+    channels = 1 if options.image_mode in ("L", "P") else 3
+    return max(1, options.memory_budget // (width * height * channels))
+
+
+def create_renderer(options: argparse.Namespace, generator: CodeImageGenerator) -> ParallelImageRenderer:
+    cache = RenderCache(options.cache_dir, max_bytes=options.cache_size) if options.cache_dir else None
+
+    # Renderer and writer each get half of the budget for the thumbnails they hold.
+    pending_chunks = None
+    limit = pending_thumbnail_limit(options)
+    if limit:
+        pending_chunks = max(1, limit // 2 // options.chunk_size)
+    return ParallelImageRenderer(generator, options.workers, options.chunk_size, pending_chunks, cache)
+
+
+def output_path_for(options: argparse.Namespace) -> Path:
+    return Path(options.output or DEFAULT_OUTPUTS[options.output_mode])
+
+
+def metrics_index_path_for(options: argparse.Namespace) -> Path:
+    if options.metrics_index:
+        return Path(options.metrics_index)
+
+    output = output_path_for(options)
+    if options.output_mode == "concatenated":
+        return output.with_name(f"{output.stem}.{MetricsIndex.INDEX_FILENAME}")
+    return output / MetricsIndex.INDEX_FILENAME
 
-    loader = FileSystemLoader()
-    ignore_patterns = [
-        "**/__pycache__/**",
-        "**/venv/**"
-    ]
 
-    found_files = loader.load_code_files([directory], ["*.py"], ignore_patterns=ignore_patterns)
+def create_sink(options: argparse.Namespace, generator: CodeImageGenerator):
+    output = str(output_path_for(options))
+    thumbnail_size = thumbnail_size_for(options)
 
-    generator = CodeImageGenerator(400, 300, 3, 5)
+    if options.output_mode == "concatenated":
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        return StreamingImageConcatenator(output, options.columns, thumbnail_size)
+    if options.output_mode == "tiles":
+        return TilePyramidComposer(output, options.columns, thumbnail_size, workers=options.workers)
 
-    images_with_files = []
-    for file in found_files:
-        image = generator.generate_image(file)
-        images_with_files.append((image, file))
+    limit = pending_thumbnail_limit(options)
+    writer = ImageWriter(
+        options.image_format,
+        palette=options.image_mode == "P",
+        max_pending=max(1, limit // 2) if limit else None
+    )
+    packer = PACKERS[options.packer]
+    return HtmlImageComposer(
+        output_directory=output,
+        columns=options.columns,
+        thumbnail_size=thumbnail_size,
+        incremental=options.incremental,
+        packer=packer() if packer else None,
+        writer=writer,
+        virtual=options.virtual,
+        render_parameters=generator.render_parameters()
+    )
+
+
+def render(
+        options: argparse.Namespace,
+        loader: CodeLoader,
+        generator: CodeImageGenerator,
+        renderer: ParallelImageRenderer,
+        sink,
+        metrics_index: MetricsIndex
+) -> List[CodeMetrics]:
+    file_patterns = options.patterns or ["*.py"]
+    if isinstance(loader, (FileSystemLoader, GitObjectLoader)):
+        # Change-aware loaders skip reading files that are unchanged since the run recorded in the index.
+        pipeline = StreamingPipeline(loader, generator, renderer, previous_metrics=metrics_index)
+        metadata = pipeline.run(options.sources, file_patterns, options.ignore_patterns, sink)
+        return [entry.metrics for entry in metadata]
+
+    # Remote loaders cannot reload single files, so their files are rendered in the order they arrive.
+    metrics = []
+    code_files = measure(loader.iter_code_files(options.sources, file_patterns, options.ignore_patterns),
+                         generator, metrics)
+    for thumbnail, code_file in renderer.render_thumbnails(code_files, sink.thumbnail_size):
+        sink.add_thumbnail(thumbnail, code_file)
+    return metrics
+
+
+def measure(
+        code_files: Iterable[CodeFile],
+        generator: CodeImageGenerator,
+        metrics: List[CodeMetrics]
+) -> Iterator[CodeFile]:
+    for code_file in code_files:
+        layout = generator.compute_layout(code_file)
+        metrics.append(CodeMetrics.from_layout(code_file.filename, layout, generator.tab_size))
+        yield code_file
+
+
+def render_history(options: argparse.Namespace, renderer: ParallelImageRenderer, profiler: Optional[Profiler]):
+    composer = TimeLapseComposer(options.columns, thumbnail_size_for(options))
+    with GitObjectLoader(options.revision) as loader:
+        time_lapse = HistoryTimeLapse(loader, renderer, composer, options.history_step, options.max_frames)
+        if profiler:
+            for target in (loader, renderer, composer, time_lapse):
+                profiler.instrument(target)
+
+        frames = time_lapse.collect_frames(
+            options.sources,
+            options.patterns or ["*.py"],
+            options.ignore_patterns,
+            options.revision
+        )
+        output = output_path_for(options)
+        if output.suffix.lower() in HistoryTimeLapse.ANIMATION_FORMATS:
+            time_lapse.save_animation(frames, str(output), options.frame_duration)
+        else:
+            writer = ImageWriter(options.image_format, palette=options.image_mode == "P")
+            time_lapse.save_html(frames, str(output), writer, options.frame_duration)
+
+    print(f"History: {len(frames)} frames, {time_lapse.rendered_blobs} distinct blobs rendered, "
+          f"{composer.cells_painted} cells painted")
+
+
+def print_worst_files(metrics_index: MetricsIndex, count: int):
+    print(f"{'depth':>5} {'mean':>6} {'lines':>7}  file")
+    for metrics in metrics_index.worst("max_depth", count):
+        hot_spots = ", ".join(f"{spot.first_line}-{spot.last_line}" for spot in metrics.hot_spots)
+        print(f"{metrics.max_depth:5d} {metrics.mean_depth:6.2f} {metrics.line_count:7d}  {metrics.filename}"
+              + (f"  (hot spots: {hot_spots})" if hot_spots else ""))
 
-    sorted_images = sort_images_by_height(images_with_files)
 
-    composer = HtmlImageComposer(
-        output_directory="../output/html_output",
-        columns=20,
-        thumbnail_size=(500, 1000)
+def finish(sink):
+    if isinstance(sink, StreamingImageConcatenator):
+        sink.close()
+    else:
+        sink.generate_html()
+
+
+def print_profile(profiler: Profiler):
+    report = profiler.report()
+    print(f"{'stage':<44} {'calls':>7} {'seconds':>9} {'files':>7} {'MB':>8} {'Mpixels':>9}")
+    for name, stage in sorted(report["stages"].items(), key=lambda item: -item[1]["seconds"]):
+        print(f"{name:<44} {stage['calls']:7d} {stage['seconds']:9.3f} {stage['files']:7d} "
+              f"{stage['bytes'] / 1024 ** 2:8.2f} {stage['pixels'] / 1e6:9.2f}")
+
+    if report["slowest_files"]:
+        print("Slowest files:")
+        for timing in report["slowest_files"]:
+            print(f"  {timing['seconds']:8.3f}s  {timing['stage']:<36} {timing['filename']}")
+
+
+def report_performance(renderer: ParallelImageRenderer, profiler: Optional[Profiler], options: argparse.Namespace):
+    if renderer.cache:
+        print(f"Render cache: {renderer.cache.statistics()}")
+    if profiler:
+        print_profile(profiler)
+        if options.profile_output:
+            profile_directory = Path(options.profile_output)
+            profile_directory.mkdir(parents=True, exist_ok=True)
+            profiler.write_report(str(profile_directory / "profile.json"))
+            profiler.write_chrome_trace(str(profile_directory / "trace.json"))
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = build_argument_parser()
+    options = parser.parse_args(arguments)
+    if options.incremental and options.output_mode != "html":
+        parser.error(INCREMENTAL_MODE_ERROR)
+    if options.virtual and (options.output_mode != "html" or PACKERS[options.packer]):
+        parser.error(VIRTUAL_MODE_ERROR)
+
+    generator = CodeImageGenerator(
+        *options.min_size,
+        *options.point_size,
+        tab_size=options.tab_size,
+        coverage_thumbnails=options.coverage_thumbnails,
+        image_mode=options.image_mode
     )
+    renderer = create_renderer(options, generator)
+    profiler = Profiler() if options.profile or options.profile_output else None
+    if profiler:
+        profiler.instrument(generator)
+    if options.output_mode == "history":
+        with profiler.stage("total") if profiler else nullcontext():
+            render_history(options, renderer, profiler)
+        report_performance(renderer, profiler, options)
+        return 0
+
+    loader = create_loader(options)
+    sink = create_sink(options, generator)
+    if profiler:
+        for target in (loader, renderer, sink, getattr(sink, "writer", None)):
+            if target is not None:
+                profiler.instrument(target)
+
+    # The object loader keeps a git cat-file process running, which must not outlive a failed run either.
+    with MetricsIndex(str(metrics_index_path_for(options))) as metrics_index:
+        with closing(loader) if isinstance(loader, GitObjectLoader) else nullcontext():
+            with profiler.stage("total") if profiler else nullcontext():
+                metrics = render(options, loader, generator, renderer, sink, metrics_index)
+                finish(sink)
 
-    for image, file in sorted_images:
-        composer.add_image(image, file)
+        metrics_index.replace_all(metrics)
+        if options.worst:
+            print_worst_files(metrics_index, options.worst)
 
-    composer.generate_html()
+    report_performance(renderer, profiler, options)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
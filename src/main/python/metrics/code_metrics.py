@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import ClassVar, Optional, Tuple
+
+import numpy as np
+
+from src.main.python.image_generation.line_layout import LineLayout
+
+
+@dataclass(frozen=True)
+class NestingHotSpot:
+    first_line: int
+    last_line: int
+    depth: int
+
+    @property
+    def line_count(self) -> int:
+        return self.last_line - self.first_line + 1
+
+
+@dataclass(frozen=True)
+class CodeMetrics:
+    HOT_SPOT_DEPTH: ClassVar[int] = 4
+    MAX_HOT_SPOTS: ClassVar[int] = 5
+
+    filename: Optional[str]
+    line_count: int
+    code_line_count: int
+    max_line_width: int
+    indent_unit: int
+    max_depth: int
+    mean_depth: float
+    hot_spots: Tuple[NestingHotSpot, ...] = ()
+    content_hash: Optional[str] = None
+
+    @classmethod
+    def from_layout(
+            cls,
+            filename: Optional[str],
+            layout: LineLayout,
+            default_indent_unit: int,
+            hot_spot_depth: int = HOT_SPOT_DEPTH,
+            content_hash: Optional[str] = None
+    ) -> "CodeMetrics":
+        indentation = layout.indentation_widths
+        code_lines = np.flatnonzero(indentation >= 0)
+        max_line_width = int(layout.line_widths.max()) if layout.line_count else 0
+        if not len(code_lines):
+            return cls(filename, layout.line_count, 0, max_line_width, default_indent_unit, 0, 0.0,
+                       content_hash=content_hash)
+
+        code_indentation = indentation[code_lines]
+        indent_unit = cls.detect_indent_unit(code_indentation, default_indent_unit)
+        depths = code_indentation // indent_unit
+
+        return cls(
+            filename=filename,
+            line_count=layout.line_count,
+            code_line_count=len(code_lines),
+            max_line_width=max_line_width,
+            indent_unit=indent_unit,
+            max_depth=int(depths.max()),
+            mean_depth=round(float(depths.mean()), 3),
+            hot_spots=cls.find_hot_spots(code_lines, depths, hot_spot_depth),
+            content_hash=content_hash
+        )
+
+    @staticmethod
+    def detect_indent_unit(code_indentation: np.ndarray, default_indent_unit: int) -> int:
+        # The most common step between consecutive code lines is the file's indentation width.
+        steps = np.diff(code_indentation)
+        steps = steps[steps > 0]
+        if not len(steps):
+            return max(1, default_indent_unit)
+        return int(np.bincount(steps).argmax())
+
+    @classmethod
+    def find_hot_spots(
+            cls,
+            code_lines: np.ndarray,
+            depths: np.ndarray,
+            hot_spot_depth: int
+    ) -> Tuple[NestingHotSpot, ...]:
+        is_deep = np.concatenate(([0], (depths >= hot_spot_depth).astype(np.int8), [0]))
+        edges = np.diff(is_deep)
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+
+        hot_spots = [
+            NestingHotSpot(int(code_lines[start]) + 1, int(code_lines[end - 1]) + 1, int(depths[start:end].max()))
+            for start, end in zip(run_starts, run_ends)
+        ]
+        hot_spots.sort(key=lambda hot_spot: (-hot_spot.depth, -hot_spot.line_count, hot_spot.first_line))
+        return tuple(hot_spots[:cls.MAX_HOT_SPOTS])
@@ -0,0 +1,159 @@
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.main.python.metrics.code_metrics import CodeMetrics, NestingHotSpot
+
+
+class MetricsIndex:
+    INDEX_FILENAME = "metrics.sqlite"
+    METRIC_COLUMNS = ("line_count", "code_line_count", "max_line_width", "indent_unit", "max_depth", "mean_depth")
+    SCHEMA_VERSION = 2
+    UNKNOWN_METRIC_ERROR = "Unknown metric '{metric}', expected one of: {metrics}."
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            filename TEXT PRIMARY KEY,
+            line_count INTEGER NOT NULL,
+            code_line_count INTEGER NOT NULL,
+            max_line_width INTEGER NOT NULL,
+            indent_unit INTEGER NOT NULL,
+            max_depth INTEGER NOT NULL,
+            mean_depth REAL NOT NULL,
+            content_hash TEXT
+        );
+        CREATE TABLE IF NOT EXISTS hot_spots (
+            filename TEXT NOT NULL REFERENCES files(filename) ON DELETE CASCADE,
+            first_line INTEGER NOT NULL,
+            last_line INTEGER NOT NULL,
+            depth INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS hot_spots_by_file ON hot_spots(filename);
+        CREATE INDEX IF NOT EXISTS files_by_line_count ON files(line_count);
+        CREATE INDEX IF NOT EXISTS files_by_max_depth ON files(max_depth);
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        # The index is derived data, so an index written by another version is rebuilt rather than migrated.
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self._connection.executescript("DROP TABLE IF EXISTS hot_spots; DROP TABLE IF EXISTS files;")
+            self._connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._connection.executescript(self.SCHEMA)
+
+    def __enter__(self) -> "MetricsIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def replace_all(self, metrics: Iterable[CodeMetrics]):
+        with self._connection:
+            self._connection.execute("DELETE FROM files")
+            self._insert(metrics)
+
+    def update(self, metrics: Iterable[CodeMetrics]):
+        with self._connection:
+            self._insert(metrics)
+
+    def _insert(self, metrics: Iterable[CodeMetrics]):
+        metrics = [entry for entry in metrics if entry.filename]
+        self._connection.executemany(
+            "DELETE FROM hot_spots WHERE filename = ?",
+            [(entry.filename,) for entry in metrics]
+        )
+        self._connection.executemany(
+            f"INSERT OR REPLACE INTO files (filename, {', '.join(self.METRIC_COLUMNS)}, content_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (entry.filename, *(getattr(entry, column) for column in self.METRIC_COLUMNS), entry.content_hash)
+                for entry in metrics
+            ]
+        )
+        self._connection.executemany(
+            "INSERT INTO hot_spots (filename, first_line, last_line, depth) VALUES (?, ?, ?, ?)",
+            [
+                (entry.filename, hot_spot.first_line, hot_spot.last_line, hot_spot.depth)
+                for entry in metrics
+                for hot_spot in entry.hot_spots
+            ]
+        )
+
+    def get(self, filename: str) -> Optional[CodeMetrics]:
+        results = self.query(where="filename = ?", parameters=(filename,))
+        return results[0] if results else None
+
+    def worst(self, metric: str = "max_depth", count: int = 10) -> List[CodeMetrics]:
+        return self.query(order_by=metric, limit=count)
+
+    def query(
+            self,
+            order_by: str = "line_count",
+            descending: bool = True,
+            path_pattern: Optional[str] = None,
+            min_depth: Optional[int] = None,
+            min_lines: Optional[int] = None,
+            limit: Optional[int] = None,
+            where: Optional[str] = None,
+            parameters: tuple = ()
+    ) -> List[CodeMetrics]:
+        self._check_metric(order_by)
+
+        conditions, arguments = [], list(parameters)
+        if where:
+            conditions.append(where)
+        if path_pattern:
+            conditions.append("filename GLOB ?")
+            arguments.append(path_pattern)
+        if min_depth is not None:
+            conditions.append("max_depth >= ?")
+            arguments.append(min_depth)
+        if min_lines is not None:
+            conditions.append("line_count >= ?")
+            arguments.append(min_lines)
+
+        statement = f"SELECT filename, {', '.join(self.METRIC_COLUMNS)}, content_hash FROM files"
+        if conditions:
+            statement += " WHERE " + " AND ".join(f"({condition})" for condition in conditions)
+        statement += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, filename"
+        if limit is not None:
+            statement += " LIMIT ?"
+            arguments.append(limit)
+
+        rows = self._connection.execute(statement, arguments).fetchall()
+        hot_spots = self._hot_spots([row[0] for row in rows])
+        return [
+            CodeMetrics(*row[:-1], hot_spots=hot_spots.get(row[0], ()), content_hash=row[-1])
+            for row in rows
+        ]
+
+    def values(self, metric: str) -> Dict[str, float]:
+        self._check_metric(metric)
+        return dict(self._connection.execute(f"SELECT filename, {metric} FROM files"))
+
+    def _hot_spots(self, filenames: List[str]) -> Dict[str, tuple]:
+        hot_spots: Dict[str, list] = {}
+        # SQLite limits the number of bound parameters, so large result sets are looked up in batches.
+        for batch_start in range(0, len(filenames), 500):
+            batch = filenames[batch_start:batch_start + 500]
+            rows = self._connection.execute(
+                "SELECT filename, first_line, last_line, depth FROM hot_spots "
+                f"WHERE filename IN ({', '.join('?' * len(batch))}) ORDER BY rowid",
+                batch
+            )
+            for filename, first_line, last_line, depth in rows:
+                hot_spots.setdefault(filename, []).append(NestingHotSpot(first_line, last_line, depth))
+        return {filename: tuple(entries) for filename, entries in hot_spots.items()}
+
+    def _check_metric(self, metric: str):
+        if metric not in self.METRIC_COLUMNS:
+            raise ValueError(self.UNKNOWN_METRIC_ERROR.format(metric=metric, metrics=", ".join(self.METRIC_COLUMNS)))
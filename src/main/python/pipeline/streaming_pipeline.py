@@ -0,0 +1,185 @@
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple, runtime_checkable
+
+from PIL import Image
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.code_loading.file_system_loader import FileSystemLoader
+from src.main.python.code_loading.git_file_loader import FileState
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+from src.main.python.image_generation.parallel_image_renderer import ParallelImageRenderer
+from src.main.python.metrics.code_metrics import CodeMetrics
+from src.main.python.metrics.metrics_index import MetricsIndex
+
+
+class ImageSink(Protocol):
+    thumbnail_size: tuple[int, int]
+
+    def add_thumbnail(self, thumbnail: Image.Image, code_file: CodeFile):
+        ...
+
+
+@runtime_checkable
+class IncrementalImageSink(ImageSink, Protocol):
+    def has_current_thumbnail(self, filename: str, content_hash: str) -> bool:
+        ...
+
+    def add_existing_thumbnail(self, filename: str):
+        ...
+
+
+@runtime_checkable
+class ChangeAwareLoader(Protocol):
+    def iter_file_states(
+            self,
+            source_paths: List[str],
+            file_patterns: List[str],
+            ignore_patterns: List[str] = None
+    ) -> Iterator[FileState]:
+        ...
+
+    def read_file(self, filename: str) -> Optional[CodeFile]:
+        ...
+
+
+@runtime_checkable
+class PrefetchingLoader(Protocol):
+    batch_size: int
+
+    def prefetch(self, filenames: List[str]):
+        ...
+
+
+@dataclass(frozen=True)
+class FileMetadata:
+    filename: str
+    height: int
+    content_hash: Optional[str] = None
+    metrics: Optional[CodeMetrics] = None
+
+
+class StreamingPipeline:
+    def __init__(
+            self,
+            loader: FileSystemLoader,
+            generator: CodeImageGenerator,
+            renderer: Optional[ParallelImageRenderer] = None,
+            previous_metrics: Optional[MetricsIndex] = None
+    ):
+        self.loader = loader
+        self.generator = generator
+        self.renderer = renderer or ParallelImageRenderer(generator, workers=1)
+        self.previous_metrics = previous_metrics
+
+    def run(
+            self,
+            source_paths: List[str],
+            file_patterns: List[str],
+            ignore_patterns: List[str],
+            sink: ImageSink
+    ) -> List[FileMetadata]:
+        metadata = self.sort_by_height(self.collect_metadata(source_paths, file_patterns, ignore_patterns))
+        pending: Deque[Tuple[FileMetadata, bool]] = deque()
+
+        changed_files = self._load_changed_files(metadata, sink, pending)
+
+        for thumbnail, code_file in self.renderer.render_thumbnails(changed_files, sink.thumbnail_size):
+            self._add_reused_thumbnails(pending, sink)
+            pending.popleft()
+            sink.add_thumbnail(thumbnail, code_file)
+        self._add_reused_thumbnails(pending, sink)
+
+        return metadata
+
+    def collect_metadata(
+            self,
+            source_paths: List[str],
+            file_patterns: List[str],
+            ignore_patterns: List[str] = None
+    ) -> List[FileMetadata]:
+        if self.previous_metrics is not None and isinstance(self.loader, ChangeAwareLoader):
+            return self._collect_changed_metadata(source_paths, file_patterns, ignore_patterns)
+
+        return [
+            self._describe(code_file)
+            for code_file in self.loader.iter_code_files(source_paths, file_patterns, ignore_patterns)
+        ]
+
+    def _collect_changed_metadata(
+            self,
+            source_paths: List[str],
+            file_patterns: List[str],
+            ignore_patterns: List[str] = None
+    ) -> List[FileMetadata]:
+        # Files whose content hash matches the previous run keep their metrics and are never read.
+        previous: Dict[str, CodeMetrics] = {metrics.filename: metrics for metrics in self.previous_metrics.query()}
+        metadata = []
+        for batch in self._batches(self.loader.iter_file_states(source_paths, file_patterns, ignore_patterns)):
+            current = {
+                file_state.filename: metrics
+                for file_state in batch
+                if file_state.content_hash and (metrics := previous.get(file_state.filename)) and
+                metrics.content_hash == file_state.content_hash
+            }
+            self._prefetch([file_state.filename for file_state in batch if file_state.filename not in current])
+
+            for file_state in batch:
+                if metrics := current.get(file_state.filename):
+                    height = self._height_for(metrics)
+                    metadata.append(FileMetadata(file_state.filename, height, metrics.content_hash, metrics))
+                elif code_file := self.loader.read_file(file_state.filename):
+                    metadata.append(self._describe(code_file))
+        return metadata
+
+    def _batches(self, items: Iterable) -> Iterator[list]:
+        batch_size = self.loader.batch_size if isinstance(self.loader, PrefetchingLoader) else 1
+        iterator = iter(items)
+        while batch := list(islice(iterator, batch_size)):
+            yield batch
+
+    def _prefetch(self, filenames: List[str]):
+        if filenames and isinstance(self.loader, PrefetchingLoader):
+            self.loader.prefetch(filenames)
+
+    @staticmethod
+    def sort_by_height(metadata: List[FileMetadata]) -> List[FileMetadata]:
+        return sorted(metadata, key=lambda entry: entry.height, reverse=True)
+
+    def _describe(self, code_file: CodeFile) -> FileMetadata:
+        # The layout that sizes the image also yields the structural metrics, so sources are scanned once.
+        layout = self.generator.compute_layout(code_file)
+        _, height = self.generator.calculate_image_size(layout)
+        content_hash = code_file.content_hash()
+        metrics = CodeMetrics.from_layout(
+            code_file.filename, layout, self.generator.tab_size, content_hash=content_hash
+        )
+        return FileMetadata(code_file.filename, height, content_hash, metrics)
+
+    def _height_for(self, metrics: CodeMetrics) -> int:
+        return max(self.generator.image_min_height, metrics.line_count * self.generator.point_height)
+
+    def _load_changed_files(
+            self,
+            metadata: List[FileMetadata],
+            sink: ImageSink,
+            pending: Deque[Tuple[FileMetadata, bool]]
+    ) -> Iterator[CodeFile]:
+        incremental = isinstance(sink, IncrementalImageSink)
+        for batch in self._batches(metadata):
+            changed = []
+            for entry in batch:
+                reusable = incremental and sink.has_current_thumbnail(entry.filename, entry.content_hash)
+                pending.append((entry, reusable))
+                if not reusable:
+                    changed.append(entry.filename)
+
+            self._prefetch(changed)
+            for filename in changed:
+                yield self.loader.load_file(filename)
+
+    @staticmethod
+    def _add_reused_thumbnails(pending: Deque[Tuple[FileMetadata, bool]], sink: ImageSink):
+        while pending and pending[0][1]:
+            sink.add_existing_thumbnail(pending.popleft()[0].filename)
@@ -0,0 +1,201 @@
+import heapq
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional
+
+from PIL import Image
+
+from src.main.python.code_loading.code_file import CodeFile
+
+
+@dataclass
+class StageStatistics:
+    calls: int = 0
+    seconds: float = 0.0
+    files: int = 0
+    bytes: int = 0
+    pixels: int = 0
+
+
+@dataclass(frozen=True, order=True)
+class FileTiming:
+    seconds: float
+    stage: str
+    filename: str
+
+
+@dataclass
+class Measurement:
+    files: int = 0
+    bytes: int = 0
+    pixels: int = 0
+    filename: Optional[str] = None
+
+    def add(self, value: Any):
+        if isinstance(value, CodeFile):
+            self.files += 1
+            self.bytes += code_file_size(value)
+            self.filename = self.filename or value.filename
+        elif isinstance(value, Image.Image):
+            self.pixels += value.width * value.height
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                self.add(item)
+
+
+def code_file_size(code_file: CodeFile) -> int:
+    if code_file.raw_content is not None:
+        return len(code_file.raw_content)
+    return len(code_file.content)
+
+
+class InstrumentedMethod:
+    def __init__(self, profiler: "Profiler", stage: str, method: Callable):
+        self.profiler = profiler
+        self.stage = stage
+        self.method = method
+        wraps(method)(self)
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        result = self.method(*args, **kwargs)
+        if inspect.isgenerator(result):
+            # Lazy results are timed per item, so consumer time between items is not attributed to this stage.
+            return self._iterate(result)
+        seconds = time.perf_counter() - start
+
+        measurement = Measurement()
+        measurement.add(args)
+        measurement.add(result)
+        self.profiler.record(self.stage, start, seconds, measurement)
+        return result
+
+    def _iterate(self, iterator: Iterator) -> Iterator:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            seconds = time.perf_counter() - start
+
+            measurement = Measurement()
+            measurement.add(item)
+            self.profiler.record(self.stage, start, seconds, measurement)
+            yield item
+
+    def __reduce__(self):
+        # Worker processes receive the plain method, so profiling never crosses process boundaries.
+        return getattr, (self.method.__self__, self.method.__name__)
+
+
+class Profiler:
+    INSTRUMENTED_METHODS = (
+        "load_code_files",
+        "iter_code_files",
+        "load_file",
+        "generate_image",
+        "generate_thumbnail",
+        "render",
+        "render_thumbnails",
+        "add_image",
+        "add_thumbnail",
+        "generate_html",
+        "concatenate",
+        "save",
+        "collect_frames",
+        "compose_frames",
+        "save_animation",
+        "save_html"
+    )
+    TRACE_PROCESS_NAME = "code-visualizer"
+
+    def __init__(self, slowest_file_count: int = 20, trace: bool = True):
+        self.slowest_file_count = slowest_file_count
+        self.trace = trace
+        self.stages: dict[str, StageStatistics] = {}
+        self.trace_events: List[dict] = []
+        self._slowest_files: List[FileTiming] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def instrument(self, target: Any, methods: Optional[List[str]] = None) -> Any:
+        prefix = type(target).__name__
+        for name in methods or self.INSTRUMENTED_METHODS:
+            method = getattr(target, name, None)
+            if method is None or isinstance(method, InstrumentedMethod):
+                continue
+
+            setattr(target, name, InstrumentedMethod(self, f"{prefix}.{name}", method))
+        return target
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Measurement]:
+        measurement = Measurement()
+        start = time.perf_counter()
+        try:
+            yield measurement
+        finally:
+            self.record(name, start, time.perf_counter() - start, measurement)
+
+    def record(self, stage: str, start: float, seconds: float, measurement: Measurement):
+        with self._lock:
+            statistics = self.stages.setdefault(stage, StageStatistics())
+            statistics.calls += 1
+            statistics.seconds += seconds
+            statistics.files += measurement.files
+            statistics.bytes += measurement.bytes
+            statistics.pixels += measurement.pixels
+
+            if measurement.filename and self.slowest_file_count:
+                timing = FileTiming(seconds, stage, measurement.filename)
+                if len(self._slowest_files) < self.slowest_file_count:
+                    heapq.heappush(self._slowest_files, timing)
+                else:
+                    heapq.heappushpop(self._slowest_files, timing)
+
+            if self.trace:
+                self.trace_events.append(self._trace_event(stage, start, seconds, measurement))
+
+    def slowest_files(self) -> List[FileTiming]:
+        with self._lock:
+            return sorted(self._slowest_files, reverse=True)
+
+    def report(self) -> dict:
+        with self._lock:
+            stages = {name: asdict(statistics) for name, statistics in self.stages.items()}
+        return {
+            "stages": stages,
+            "slowest_files": [asdict(timing) for timing in self.slowest_files()]
+        }
+
+    def write_report(self, path: str):
+        Path(path).write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+
+    def write_chrome_trace(self, path: str):
+        with self._lock:
+            events = list(self.trace_events)
+
+        metadata = {"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": self.TRACE_PROCESS_NAME}}
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": [metadata, *events], "displayTimeUnit": "ms"}, trace_file)
+
+    def _trace_event(self, stage: str, start: float, seconds: float, measurement: Measurement) -> dict:
+        arguments = {key: value for key, value in asdict(measurement).items() if value}
+        return {
+            "name": stage,
+            "cat": stage.partition(".")[0],
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": seconds * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": arguments
+        }
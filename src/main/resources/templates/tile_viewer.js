@@ -0,0 +1,110 @@
+(function () {
+    const pyramid = window.PYRAMID;
+    const viewport = document.getElementById("tile-viewport");
+    const label = document.createElement("div");
+    label.className = "filename";
+    viewport.appendChild(label);
+
+    const tiles = new Map();
+    let scale = 1;
+    let offsetX = 0;
+    let offsetY = 0;
+    let dragStart = null;
+
+    function fit() {
+        scale = Math.min(viewport.clientWidth / pyramid.width, viewport.clientHeight / pyramid.height, 1);
+        offsetX = (viewport.clientWidth - pyramid.width * scale) / 2;
+        offsetY = 0;
+    }
+
+    function visibleRange(offset, extent, size, total) {
+        return [Math.max(0, Math.floor(-offset / size)), Math.min(total, Math.ceil((extent - offset) / size))];
+    }
+
+    function render() {
+        // Level 0 holds the full resolution; each level above halves it.
+        const level = Math.max(0, Math.min(pyramid.levels - 1, Math.floor(Math.log2(1 / scale))));
+        const levelScale = 2 ** level * scale;
+        const size = pyramid.tileSize * levelScale;
+        const [firstColumn, lastColumn] = visibleRange(
+            offsetX, viewport.clientWidth, size, Math.ceil(pyramid.width / 2 ** level / pyramid.tileSize));
+        const [firstRow, lastRow] = visibleRange(
+            offsetY, viewport.clientHeight, size, Math.ceil(pyramid.height / 2 ** level / pyramid.tileSize));
+
+        const visible = new Set();
+        for (let row = firstRow; row < lastRow; row++) {
+            for (let column = firstColumn; column < lastColumn; column++) {
+                const key = `${level}/${column}_${row}`;
+                visible.add(key);
+
+                let tile = tiles.get(key);
+                if (!tile) {
+                    tile = document.createElement("img");
+                    tile.onerror = () => { tile.style.visibility = "hidden"; };
+                    tile.src = `${pyramid.tilesDirectory}/${key}${pyramid.tileExtension}`;
+                    tile.style.transformOrigin = "0 0";
+                    viewport.insertBefore(tile, label);
+                    tiles.set(key, tile);
+                }
+                tile.style.left = `${offsetX + column * size}px`;
+                tile.style.top = `${offsetY + row * size}px`;
+                tile.style.transform = `scale(${levelScale})`;
+            }
+        }
+
+        for (const [key, tile] of tiles) {
+            if (!visible.has(key)) {
+                tile.remove();
+                tiles.delete(key);
+            }
+        }
+    }
+
+    function showFilename(event) {
+        const bounds = viewport.getBoundingClientRect();
+        const x = (event.clientX - bounds.left - offsetX) / scale;
+        const y = (event.clientY - bounds.top - offsetY) / scale;
+        const column = Math.floor(x / pyramid.cellWidth);
+        const index = Math.floor(y / pyramid.cellHeight) * pyramid.columns + column;
+        const inside = x >= 0 && y >= 0 && column < pyramid.columns && index < pyramid.files.length;
+
+        label.textContent = inside ? pyramid.files[index] : "";
+        label.style.display = inside ? "block" : "none";
+        label.style.left = `${event.clientX - bounds.left + 12}px`;
+        label.style.top = `${event.clientY - bounds.top + 12}px`;
+    }
+
+    viewport.addEventListener("wheel", (event) => {
+        event.preventDefault();
+        const bounds = viewport.getBoundingClientRect();
+        const factor = event.deltaY < 0 ? 1.25 : 0.8;
+        const pointerX = event.clientX - bounds.left;
+        const pointerY = event.clientY - bounds.top;
+        offsetX = pointerX - (pointerX - offsetX) * factor;
+        offsetY = pointerY - (pointerY - offsetY) * factor;
+        scale *= factor;
+        render();
+    }, { passive: false });
+
+    viewport.addEventListener("mousedown", (event) => {
+        dragStart = { x: event.clientX - offsetX, y: event.clientY - offsetY };
+    });
+
+    window.addEventListener("mouseup", () => { dragStart = null; });
+
+    viewport.addEventListener("mousemove", (event) => {
+        if (dragStart) {
+            offsetX = event.clientX - dragStart.x;
+            offsetY = event.clientY - dragStart.y;
+            render();
+        }
+        showFilename(event);
+    });
+
+    window.addEventListener("resize", render);
+
+    if (pyramid.levels) {
+        fit();
+        render();
+    }
+})();
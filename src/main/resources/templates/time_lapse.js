@@ -0,0 +1,70 @@
+(function () {
+    const timeLapse = window.TIME_LAPSE;
+    const container = document.getElementById("time-lapse");
+
+    const controls = document.createElement("div");
+    controls.className = "time-lapse-controls";
+    const playButton = document.createElement("button");
+    const slider = document.createElement("input");
+    slider.type = "range";
+    slider.min = 0;
+    slider.max = Math.max(0, timeLapse.frames.length - 1);
+    slider.value = slider.max;
+    const label = document.createElement("span");
+    label.className = "time-lapse-commit";
+    controls.append(playButton, slider, label);
+
+    const frame = document.createElement("img");
+    frame.width = timeLapse.width;
+    frame.height = timeLapse.height;
+    container.append(controls, frame);
+
+    let timer = null;
+
+    function show(index) {
+        const entry = timeLapse.frames[index];
+        if (!entry) {
+            return;
+        }
+        slider.value = index;
+        frame.src = entry.image;
+        const date = new Date(entry.timestamp * 1000).toISOString().slice(0, 10);
+        label.textContent = `${index + 1}/${timeLapse.frames.length} ${date} ${entry.commit.slice(0, 10)} ${entry.subject}`;
+
+        // Fetching the next frame ahead of time keeps playback from stalling on the network.
+        const next = timeLapse.frames[index + 1];
+        if (next) {
+            new Image().src = next.image;
+        }
+    }
+
+    function stop() {
+        clearInterval(timer);
+        timer = null;
+        playButton.textContent = "Play";
+    }
+
+    function play() {
+        if (Number(slider.value) >= timeLapse.frames.length - 1) {
+            show(0);
+        }
+        playButton.textContent = "Pause";
+        timer = setInterval(() => {
+            const index = Number(slider.value) + 1;
+            if (index >= timeLapse.frames.length) {
+                stop();
+                return;
+            }
+            show(index);
+        }, timeLapse.frameDuration);
+    }
+
+    playButton.addEventListener("click", () => (timer ? stop() : play()));
+    slider.addEventListener("input", () => {
+        stop();
+        show(Number(slider.value));
+    });
+
+    stop();
+    show(Number(slider.value));
+})();
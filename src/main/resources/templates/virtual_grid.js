@@ -0,0 +1,118 @@
+(function () {
+    const report = window.REPORT;
+    const viewport = document.getElementById("virtual-grid");
+    const content = viewport.firstElementChild;
+    const filter = document.getElementById("report-filter");
+    const gap = 2;
+    const overscanRows = 2;
+
+    // Entries are [path, thumbnail, width, height]; only rows inside the viewport get DOM nodes.
+    let visibleEntries = report.entries;
+    let rowOffsets = [0];
+    let columnWidth = 0;
+    const items = new Map();
+
+    function layout() {
+        columnWidth = (viewport.clientWidth - gap * (report.columns + 1)) / report.columns;
+        rowOffsets = [gap];
+        for (let start = 0; start < visibleEntries.length; start += report.columns) {
+            let rowHeight = 0;
+            for (const entry of visibleEntries.slice(start, start + report.columns)) {
+                rowHeight = Math.max(rowHeight, columnWidth * entry[3] / entry[2]);
+            }
+            rowOffsets.push(rowOffsets[rowOffsets.length - 1] + rowHeight + gap);
+        }
+        content.style.height = `${rowOffsets[rowOffsets.length - 1]}px`;
+
+        for (const item of items.values()) {
+            item.remove();
+        }
+        items.clear();
+        render();
+    }
+
+    function firstRowBelow(offset) {
+        let low = 0;
+        let high = rowOffsets.length - 1;
+        while (low < high) {
+            const middle = (low + high) >> 1;
+            if (rowOffsets[middle + 1] <= offset) {
+                low = middle + 1;
+            } else {
+                high = middle;
+            }
+        }
+        return low;
+    }
+
+    function createItem(entry, index) {
+        const [path, thumbnail] = entry;
+        const displayName = path === null ? report.unnamed : path.split(/[\\/]/).pop();
+        const item = document.createElement("div");
+        item.className = "grid-item virtual-item";
+        const image = document.createElement("img");
+        image.loading = "lazy";
+        image.decoding = "async";
+        image.src = thumbnail;
+        image.alt = path ?? report.unnamed;
+        const label = document.createElement("div");
+        label.className = "filename";
+        label.dataset.originalFilename = path ?? "";
+        label.textContent = displayName;
+        item.append(image, label);
+
+        const row = Math.floor(index / report.columns);
+        item.style.left = `${gap + (index % report.columns) * (columnWidth + gap)}px`;
+        item.style.top = `${rowOffsets[row]}px`;
+        item.style.width = `${columnWidth}px`;
+        return item;
+    }
+
+    function render() {
+        const rowCount = rowOffsets.length - 1;
+        const firstRow = Math.max(0, firstRowBelow(viewport.scrollTop) - overscanRows);
+        const lastRow = Math.min(rowCount, firstRowBelow(viewport.scrollTop + viewport.clientHeight) + 1 + overscanRows);
+        const first = firstRow * report.columns;
+        const last = Math.min(visibleEntries.length, lastRow * report.columns);
+
+        for (const [index, item] of items) {
+            if (index < first || index >= last) {
+                item.remove();
+                items.delete(index);
+            }
+        }
+        for (let index = first; index < last; index++) {
+            if (!items.has(index)) {
+                const item = createItem(visibleEntries[index], index);
+                content.appendChild(item);
+                items.set(index, item);
+            }
+        }
+    }
+
+    function schedule(callback) {
+        let pending = false;
+        return () => {
+            if (!pending) {
+                pending = true;
+                requestAnimationFrame(() => {
+                    pending = false;
+                    callback();
+                });
+            }
+        };
+    }
+
+    filter.addEventListener("input", schedule(() => {
+        const query = filter.value.trim().toLowerCase();
+        visibleEntries = query
+            ? report.entries.filter((entry) => (entry[0] ?? "").toLowerCase().includes(query))
+            : report.entries;
+        viewport.scrollTop = 0;
+        layout();
+    }));
+    viewport.addEventListener("scroll", schedule(render), { passive: true });
+    window.addEventListener("resize", schedule(layout));
+
+    layout();
+})();
@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.main.python.code_loading.directory_walker import DirectoryWalker
+from src.main.python.code_loading.gitignore_rules import GitignoreRules
+from src.main.python.code_loading.path_matcher import PathMatcher
+
+
+class TestDirectoryWalker(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def create(self, relative_path: str, content: str = ""):
+        path = self.test_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    def walk(self, walker: DirectoryWalker, patterns=("*.py",), ignore_patterns=()) -> list:
+        found = walker.walk(str(self.test_dir), PathMatcher(patterns), PathMatcher(ignore_patterns))
+        return [os.path.relpath(path, self.test_dir).replace(os.sep, "/") for path in found]
+
+    def test_walks_breadth_first_in_name_order(self):
+        for path in ["b/z.py", "b/a.py", "a/deep/x.py", "root.py", "a/y.py", "notes.txt"]:
+            self.create(path)
+
+        result = self.walk(DirectoryWalker(max_workers=4))
+
+        self.assertEqual(["root.py", "a/y.py", "b/a.py", "b/z.py", "a/deep/x.py"], result)
+
+    def test_applies_nested_gitignore_files(self):
+        self.create(".gitignore", "node_modules/\n/generated.py\n*.tmp.py\n")
+        self.create("generated.py")
+        self.create("kept.py")
+        self.create("scratch.tmp.py")
+        self.create("node_modules/package/index.py")
+        self.create("src/generated.py")
+        self.create("src/.gitignore", "# local rules\nlegacy/**\n!legacy/keep.py\n")
+        self.create("src/legacy/old.py")
+        self.create("src/other/legacy.py")
+
+        result = self.walk(DirectoryWalker())
+
+        self.assertEqual(["kept.py", "src/generated.py", "src/other/legacy.py"], result)
+
+    def test_negation_reincludes_files(self):
+        self.create(".gitignore", "*.py\n!keep.py\n")
+        self.create("drop.py")
+        self.create("keep.py")
+        self.create("sub/keep.py")
+
+        result = self.walk(DirectoryWalker())
+
+        self.assertEqual(["keep.py", "sub/keep.py"], result)
+
+    def test_directory_only_rules_skip_files(self):
+        self.create(".gitignore", "cache/\n")
+        self.create("cache.py")
+        self.create("cache/entry.py")
+        self.create("lib/cache/entry.py")
+
+        result = self.walk(DirectoryWalker(), patterns=("*.py", "cache"))
+
+        self.assertEqual(["cache.py"], result)
+
+    def test_skips_git_directory_and_ignore_patterns(self):
+        self.create(".git/hooks/hook.py")
+        self.create("build/out.py")
+        self.create("main.py")
+
+        result = self.walk(DirectoryWalker(), ignore_patterns=("build",))
+
+        self.assertEqual(["main.py"], result)
+
+    def test_gitignore_can_be_disabled(self):
+        self.create(".gitignore", "*.py\n")
+        self.create("main.py")
+
+        result = self.walk(DirectoryWalker(use_gitignore=False))
+
+        self.assertEqual(["main.py"], result)
+
+    def test_negation_reincludes_files_below_a_descendants_rule(self):
+        self.create(".gitignore", "build/**\n!build/keep.py\n")
+        self.create("build/drop.py")
+        self.create("build/keep.py")
+        self.create("build/nested/keep.py")
+
+        result = self.walk(DirectoryWalker())
+
+        self.assertEqual(["build/keep.py"], result)
+
+
+class TestGitignoreRules(unittest.TestCase):
+    def test_rules_without_match_are_undecided(self):
+        rules = GitignoreRules.parse("/repo", "*.log\n\n# comment\n\\#literal\n")
+
+        self.assertTrue(rules.match("/repo/logs/app.log", False))
+        self.assertTrue(rules.match("/repo/#literal", False))
+        self.assertIsNone(rules.match("/repo/app.py", False))
+
+    def test_later_rules_override_earlier_rules(self):
+        rules = GitignoreRules.parse("/repo", "*.log\n!important.log\n")
+
+        self.assertTrue(rules.match("/repo/debug.log", False))
+        self.assertFalse(rules.match("/repo/important.log", False))
+
+
+if __name__ == '__main__':
+    unittest.main()
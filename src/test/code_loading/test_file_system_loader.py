@@ -1,8 +1,12 @@
+import shutil
+import tempfile
 import unittest
+from types import GeneratorType
 from unittest.mock import patch, mock_open
 from pathlib import Path
 
 from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.code_loading.directory_walker import DirectoryWalker
 from src.main.python.code_loading.file_system_loader import FileSystemLoader
 
 TEST_DATA_PATH = Path("test/test_data")
@@ -62,6 +66,46 @@ class TestFileSystemLoader(unittest.TestCase):
         self.assertEqual("", code_file.content)
         self.assertEqual(str(TEST_DATA_PATH / "invalid.py"), code_file.filename)
 
+    def test_iter_code_files_loads_lazily(self):
+        test_dir = tempfile.mkdtemp()
+        (Path(test_dir) / "first.py").write_text("first")
+
+        loader = FileSystemLoader()
+        code_files = loader.iter_code_files([test_dir], ["*.py"])
+        self.assertIsInstance(code_files, GeneratorType)
+
+        (Path(test_dir) / "second.py").write_text("second")
+        self.assertEqual(["first", "second"], sorted(code_file.content for code_file in code_files))
+
+        shutil.rmtree(test_dir)
+
+    def test_load_code_files_from_single_file_path(self):
+        test_dir = tempfile.mkdtemp()
+        file_path = Path(test_dir) / "single.py"
+        file_path.write_text("single")
+
+        loader = FileSystemLoader()
+        result = loader.load_code_files([str(file_path)], ["*.py"])
+
+        self.assertEqual(["single"], [code_file.content for code_file in result])
+        self.assertEqual("single", loader.load_file(result[0].filename).content)
+
+        shutil.rmtree(test_dir)
+
+    def test_directory_walker_applies_gitignore(self):
+        test_dir = tempfile.mkdtemp()
+        (Path(test_dir) / ".gitignore").write_text("build/\n")
+        (Path(test_dir) / "build").mkdir()
+        (Path(test_dir) / "build" / "generated.py").write_text("generated")
+        (Path(test_dir) / "kept.py").write_text("kept")
+
+        loader = FileSystemLoader(DirectoryWalker())
+        result = loader.load_code_files([test_dir], ["*.py"])
+
+        self.assertEqual(["kept"], [code_file.content for code_file in result])
+
+        shutil.rmtree(test_dir)
+
 
 if __name__ == "__main__":
     unittest.main()
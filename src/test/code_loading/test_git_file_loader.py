@@ -0,0 +1,148 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.main.python.code_loading.git_file_loader import FileState, GitFileLoader
+from src.main.python.code_loading.git_repository import GitRepository
+from src.main.python.code_loading.code_file import CodeFile
+
+
+def git(repository: Path, *arguments: str) -> str:
+    environment = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com",
+        "GIT_CONFIG_GLOBAL": os.devnull, "GIT_CONFIG_NOSYSTEM": "1"
+    }
+    return subprocess.run(
+        ["git", *arguments], cwd=repository, env=environment, capture_output=True, check=True, text=True
+    ).stdout
+
+
+def create_repository(root: Path, files: dict) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    git(root, "init", "-q", "-b", "main")
+    write_files(root, files)
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", "initial")
+    return root
+
+
+def write_files(root: Path, files: dict):
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content if isinstance(content, bytes) else content.encode("utf-8"))
+
+
+class TestGitRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp()).resolve()
+        self.root = create_repository(self.test_dir / "repo", {
+            "a.py": "a = 1\n",
+            "pkg/b.py": "b = 2\n",
+            ".gitignore": "build/\n"
+        })
+        self.repository = GitRepository.discover(str(self.root / "pkg"))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_discover_finds_the_work_tree_root(self):
+        self.assertEqual(self.root, self.repository.root)
+        self.assertEqual("pkg", self.repository.relative_path(str(self.root / "pkg")))
+        self.assertEqual("", self.repository.relative_path(str(self.root)))
+
+    def test_discover_outside_a_repository(self):
+        with self.assertRaises(ValueError):
+            GitRepository.discover(str(self.test_dir))
+
+    def test_tracked_files_report_blob_ids(self):
+        tracked = self.repository.tracked_files()
+
+        self.assertEqual({".gitignore", "a.py", "pkg/b.py"}, set(tracked))
+        self.assertEqual(CodeFile("", raw_content=b"a = 1\n").content_hash(), tracked["a.py"])
+        self.assertEqual({"pkg/b.py"}, set(self.repository.tracked_files("pkg")))
+
+    def test_work_tree_changes(self):
+        write_files(self.root, {"a.py": "a = 2\n", "new.py": "n = 1\n", "build/out.py": "ignored\n"})
+        (self.root / "pkg" / "b.py").unlink()
+
+        self.assertEqual({"a.py", "pkg/b.py"}, self.repository.modified_files())
+        self.assertEqual(["new.py"], self.repository.untracked_files())
+        self.assertEqual({"pkg/b.py"}, self.repository.deleted_files())
+
+    def test_commits_are_listed_oldest_first(self):
+        git(self.root, "commit", "-q", "--allow-empty", "-m", "second: with a colon")
+
+        commits = self.repository.commits()
+
+        self.assertEqual(["initial", "second: with a colon"], [commit.subject for commit in commits])
+        self.assertEqual(self.repository.head(), commits[-1].commit)
+        self.assertLessEqual(commits[0].timestamp, commits[1].timestamp)
+
+
+class TestGitFileLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp()).resolve()
+        self.root = create_repository(self.test_dir / "repo", {
+            "main.py": "print('main')\n",
+            "src/util.py": "def util():\n    return 1\n",
+            "src/vendor/lib.py": "lib = 1\n",
+            "docs/readme.txt": "docs\n",
+            "image.py": b"\x89PNG\x00\x00binary",
+            ".gitignore": "generated/\n"
+        })
+        write_files(self.root, {"generated/out.py": "generated = 1\n", "scratch.py": "draft = 1\n"})
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def names(self, code_files) -> list:
+        return [Path(code_file.filename).relative_to(self.root).as_posix() for code_file in code_files]
+
+    def test_lists_tracked_and_untracked_files_honoring_gitignore(self):
+        code_files = GitFileLoader().load_code_files([str(self.root)], ["*.py"])
+
+        self.assertEqual(["main.py", "scratch.py", "src/util.py", "src/vendor/lib.py"], self.names(code_files))
+        self.assertEqual("print('main')\n", code_files[0].raw_content.decode())
+
+    def test_untracked_files_can_be_skipped(self):
+        code_files = GitFileLoader(include_untracked=False).load_code_files([str(self.root)], ["*.py"])
+
+        self.assertNotIn("scratch.py", self.names(code_files))
+
+    def test_source_subdirectory_and_ignore_patterns(self):
+        code_files = GitFileLoader().load_code_files([str(self.root / "src")], ["*.py"], ["vendor"])
+
+        self.assertEqual(["src/util.py"], self.names(code_files))
+
+    def test_single_file_source(self):
+        code_files = GitFileLoader().load_code_files([str(self.root / "main.py")], ["*.py"])
+
+        self.assertEqual(["main.py"], self.names(code_files))
+
+    def test_file_states_carry_blob_ids_for_unmodified_files(self):
+        write_files(self.root, {"main.py": "print('changed')\n"})
+
+        states = {
+            Path(state.filename).name: state
+            for state in GitFileLoader().iter_file_states([str(self.root)], ["*.py"])
+        }
+
+        self.assertIsNone(states["main.py"].content_hash)
+        self.assertIsNone(states["scratch.py"].content_hash)
+        util_path = self.root / "src" / "util.py"
+        self.assertEqual(
+            FileState(str(util_path), CodeFile("", raw_content=util_path.read_bytes()).content_hash()),
+            states["util.py"]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
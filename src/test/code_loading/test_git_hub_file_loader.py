@@ -0,0 +1,210 @@
+import io
+import json
+import os
+import tarfile
+import tempfile
+import threading
+import time
+import unittest
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import urlparse
+
+import requests
+
+from src.main.python.code_loading.git_hub_file_loader import GitHubFileLoader
+
+
+class StubGitHubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        path = urlparse(self.path).path
+        server.requests.append(path)
+        server.urls.append(self.path)
+
+        if server.rate_limited_requests and path.startswith("/api/"):
+            server.rate_limited_requests -= 1
+            headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}
+            if server.retry_after is not None:
+                headers["Retry-After"] = server.retry_after
+            self._respond(403, b"{}", headers)
+        elif path in server.responses:
+            self._respond(200, server.responses[path])
+        else:
+            self._respond(404, b"")
+
+    def _respond(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def build_tarball(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in files.items():
+            member = tarfile.TarInfo(f"owner-repo-0123abc/{name}")
+            member.size = len(content)
+            archive.addfile(member, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class TestGitHubFileLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubGitHubHandler)
+        self.server.requests = []
+        self.server.urls = []
+        self.server.rate_limited_requests = 0
+        self.server.retry_after = None
+        tree = [
+            {"path": "src", "type": "tree"},
+            {"path": "src/app.py", "type": "blob"},
+            {"path": "src/readme.md", "type": "blob"},
+            {"path": "src/vendor", "type": "tree"},
+            {"path": "src/vendor/lib.py", "type": "blob"},
+            {"path": "setup.py", "type": "blob"},
+        ]
+        self.server.responses = {
+            "/api/repos/owner/repo": json.dumps({"default_branch": "main"}).encode(),
+            "/api/repos/owner/repo/git/trees/main": json.dumps({"tree": tree, "truncated": False}).encode(),
+            "/raw/owner/repo/main/src/app.py": b"print('app')\n",
+            "/raw/owner/repo/main/src/vendor/lib.py": b"print('lib')\n",
+            "/raw/owner/repo/main/setup.py": b"print('setup')\n",
+        }
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.loader = GitHubFileLoader(
+            use_tree_api=True,
+            max_workers=4,
+            api_url=f"{base_url}/api",
+            raw_url=f"{base_url}/raw"
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_tree_api_lists_repository_in_one_call(self):
+        code_files = self.loader.load_code_files(["https://github.com/owner/repo"], ["*.py"], ["vendor"])
+
+        self.assertEqual(
+            [("src/app.py", "print('app')\n"), ("setup.py", "print('setup')\n")],
+            [(code_file.filename, code_file.content) for code_file in code_files]
+        )
+        api_requests = [path for path in self.server.requests if path.startswith("/api/")]
+        self.assertEqual(["/api/repos/owner/repo", "/api/repos/owner/repo/git/trees/main"], api_requests)
+
+    def test_tree_api_limits_to_sub_path(self):
+        code_files = self.loader.load_code_files(["https://github.com/owner/repo/tree/main/src"], ["*.py"])
+
+        self.assertEqual(["src/app.py", "src/vendor/lib.py"], [code_file.filename for code_file in code_files])
+        self.assertNotIn("/api/repos/owner/repo", self.server.requests)
+
+    def test_truncated_tree_falls_back_to_contents_api_at_the_same_ref(self):
+        base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.server.responses.update({
+            "/api/repos/owner/repo/git/trees/v1": json.dumps({"tree": [], "truncated": True}).encode(),
+            "/api/repos/owner/repo/contents/": json.dumps([
+                {"path": "setup.py", "name": "setup.py", "type": "file",
+                 "download_url": f"{base_url}/raw/owner/repo/v1/setup.py"}
+            ]).encode(),
+            "/raw/owner/repo/v1/setup.py": b"print('v1')\n"
+        })
+
+        code_files = self.loader.load_code_files(["https://github.com/owner/repo/tree/v1"], ["*.py"])
+
+        self.assertEqual(["print('v1')\n"], [code_file.content for code_file in code_files])
+        self.assertIn("/api/repos/owner/repo/contents/?ref=v1", self.server.urls)
+
+    def test_blob_paths_are_quoted(self):
+        self.server.responses.update({
+            "/api/repos/owner/repo/git/trees/main": json.dumps({
+                "tree": [{"path": "src/a b#1%.py", "type": "blob"}], "truncated": False
+            }).encode(),
+            "/raw/owner/repo/main/src/a%20b%231%25.py": b"quoted = True\n"
+        })
+
+        code_files = self.loader.load_code_files(["https://github.com/owner/repo/tree/main"], ["*.py"])
+
+        self.assertEqual([("src/a b#1%.py", "quoted = True\n")],
+                         [(code_file.filename, code_file.content) for code_file in code_files])
+
+    @patch("src.main.python.code_loading.git_hub_file_loader.time.sleep")
+    def test_rate_limited_requests_are_retried(self, sleep):
+        self.server.rate_limited_requests = 2
+
+        code_files = self.loader.load_code_files(["https://github.com/owner/repo/tree/main"], ["setup.py"])
+
+        self.assertEqual(["setup.py"], [code_file.filename for code_file in code_files])
+        self.assertEqual(2, sleep.call_count)
+
+    @patch("src.main.python.code_loading.git_hub_file_loader.time.sleep")
+    def test_persistent_rate_limit_raises_without_a_final_wait(self, sleep):
+        self.server.rate_limited_requests = GitHubFileLoader.MAX_RATE_LIMIT_RETRIES + 1
+
+        with self.assertRaises(requests.HTTPError):
+            self.loader.load_code_files(["https://github.com/owner/repo/tree/main"], ["setup.py"])
+
+        self.assertEqual(GitHubFileLoader.MAX_RATE_LIMIT_RETRIES - 1, sleep.call_count)
+
+    @patch("src.main.python.code_loading.git_hub_file_loader.time.sleep")
+    def test_retry_after_accepts_http_dates(self, sleep):
+        self.server.rate_limited_requests = 1
+        self.server.retry_after = formatdate(time.time() + 30, usegmt=True)
+
+        code_files = self.loader.load_code_files(["https://github.com/owner/repo/tree/main"], ["setup.py"])
+
+        self.assertEqual(["setup.py"], [code_file.filename for code_file in code_files])
+        self.assertTrue(25 <= sleep.call_args.args[0] <= 31)
+
+    @patch("src.main.python.code_loading.git_hub_file_loader.time.sleep")
+    def test_unparseable_retry_after_falls_back_to_the_reset_header(self, sleep):
+        self.server.rate_limited_requests = 1
+        self.server.retry_after = "soon"
+
+        self.loader.load_code_files(["https://github.com/owner/repo/tree/main"], ["setup.py"])
+
+        self.assertEqual(1, sleep.call_args.args[0])
+
+    def test_single_file_url_uses_raw_host(self):
+        code_file = self.loader.load_code_files(["https://github.com/owner/repo/blob/main/setup.py"], ["*.py"])[0]
+
+        self.assertEqual("print('setup')\n", code_file.content)
+
+    def test_archive_mode_streams_matching_entries(self):
+        self.server.responses["/api/repos/owner/repo/tarball/main"] = build_tarball({
+            "src/app.py": b"print('app')\n",
+            "src/vendor/lib.py": b"print('lib')\n",
+            "docs/index.md": b"# docs\n",
+        })
+        loader = GitHubFileLoader(use_archive=True, api_url=self.loader.api_url)
+
+        code_files = loader.iter_code_files(["https://github.com/owner/repo/tree/main"], ["*.py"], ["vendor"])
+
+        self.assertEqual([("src/app.py", "print('app')\n")],
+                         [(code_file.filename, code_file.content) for code_file in code_files])
+        self.assertEqual(["/api/repos/owner/repo/tarball/main"], self.server.requests)
+
+    def test_archive_mode_reads_local_archive(self):
+        archive_file = tempfile.NamedTemporaryFile(suffix=".tar.gz", delete=False)
+        archive_file.write(build_tarball({"a.py": b"a = 1\n", "sub/b.py": b"b = 2\n"}))
+        archive_file.close()
+        self.addCleanup(os.unlink, archive_file.name)
+        loader = GitHubFileLoader(use_archive=True, archive_url=archive_file.name)
+
+        code_files = loader.load_code_files(["https://github.com/owner/repo/tree/main/sub"], ["*.py"])
+
+        self.assertEqual([("sub/b.py", "b = 2\n")], [(code_file.filename, code_file.content) for code_file in code_files])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from code_loading.test_git_file_loader import create_repository, git, write_files
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.code_loading.git_object_loader import GitObjectLoader
+from src.main.python.code_loading.git_object_reader import GitObjectReader
+from src.main.python.image_composition.html_image_composer import HtmlImageComposer
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+from src.main.python.metrics.metrics_index import MetricsIndex
+from src.main.python.pipeline.streaming_pipeline import StreamingPipeline
+
+
+class TestGitObjectLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp()).resolve()
+        self.root = create_repository(self.test_dir / "repo", {
+            "main.py": "print('v1')\n",
+            "copy.py": "print('v1')\n",
+            "src/util.py": "def util():\n    return 1\n",
+            "src/vendor/lib.py": "lib = 1\n",
+            "data.py": b"\x00\x01binary",
+            "notes.txt": "notes\n"
+        })
+        self.first_revision = git(self.root, "rev-parse", "HEAD").strip()
+        write_files(self.root, {"main.py": "print('v2')\n"})
+        (self.root / "src" / "util.py").unlink()
+        git(self.root, "commit", "-q", "-am", "second")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def names(self, code_files) -> list:
+        return [Path(code_file.filename).relative_to(self.root).as_posix() for code_file in code_files]
+
+    def test_loads_an_old_revision_without_touching_the_work_tree(self):
+        with GitObjectLoader(self.first_revision) as loader:
+            code_files = loader.load_code_files([str(self.root)], ["*.py"])
+
+        self.assertEqual(["copy.py", "main.py", "src/util.py", "src/vendor/lib.py"], self.names(code_files))
+        self.assertEqual(b"print('v1')\n", code_files[1].raw_content)
+        self.assertFalse((self.root / "src" / "util.py").exists())
+        self.assertEqual("print('v2')\n", (self.root / "main.py").read_text())
+
+    def test_object_ids_are_recorded_as_content_hashes(self):
+        with GitObjectLoader() as loader:
+            code_files = loader.load_code_files([str(self.root)], ["main.py"])
+
+        self.assertEqual(CodeFile("", raw_content=b"print('v2')\n").content_hash(), code_files[0].object_id)
+        self.assertEqual(code_files[0].object_id, code_files[0].content_hash())
+
+    def test_identical_blobs_are_read_once_across_paths_and_revisions(self):
+        with GitObjectLoader(self.first_revision) as loader:
+            loader.load_code_files([str(self.root)], ["*.py"])
+            first_reads = loader.objects_read
+
+            loader.revision = "HEAD"
+            code_files = loader.load_code_files([str(self.root)], ["*.py"])
+
+            # copy.py and main.py share a blob in the first revision; the second revision adds one new blob.
+            self.assertEqual(4, first_reads)
+            self.assertEqual(first_reads + 1, loader.objects_read)
+            self.assertEqual(["copy.py", "main.py", "src/vendor/lib.py"], self.names(code_files))
+
+    def test_subdirectory_sources_and_ignore_patterns(self):
+        with GitObjectLoader(self.first_revision) as loader:
+            code_files = loader.load_code_files([str(self.root / "src")], ["*.py"], ["vendor"])
+
+        self.assertEqual(["src/util.py"], self.names(code_files))
+
+    def test_file_states_do_not_read_blobs(self):
+        with GitObjectLoader() as loader:
+            states = list(loader.iter_file_states([str(self.root)], ["*.py"]))
+
+            self.assertEqual(0, loader.objects_read)
+            self.assertEqual(4, len(states))
+            self.assertIsNone(loader.read_file(str(self.root / "data.py")))
+            self.assertEqual(b"lib = 1\n", loader.load_file(str(self.root / "src" / "vendor" / "lib.py")).raw_content)
+
+    def test_pipeline_reads_blobs_in_batches(self):
+        output_dir = self.test_dir / "html"
+        generator = CodeImageGenerator(10, 10, 1, 1)
+
+        with patch.object(GitObjectReader, "read", autospec=True, side_effect=GitObjectReader.read) as read, \
+                MetricsIndex(str(self.test_dir / MetricsIndex.INDEX_FILENAME)) as metrics_index, \
+                GitObjectLoader() as loader:
+            composer = HtmlImageComposer(str(output_dir), thumbnail_size=(10, 10), incremental=True)
+            pipeline = StreamingPipeline(loader, generator, previous_metrics=metrics_index)
+            metadata = pipeline.run([str(self.root)], ["*.py"], [], composer)
+
+        self.assertEqual(["copy.py", "main.py", "src/vendor/lib.py"],
+                         sorted(Path(entry.filename).relative_to(self.root).as_posix() for entry in metadata))
+        self.assertEqual(1, read.call_count)
+
+    def test_unknown_files_are_rejected(self):
+        with GitObjectLoader() as loader, self.assertRaises(ValueError):
+            loader.load_file(str(self.root / "missing.py"))
+
+
+class TestGitObjectReader(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp()).resolve()
+        files = {f"file_{index}.txt": f"{index}\n" * 2000 for index in range(300)}
+        self.root = create_repository(self.test_dir / "repo", files)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_large_batches_do_not_block_and_missing_objects_are_reported(self):
+        object_ids = git(self.root, "ls-tree", "--object-only", "HEAD").split()
+        missing_id = "0" * 40
+
+        with GitObjectReader(str(self.root)) as reader:
+            objects = reader.read(object_ids + [missing_id])
+            again = reader.read(object_ids[:1])
+
+        self.assertEqual(len(object_ids) + 1, len(objects))
+        self.assertEqual((missing_id, None), objects[-1])
+        self.assertEqual(len(object_ids), reader.objects_read - 1)
+        self.assertEqual(objects[0], again[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
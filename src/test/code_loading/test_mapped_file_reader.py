@@ -0,0 +1,90 @@
+import mmap
+import pickle
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.code_loading.file_system_loader import FileSystemLoader
+from src.main.python.code_loading.mapped_file_reader import MappedFileReader
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+
+
+class TestMappedFileReader(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_small_files_are_read_as_bytes(self):
+        file_path = self.test_dir / "small.py"
+        file_path.write_bytes(b"print('hi')\n")
+
+        code_file = MappedFileReader().read(file_path)
+
+        self.assertEqual(b"print('hi')\n", code_file.raw_content)
+        self.assertEqual(str(file_path), code_file.filename)
+
+    def test_large_files_are_memory_mapped(self):
+        file_path = self.test_dir / "large.py"
+        file_path.write_bytes(b"x = 1\n" * 100)
+
+        code_file = MappedFileReader(mmap_threshold=64).read(file_path)
+
+        self.assertIsInstance(code_file.raw_content, mmap.mmap)
+        restored = pickle.loads(pickle.dumps(code_file))
+        self.assertEqual(b"x = 1\n" * 100, restored.raw_content)
+        self.assertEqual(code_file.content_hash(), restored.content_hash())
+
+    def test_binary_files_are_skipped(self):
+        file_path = self.test_dir / "image.py"
+        file_path.write_bytes(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR")
+
+        self.assertIsNone(MappedFileReader().read(file_path))
+
+    def test_empty_files_are_read(self):
+        file_path = self.test_dir / "empty.py"
+        file_path.touch()
+
+        code_file = MappedFileReader(mmap_threshold=0).read(file_path)
+
+        self.assertEqual(b"", code_file.raw_content)
+
+    def test_utf8_hash_matches_decoded_content(self):
+        file_path = self.test_dir / "unicode.py"
+        file_path.write_text("s = 'über'\n", encoding="utf-8")
+
+        code_file = MappedFileReader().read(file_path)
+        decoded = FileSystemLoader()._load_file_content(file_path)
+
+        self.assertEqual(decoded.content_hash(), code_file.content_hash())
+
+    def test_latin1_file_renders_like_its_decoded_text(self):
+        file_path = self.test_dir / "latin1.py"
+        file_path.write_bytes("# Grüße\nprint('été')\n".encode("latin-1"))
+        generator = CodeImageGenerator(1, 1, 2, 2)
+
+        loader = FileSystemLoader(file_reader=MappedFileReader())
+        code_files = loader.load_code_files([str(self.test_dir)], ["*.py"])
+        decoded = CodeFile(content=file_path.read_bytes().decode("latin-1"))
+
+        self.assertEqual(1, len(code_files))
+        self.assertEqual(
+            generator.generate_image(decoded).tobytes(),
+            generator.generate_image(code_files[0]).tobytes()
+        )
+
+    def test_loader_skips_binary_files(self):
+        (self.test_dir / "data.py").write_bytes(b"\0\1\2")
+        (self.test_dir / "code.py").write_bytes(b"pass\n")
+
+        loader = FileSystemLoader(file_reader=MappedFileReader())
+        result = loader.load_code_files([str(self.test_dir)], ["*.py"])
+
+        self.assertEqual([b"pass\n"], [code_file.raw_content for code_file in result])
+
+
+if __name__ == '__main__':
+    unittest.main()
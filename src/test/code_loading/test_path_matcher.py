@@ -0,0 +1,72 @@
+import unittest
+from pathlib import Path
+
+from src.main.python.code_loading.path_matcher import PathMatcher
+
+
+class TestPathMatcher(unittest.TestCase):
+
+    def test_name_patterns_match_any_path_component(self):
+        matcher = PathMatcher(["*.py", "build"])
+
+        self.assertTrue(matcher.matches("main.py"))
+        self.assertTrue(matcher.matches("/repo/src/main.py"))
+        self.assertTrue(matcher.matches("/repo/build"))
+        self.assertFalse(matcher.matches("/repo/src/main.pyc"))
+        self.assertFalse(matcher.matches("/repo/buildings"))
+
+    def test_single_star_does_not_cross_directories(self):
+        matcher = PathMatcher(["src/*.py"])
+
+        self.assertTrue(matcher.matches("/repo/src/main.py"))
+        self.assertFalse(matcher.matches("/repo/src/nested/main.py"))
+
+    def test_double_star_matches_any_depth(self):
+        matcher = PathMatcher(["src/**/test_*.py"])
+
+        self.assertTrue(matcher.matches("/repo/src/test_a.py"))
+        self.assertTrue(matcher.matches("/repo/src/a/b/c/test_a.py"))
+        self.assertFalse(matcher.matches("/repo/lib/a/test_a.py"))
+
+    def test_trailing_double_star_matches_the_directory_itself(self):
+        matcher = PathMatcher(["**/node_modules/**"])
+
+        self.assertTrue(matcher.matches("/repo/web/node_modules"))
+        self.assertTrue(matcher.matches("/repo/web/node_modules/pkg/index.js"))
+        self.assertFalse(matcher.matches("/repo/web/node_modules_backup/index.js"))
+
+    def test_leading_slash_anchors_at_path_start(self):
+        matcher = PathMatcher(["/repo/generated/**"])
+
+        self.assertTrue(matcher.matches("/repo/generated/a.py"))
+        self.assertFalse(matcher.matches("/other/repo/generated/a.py"))
+
+    def test_character_classes_and_question_mark(self):
+        matcher = PathMatcher(["file_[0-9].?s", "[!a]bc"])
+
+        self.assertTrue(matcher.matches("dir/file_3.js"))
+        self.assertFalse(matcher.matches("dir/file_x.js"))
+        self.assertTrue(matcher.matches("xbc"))
+        self.assertFalse(matcher.matches("abc"))
+
+    def test_accepts_paths_and_trailing_separators(self):
+        matcher = PathMatcher(["venv"])
+
+        self.assertTrue(matcher.matches(Path("/repo/venv")))
+        self.assertTrue(matcher.matches("/repo/venv/"))
+
+    def test_empty_matcher_matches_nothing(self):
+        matcher = PathMatcher([])
+
+        self.assertFalse(matcher)
+        self.assertFalse(matcher.matches("anything"))
+
+    def test_of_reuses_compiled_matchers(self):
+        matcher = PathMatcher.of(["*.py"])
+
+        self.assertIs(matcher, PathMatcher.of(["*.py"]))
+        self.assertIs(matcher, PathMatcher.of(matcher))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+from code_loading.test_git_file_loader import create_repository, git, write_files
+from src.main.python.code_loading.git_object_loader import GitObjectLoader
+from src.main.python.history.history_time_lapse import HistoryTimeLapse
+from src.main.python.image_composition.image_writer import ImageWriter
+from src.main.python.image_composition.time_lapse_composer import TimeLapseComposer
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+from src.main.python.image_generation.parallel_image_renderer import ParallelImageRenderer
+
+
+class TestHistoryTimeLapse(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp()).resolve()
+        self.root = create_repository(self.test_dir / "repo", {"a.py": "a = 1\n", "b.py": "if b:\n\tb = 2\n"})
+        for message, files in (("change a", {"a.py": "a = 1\na = 2\n"}), ("add c", {"c.py": "c = 3\n"})):
+            write_files(self.root, files)
+            git(self.root, "add", "-A")
+            git(self.root, "commit", "-q", "-m", message)
+        git(self.root, "rm", "-q", "b.py")
+        git(self.root, "commit", "-q", "-m", "remove b")
+
+        self.loader = GitObjectLoader()
+        renderer = ParallelImageRenderer(CodeImageGenerator(4, 4, 1, 1), workers=1)
+        self.time_lapse = HistoryTimeLapse(self.loader, renderer, TimeLapseComposer(2, (8, 8)))
+
+    def tearDown(self):
+        self.loader.close()
+        shutil.rmtree(self.test_dir)
+
+    def collect_frames(self):
+        return self.time_lapse.collect_frames([str(self.root)], ["*.py"])
+
+    def test_frames_follow_the_first_parent_history(self):
+        frames = self.collect_frames()
+
+        self.assertEqual(["initial", "change a", "add c", "remove b"], [frame.commit.subject for frame in frames])
+        self.assertEqual([2, 2, 3, 2], [len(frame.files) for frame in frames])
+        self.assertEqual(frames[0].files[str(self.root / "b.py")], frames[2].files[str(self.root / "b.py")])
+
+    def test_each_distinct_blob_is_rendered_once(self):
+        frames = self.collect_frames()
+
+        images = list(self.time_lapse.compose(frames))
+
+        self.assertEqual(4, len(images))
+        self.assertEqual(4, self.time_lapse.rendered_blobs)
+        self.assertEqual(4, self.loader.objects_read)
+        self.assertEqual(2 + 1 + 1 + 0, self.time_lapse.composer.cells_painted)
+
+    def test_frames_built_elsewhere_can_be_composed(self):
+        frames = self.collect_frames()
+        renderer = ParallelImageRenderer(CodeImageGenerator(4, 4, 1, 1), workers=1)
+        with GitObjectLoader() as loader:
+            time_lapse = HistoryTimeLapse(loader, renderer, TimeLapseComposer(2, (8, 8)))
+
+            images = list(time_lapse.compose(frames))
+
+        self.assertEqual(4, len(images))
+        self.assertEqual(4, time_lapse.rendered_blobs)
+
+    def test_step_and_frame_limit_keep_the_last_commit(self):
+        commits = list(range(10))
+
+        self.time_lapse.step = 4
+        self.assertEqual([0, 4, 8, 9], self.time_lapse.select_commits(commits))
+        self.time_lapse.step, self.time_lapse.max_frames = 1, 3
+        self.assertEqual([0, 5, 9], self.time_lapse.select_commits(commits))
+
+    def test_frame_limit_is_an_upper_bound(self):
+        for commit_count in range(1, 40):
+            for max_frames in range(1, 12):
+                self.time_lapse.max_frames = max_frames
+                selected = self.time_lapse.select_commits(list(range(commit_count)))
+
+                self.assertLessEqual(len(selected), max_frames)
+                self.assertEqual(commit_count - 1, selected[-1])
+
+    def test_invalid_step(self):
+        with self.assertRaises(ValueError):
+            HistoryTimeLapse(self.loader, self.time_lapse.renderer, step=0)
+        with self.assertRaises(ValueError):
+            HistoryTimeLapse(self.loader, self.time_lapse.renderer, max_frames=0)
+
+    def test_save_animation(self):
+        output_path = self.test_dir / "history.gif"
+
+        self.time_lapse.save_animation(self.collect_frames(), str(output_path), frame_duration=50)
+
+        with Image.open(output_path) as animation:
+            self.assertEqual(4, animation.n_frames)
+            self.assertEqual(self.time_lapse.composer.canvas_size(), animation.size)
+
+    def test_unsupported_animation_format(self):
+        with self.assertRaises(ValueError):
+            self.time_lapse.save_animation([], str(self.test_dir / "history.png"))
+
+    def test_save_html(self):
+        output_dir = self.test_dir / "html"
+
+        self.time_lapse.save_html(self.collect_frames(), str(output_dir), ImageWriter(palette=True))
+
+        script = (output_dir / HistoryTimeLapse.DATA_SCRIPT_FILENAME).read_text()
+        data = json.loads(script[script.index("{"):script.rindex("}") + 1])
+        self.assertEqual(4, len(data["frames"]))
+        self.assertEqual("remove b", data["frames"][-1]["subject"])
+        self.assertTrue(all((output_dir / frame["image"]).is_file() for frame in data["frames"]))
+        self.assertIn(HistoryTimeLapse.VIEWER_SCRIPT_FILENAME, (output_dir / "index.html").read_text())
+        self.assertTrue((output_dir / HistoryTimeLapse.VIEWER_SCRIPT_FILENAME).is_file())
+
+
+if __name__ == '__main__':
+    unittest.main()
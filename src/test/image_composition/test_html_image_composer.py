@@ -1,9 +1,18 @@
+import json
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, mock_open
 from pathlib import Path
 
+from PIL import Image
+
 from src.main.python.code_loading.code_file import CodeFile
 from src.main.python.code_loading.file_system_loader import FileSystemLoader
+from src.main.python.image_composition.html_image_composer import HtmlImageComposer
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+from src.main.python.image_composition.image_writer import ImageWriter
+from src.main.python.image_composition.layout_packer import SkylinePacker
 
 TEST_DATA_PATH = Path("test/test_data")
 
@@ -63,5 +72,159 @@ class TestFileSystemLoader(unittest.TestCase):
         self.assertEqual(code_file.filename, str(TEST_DATA_PATH / "invalid.py"))
 
 
+class TestHtmlImageComposer(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.image = Image.new("RGB", (40, 80), (30, 31, 34))
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def _compose(self, code_files, incremental=True):
+        composer = HtmlImageComposer(self.output_dir, columns=2, thumbnail_size=(10, 20), incremental=incremental)
+        for code_file in code_files:
+            composer.add_image(self.image.copy(), code_file)
+        composer.generate_html()
+        return composer
+
+    def test_same_named_files_get_distinct_thumbnails(self):
+        composer = self._compose([CodeFile("a", "one/util.py"), CodeFile("b", "two/util.py")], incremental=False)
+
+        self.assertEqual(["util.png", "util_1.png"], [path.name for path, _ in composer.image_paths])
+
+    def test_incremental_run_only_rewrites_changed_thumbnails(self):
+        self._compose([CodeFile("a", "a.py"), CodeFile("b", "b.py"), CodeFile("c", "c.py")])
+        images_dir = Path(self.output_dir) / HtmlImageComposer.IMAGES_DIRECTORY_NAME
+        (images_dir / "a.png").write_bytes(b"untouched")
+
+        with patch.object(Image.Image, "save", autospec=True, side_effect=Image.Image.save) as save:
+            self._compose([CodeFile("a", "a.py"), CodeFile("changed", "b.py"), CodeFile("d", "d.py")])
+
+        self.assertEqual(["b.png", "d.png"], sorted(Path(call.args[1]).name for call in save.call_args_list))
+        self.assertEqual(b"untouched", (images_dir / "a.png").read_bytes())
+        self.assertEqual(["a.png", "b.png", "d.png"], sorted(path.name for path in images_dir.iterdir()))
+
+        manifest = json.loads((Path(self.output_dir) / HtmlImageComposer.MANIFEST_FILENAME).read_text())
+        self.assertEqual(["a.py", "b.py", "d.py"], [entry["source"] for entry in manifest["entries"]])
+        self.assertEqual(CodeFile("changed").content_hash(), manifest["entries"][1]["content_hash"])
+        self.assertEqual((11, 21), (manifest["entries"][1]["width"], manifest["entries"][1]["height"]))
+
+    def test_changed_thumbnail_size_invalidates_previous_thumbnails(self):
+        first = HtmlImageComposer(self.output_dir, thumbnail_size=(50, 100), incremental=True)
+        first.add_image(self.image.copy(), CodeFile("a", "a.py"))
+        first.generate_html()
+
+        second = HtmlImageComposer(self.output_dir, thumbnail_size=(10, 20), incremental=True)
+        self.assertFalse(second.has_current_thumbnail("a.py", CodeFile("a").content_hash()))
+        second.add_image(self.image.copy(), CodeFile("a", "a.py"))
+        second.generate_html()
+
+        manifest = json.loads((Path(self.output_dir) / HtmlImageComposer.MANIFEST_FILENAME).read_text())
+        self.assertEqual((11, 21), (manifest["entries"][0]["width"], manifest["entries"][0]["height"]))
+        with Image.open(Path(self.output_dir) / manifest["entries"][0]["thumbnail"]) as thumbnail:
+            self.assertEqual((11, 21), thumbnail.size)
+
+    def test_changed_render_parameters_invalidate_previous_thumbnails(self):
+        first = HtmlImageComposer(self.output_dir, incremental=True, render_parameters=(3, 5))
+        first.add_image(self.image.copy(), CodeFile("a", "a.py"))
+        first.generate_html()
+
+        second = HtmlImageComposer(self.output_dir, incremental=True, render_parameters=(2, 4))
+
+        self.assertFalse(second.has_current_thumbnail("a.py", CodeFile("a").content_hash()))
+
+    def test_unchanged_html_is_not_rewritten(self):
+        self._compose([CodeFile("a", "a.py")])
+        html_path = Path(self.output_dir) / HtmlImageComposer.OUTPUT_HTML_FILENAME
+
+        with patch.object(Path, "write_text", autospec=True, side_effect=Path.write_text) as write_text:
+            self._compose([CodeFile("a", "a.py")])
+
+        self.assertNotIn(html_path, [call.args[0] for call in write_text.call_args_list])
+
+    def test_packed_layout_positions_items(self):
+        composer = HtmlImageComposer(self.output_dir, columns=2, thumbnail_size=(10, 20), packer=SkylinePacker(22))
+        for code_file, size in [(CodeFile("a", "a.py"), (10, 20)), (CodeFile("b", "b.py"), (10, 5))]:
+            composer.add_thumbnail(Image.new("RGB", size), code_file)
+        composer.generate_html()
+
+        html = (Path(self.output_dir) / HtmlImageComposer.OUTPUT_HTML_FILENAME).read_text()
+        self.assertIn('<div class="packed-layout" style="width: 22px; height: 21px;">', html)
+        self.assertIn('class="grid-item packed-item" style="left: 11px; top: 0px; width: 11px; height: 6px;"', html)
+
+    def read_report(self) -> dict:
+        script = (Path(self.output_dir) / HtmlImageComposer.REPORT_SCRIPT_FILENAME).read_text()
+        return json.loads(script[script.index("{"):script.rindex("}") + 1])
+
+    def test_virtual_report_streams_compact_entries(self):
+        composer = HtmlImageComposer(self.output_dir, columns=3, thumbnail_size=(10, 20), virtual=True)
+        for code_file in [CodeFile("a", "src/a.py"), CodeFile("b", "src/b.py")]:
+            composer.add_image(self.image.copy(), code_file)
+
+        self.assertFalse((Path(self.output_dir) / HtmlImageComposer.REPORT_SCRIPT_FILENAME).exists())
+        composer.generate_html()
+
+        report = self.read_report()
+        self.assertEqual(3, report["columns"])
+        self.assertEqual([["src/a.py", "images/a.png", 11, 21], ["src/b.py", "images/b.png", 11, 21]],
+                         report["entries"])
+        html = (Path(self.output_dir) / HtmlImageComposer.OUTPUT_HTML_FILENAME).read_text()
+        self.assertIn(HtmlImageComposer.VIRTUAL_GRID_SCRIPT_FILENAME, html)
+        self.assertNotIn("<img", html)
+        self.assertTrue((Path(self.output_dir) / HtmlImageComposer.VIRTUAL_GRID_SCRIPT_FILENAME).is_file())
+
+    def test_virtual_report_labels_unnamed_files(self):
+        composer = HtmlImageComposer(self.output_dir, thumbnail_size=(10, 20), virtual=True)
+        composer.add_image(self.image.copy(), CodeFile("a"))
+        composer.generate_html()
+
+        report = self.read_report()
+        self.assertEqual(HtmlImageComposer.UNNAMED_FILE_DISPLAY_NAME, report["unnamed"])
+        self.assertIsNone(report["entries"][0][0])
+
+    def test_empty_virtual_report(self):
+        HtmlImageComposer(self.output_dir, virtual=True).generate_html()
+
+        self.assertEqual([], self.read_report()["entries"])
+
+    def test_virtual_report_rejects_packers(self):
+        with self.assertRaises(ValueError):
+            HtmlImageComposer(self.output_dir, packer=SkylinePacker(22), virtual=True)
+
+    def test_generate_html_shuts_down_the_writer_threads(self):
+        composer = HtmlImageComposer(self.output_dir, thumbnail_size=(10, 20))
+        composer.add_image(self.image.copy(), CodeFile("a", "a.py"))
+        self.assertIsNotNone(composer.writer._executor)
+
+        composer.generate_html()
+
+        self.assertIsNone(composer.writer._executor)
+        self.assertTrue((Path(self.output_dir) / HtmlImageComposer.IMAGES_DIRECTORY_NAME / "a.png").is_file())
+
+    def test_writer_format_sets_thumbnail_extension(self):
+        composer = HtmlImageComposer(self.output_dir, thumbnail_size=(10, 20), writer=ImageWriter("webp"))
+        composer.add_image(self.image.copy(), CodeFile("a", "a.py"))
+        composer.generate_html()
+
+        thumbnail_path, _ = composer.image_paths[0]
+        self.assertEqual("a.webp", thumbnail_path.name)
+        with Image.open(thumbnail_path) as thumbnail:
+            self.assertEqual("WEBP", thumbnail.format)
+
+    def test_palette_images_stay_in_palette_mode(self):
+        generator = CodeImageGenerator(40, 80, 2, 2, image_mode="P")
+        composer = HtmlImageComposer(self.output_dir, thumbnail_size=(10, 20))
+        composer.add_image(generator.generate_image(CodeFile("x = 1\n")), CodeFile("x = 1\n", "x.py"))
+        composer.generate_html()
+
+        thumbnail_path, _ = composer.image_paths[0]
+        with Image.open(thumbnail_path) as thumbnail:
+            self.assertEqual("P", thumbnail.mode)
+            self.assertEqual((11, 21), thumbnail.size)
+            self.assertEqual(HtmlImageComposer.BORDER_COLOR, thumbnail.convert("RGB").getpixel((0, 0)))
+            self.assertEqual(generator.background_color, thumbnail.convert("RGB").getpixel((10, 20)))
+
+
 if __name__ == "__main__":
     unittest.main()
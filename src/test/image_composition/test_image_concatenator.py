@@ -4,6 +4,7 @@ import hashlib
 from PIL import Image
 
 from src.main.python.image_composition.image_concatenator import ImageConcatenator
+from src.main.python.image_composition.layout_packer import ShelfPacker
 
 
 class TestImageConcatenator(unittest.TestCase):
@@ -72,6 +73,21 @@ class TestImageConcatenator(unittest.TestCase):
         self.assertLessEqual(resized_img.height, 12)
         self.assertEqual(resized_img.size, (12, 12))
 
+    def test_packed_layout_uses_real_sizes(self):
+        concatenator = ImageConcatenator(packer=ShelfPacker(30))
+        for size, color in [((10, 40), (255, 0, 0)), ((20, 10), (0, 255, 0)), ((8, 8), (0, 0, 255))]:
+            concatenator.add_thumbnail(Image.new('RGB', size, color))
+
+        layout = concatenator.layout()
+        result = concatenator.concatenate()
+
+        self.assertEqual((layout.width, layout.height), result.size)
+        self.assertEqual((22, 54), result.size)
+        for placement in layout.placements:
+            center = (placement.x + placement.width // 2, placement.y + placement.height // 2)
+            source = concatenator.images[placement.index]
+            self.assertEqual(source.getpixel((placement.width // 2, placement.height // 2)), result.getpixel(center))
+
 
 if __name__ == '__main__':
     unittest.main()
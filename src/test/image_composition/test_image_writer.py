@@ -0,0 +1,94 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image
+
+from src.main.python.image_composition.image_writer import ImageWriter
+
+
+class TestImageWriter(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = Path(tempfile.mkdtemp())
+        self.image = Image.new("RGB", (20, 30), (30, 31, 34))
+        self.image.paste((188, 190, 196), (2, 2, 12, 4))
+        self.image.paste((0, 0, 0), (0, 0, 20, 1))
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_palette_png_is_lossless_for_few_colors(self):
+        writer = ImageWriter(palette=True, workers=2)
+        path = self.output_dir / "image.png"
+
+        writer.write(self.image, path)
+        writer.close()
+
+        with Image.open(path) as written:
+            self.assertEqual("P", written.mode)
+            self.assertEqual(self.image.tobytes(), written.convert("RGB").tobytes())
+
+    def test_palette_conversion_quantizes_gradients(self):
+        ramp = np.linspace(0, 1, 600)[np.newaxis, :, np.newaxis]
+        pixels = np.rint(np.array([30, 31, 34]) + ramp * np.array([158, 159, 162])).astype(np.uint8)
+        gradient = Image.fromarray(np.repeat(pixels, 4, axis=0))
+
+        converted = ImageWriter(palette=True).to_palette(gradient)
+
+        self.assertEqual("P", converted.mode)
+        difference = np.abs(np.asarray(converted.convert("RGB"), dtype=np.int16) - np.asarray(gradient, dtype=np.int16))
+        self.assertLessEqual(difference.max(), 2)
+
+    def test_webp_output(self):
+        writer = ImageWriter("webp")
+        path = self.output_dir / f"image{writer.file_extension}"
+
+        writer.write(self.image, path)
+        writer.close()
+
+        self.assertEqual(".webp", writer.file_extension)
+        with Image.open(path) as written:
+            self.assertEqual("WEBP", written.format)
+            self.assertEqual(self.image.tobytes(), written.convert("RGB").tobytes())
+
+    def test_pending_writes_are_bounded(self):
+        release = threading.Event()
+        started = []
+
+        def blocking_save(writer, image, path):
+            started.append(path)
+            release.wait()
+
+        writer = ImageWriter(workers=1, max_pending=2)
+        with patch.object(ImageWriter, "save", autospec=True, side_effect=blocking_save):
+            writer.write(self.image, "first")
+            writer.write(self.image, "second")
+            third = threading.Thread(target=writer.write, args=(self.image, "third"))
+            third.start()
+            third.join(0.2)
+            self.assertTrue(third.is_alive())
+
+            release.set()
+            third.join()
+            writer.close()
+
+        self.assertEqual(["first", "second", "third"], started)
+
+    def test_write_errors_surface_on_flush(self):
+        writer = ImageWriter()
+        writer.write(self.image, self.output_dir / "missing" / "image.png")
+
+        with self.assertRaises(OSError):
+            writer.flush()
+
+    def test_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            ImageWriter("gif")
+
+
+if __name__ == '__main__':
+    unittest.main()
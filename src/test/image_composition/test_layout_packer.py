@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from src.main.python.image_composition.layout_packer import PackedLayout, ShelfPacker, SkylinePacker
+
+
+class TestLayoutPacker(unittest.TestCase):
+    PACKERS = (ShelfPacker, SkylinePacker)
+
+    def setUp(self):
+        generator = random.Random(3)
+        self.sizes = [(generator.randint(5, 40), generator.randint(5, 120)) for _ in range(200)]
+
+    def assert_valid_layout(self, layout: PackedLayout, sizes, width: int):
+        self.assertEqual(list(range(len(sizes))), [placement.index for placement in layout.placements])
+        occupied = set()
+        for placement in layout.placements:
+            self.assertEqual(sizes[placement.index], (placement.width, placement.height))
+            self.assertLessEqual(placement.x + placement.width, width)
+            cells = {
+                (x, y)
+                for x in range(placement.x, placement.x + placement.width)
+                for y in range(placement.y, placement.y + placement.height)
+            }
+            self.assertFalse(occupied & cells, f"placement {placement.index} overlaps another item")
+            occupied |= cells
+
+    def test_placements_do_not_overlap(self):
+        for packer_class in self.PACKERS:
+            with self.subTest(packer=packer_class.__name__):
+                layout = packer_class(160).pack(self.sizes)
+
+                self.assert_valid_layout(layout, self.sizes, 160)
+                self.assertLessEqual(layout.width, 160)
+
+    def test_packing_fills_more_than_a_fixed_grid(self):
+        cell_width = max(width for width, _ in self.sizes)
+        cell_height = max(height for _, height in self.sizes)
+        grid_fill = sum(width * height for width, height in self.sizes) / (
+            len(self.sizes) * cell_width * cell_height
+        )
+
+        for packer_class in self.PACKERS:
+            with self.subTest(packer=packer_class.__name__):
+                self.assertGreater(packer_class(4 * cell_width).pack(self.sizes).fill_ratio, 2 * grid_fill)
+
+    def test_equal_sizes_form_a_grid(self):
+        for packer_class in self.PACKERS:
+            with self.subTest(packer=packer_class.__name__):
+                layout = packer_class(30).pack([(10, 20)] * 5)
+
+                self.assertEqual((30, 40), (layout.width, layout.height))
+                self.assertEqual(1.0 * 5 / 6, layout.fill_ratio)
+
+    def test_empty_layout(self):
+        layout = ShelfPacker(10).pack([])
+
+        self.assertEqual(([], 0, 0, 0.0), (layout.placements, layout.width, layout.height, layout.fill_ratio))
+
+    def test_rejects_items_wider_than_canvas(self):
+        with self.assertRaises(ValueError):
+            SkylinePacker(10).pack([(11, 1)])
+
+    def test_rejects_non_positive_width(self):
+        with self.assertRaises(ValueError):
+            ShelfPacker(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import io
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from src.main.python.image_composition.png_stream_writer import PngStreamWriter
+
+
+class TestPngStreamWriter(unittest.TestCase):
+
+    def test_rows_written_in_batches_form_one_image(self):
+        pixels = np.random.default_rng(7).integers(0, 256, size=(150, 40, 3), dtype=np.uint8)
+        output = io.BytesIO()
+
+        writer = PngStreamWriter(output, width=40)
+        for start in range(0, 150, 32):
+            writer.write_rows(pixels[start:start + 32])
+        size = writer.close()
+
+        self.assertEqual((40, 150), size)
+        with Image.open(io.BytesIO(output.getvalue())) as image:
+            self.assertEqual("RGB", image.mode)
+            np.testing.assert_array_equal(pixels, np.asarray(image))
+
+    def test_palette_mode(self):
+        output = io.BytesIO()
+        writer = PngStreamWriter(output, width=3, mode="P", palette=bytes([0, 0, 0, 255, 255, 255]))
+        writer.write_rows(np.array([[0, 1, 0]], dtype=np.uint8))
+        writer.close()
+
+        with Image.open(io.BytesIO(output.getvalue())) as image:
+            self.assertEqual("P", image.mode)
+            self.assertEqual([(0, 0, 0), (255, 255, 255), (0, 0, 0)], list(image.convert("RGB").getdata()))
+
+    def test_rejects_rows_of_wrong_width(self):
+        writer = PngStreamWriter(io.BytesIO(), width=4, mode="L")
+
+        with self.assertRaises(ValueError):
+            writer.write_rows(np.zeros((1, 5), dtype=np.uint8))
+
+    def test_rejects_palette_mode_without_palette(self):
+        with self.assertRaises(ValueError):
+            PngStreamWriter(io.BytesIO(), width=4, mode="P")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+from PIL import Image
+
+from src.main.python.image_composition.image_concatenator import ImageConcatenator
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_composition.streaming_image_concatenator import StreamingImageConcatenator
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+
+
+class TestStreamingImageConcatenator(unittest.TestCase):
+    TEST_DATA_DIR = "resources/concatenator"
+    REFERENCE_HASHES = {
+        'empty': '693e9af84d3dfcc71e640e005bdc5e2e',
+        'single': '8a98d1fb40ab76530092636750085ea4',
+        'grid_2x2': 'ed6bd0d60ff692c489113f9351bf37e9'
+    }
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.output_path = os.path.join(self.output_dir, "overview.png")
+        self.test_images = [Image.open(f"{self.TEST_DATA_DIR}/test_{index}.png") for index in range(4)]
+
+    def tearDown(self):
+        for test_image in self.test_images:
+            test_image.close()
+        shutil.rmtree(self.output_dir)
+
+    def _read_output_hash(self) -> str:
+        with Image.open(self.output_path) as result:
+            return hashlib.md5(result.convert("RGB").tobytes()).hexdigest()
+
+    def test_empty_concatenation(self):
+        StreamingImageConcatenator(self.output_path).close()
+
+        self.assertEqual(self.REFERENCE_HASHES['empty'], self._read_output_hash())
+
+    def test_single_image(self):
+        with StreamingImageConcatenator(self.output_path, columns=1, max_thumbnail_size=(10, 10)) as concatenator:
+            concatenator.add_image(self.test_images[0])
+
+        self.assertEqual(self.REFERENCE_HASHES['single'], self._read_output_hash())
+
+    def test_grid_layout(self):
+        with StreamingImageConcatenator(self.output_path, columns=2, max_thumbnail_size=(10, 10)) as concatenator:
+            for image in self.test_images:
+                concatenator.add_image(image)
+
+        self.assertEqual(self.REFERENCE_HASHES['grid_2x2'], self._read_output_hash())
+
+    def test_partial_last_row_matches_in_memory_concatenation(self):
+        reference = ImageConcatenator(columns=3, max_thumbnail_size=(10, 10))
+        concatenator = StreamingImageConcatenator(self.output_path, columns=3, max_thumbnail_size=(10, 10))
+        for image in self.test_images + self.test_images[:1]:
+            reference.add_image(image.copy())
+            concatenator.add_image(image.copy())
+
+        size = concatenator.close()
+
+        expected = reference.concatenate()
+        self.assertEqual(expected.size, size)
+        self.assertEqual(hashlib.md5(expected.tobytes()).hexdigest(), self._read_output_hash())
+
+    def test_only_one_row_is_buffered(self):
+        concatenator = StreamingImageConcatenator(self.output_path, columns=2, max_thumbnail_size=(10, 10))
+        for image in self.test_images:
+            concatenator.add_image(image.copy())
+
+        self.assertEqual((concatenator.cell_size[1], 2 * concatenator.cell_size[0], 3), concatenator._row.shape)
+        concatenator.close()
+        self.assertIsNone(concatenator.close())
+
+    def test_palette_thumbnails_are_written_as_a_palette_png(self):
+        generator = CodeImageGenerator(8, 8, 1, 1, image_mode="P")
+        thumbnails = [
+            generator.generate_thumbnail(CodeFile("if x:\n\ty = 1\n" * count), (10, 10)) for count in range(1, 4)
+        ]
+        rgb_path = os.path.join(self.output_dir, "rgb.png")
+        with StreamingImageConcatenator(rgb_path, columns=2, max_thumbnail_size=(10, 10)) as concatenator:
+            for thumbnail in thumbnails:
+                concatenator.add_thumbnail(thumbnail.convert("RGB"))
+
+        concatenator = StreamingImageConcatenator(self.output_path, columns=2, max_thumbnail_size=(10, 10))
+        for thumbnail in thumbnails:
+            concatenator.add_thumbnail(thumbnail)
+        self.assertEqual((concatenator.cell_size[1], 2 * concatenator.cell_size[0]), concatenator._row.shape)
+        concatenator.close()
+
+        with Image.open(self.output_path) as result, Image.open(rgb_path) as expected:
+            self.assertEqual("P", result.mode)
+            self.assertEqual(expected.convert("RGB").tobytes(), result.convert("RGB").tobytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_composition.tile_pyramid_composer import PyramidLevel, TilePyramidComposer
+
+
+class TestTilePyramidComposer(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def compose(self, image_count: int, columns: int = 3, tile_size: int = 16) -> TilePyramidComposer:
+        composer = TilePyramidComposer(str(self.output_dir), columns=columns, thumbnail_size=(9, 13),
+                                       tile_size=tile_size, workers=2)
+        for index in range(image_count):
+            thumbnail = Image.new("RGB", (9, 13), (10 + index, 20, 30))
+            composer.add_thumbnail(thumbnail, CodeFile(content="", filename=f"src/file_{index}.py"))
+        composer.generate_html()
+        return composer
+
+    def read_pyramid(self) -> dict:
+        script = (self.output_dir / TilePyramidComposer.PYRAMID_SCRIPT_FILENAME).read_text()
+        return json.loads(script[script.index("{"):script.rindex("}") + 1])
+
+    def assemble_level(self, level: int, width: int, height: int, tile_size: int) -> np.ndarray:
+        canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        for tile_path in (self.output_dir / "tiles" / str(level)).glob("*.png"):
+            column, row = map(int, tile_path.stem.split("_"))
+            with Image.open(tile_path) as tile:
+                pixels = np.asarray(tile)
+            canvas[row * tile_size:row * tile_size + pixels.shape[0],
+                   column * tile_size:column * tile_size + pixels.shape[1]] = pixels
+        return canvas
+
+    def test_full_resolution_level_matches_grid_layout(self):
+        self.compose(7)
+
+        pyramid = self.read_pyramid()
+        self.assertEqual((30, 42), (pyramid["width"], pyramid["height"]))
+
+        expected = np.zeros((42, 30, 3), dtype=np.uint8)
+        for index in range(7):
+            left = (index % 3) * 10 + 1
+            top = (index // 3) * 14 + 1
+            expected[top:top + 13, left:left + 9] = (10 + index, 20, 30)
+
+        np.testing.assert_array_equal(expected, self.assemble_level(0, 30, 42, 16))
+
+    def test_each_level_halves_the_previous_one(self):
+        self.compose(7)
+
+        pyramid = self.read_pyramid()
+        full_resolution = self.assemble_level(0, 30, 42, 16)
+        np.testing.assert_array_equal(
+            PyramidLevel.downsample(full_resolution),
+            self.assemble_level(1, 15, 21, 16)
+        )
+        self.assertEqual(3, pyramid["levels"])
+        self.assertEqual(["0_0.png"], [path.name for path in (self.output_dir / "tiles" / "2").iterdir()])
+
+    def test_empty_tiles_are_not_written(self):
+        self.compose(1, columns=4)
+
+        full_resolution_tiles = sorted(path.name for path in (self.output_dir / "tiles" / "0").iterdir())
+        self.assertEqual(40, self.read_pyramid()["width"])
+        self.assertEqual(["0_0.png"], full_resolution_tiles)
+
+    def test_viewer_page_is_built_on_base_template(self):
+        self.compose(2)
+
+        html = (self.output_dir / TilePyramidComposer.OUTPUT_HTML_FILENAME).read_text()
+        self.assertIn('id="tile-viewport"', html)
+        self.assertIn('<script src="tile_viewer.js"></script>', html)
+        self.assertNotIn("{{", html)
+        self.assertTrue((self.output_dir / TilePyramidComposer.VIEWER_SCRIPT_FILENAME).is_file())
+        self.assertEqual(["file_0.py", "file_1.py"], self.read_pyramid()["files"])
+
+    def test_empty_pyramid(self):
+        self.compose(0)
+
+        self.assertEqual(0, self.read_pyramid()["levels"])
+        self.assertEqual([], list((self.output_dir / "tiles").iterdir()))
+
+    def test_rejects_odd_tile_size(self):
+        with self.assertRaises(ValueError):
+            TilePyramidComposer(str(self.output_dir), tile_size=255)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from PIL import Image
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_composition.time_lapse_composer import TimeLapseComposer
+from src.main.python.image_generation.ink_palette import InkPalette
+
+
+class TestTimeLapseComposer(unittest.TestCase):
+    def setUp(self):
+        self.composer = TimeLapseComposer(columns=2, max_thumbnail_size=(4, 6))
+        for object_id, color in (("a1", (255, 0, 0)), ("a2", (0, 255, 0)), ("b1", (0, 0, 255))):
+            self.composer.add_thumbnail(Image.new("RGB", (4, 6), color), CodeFile(content="", object_id=object_id))
+
+    def test_slots_follow_first_appearance(self):
+        self.composer.assign_slots([{"b.py": "b1"}, {"a.py": "a1", "b.py": "b1"}, {"c.py": "a1"}])
+
+        self.assertEqual({"b.py": 0, "a.py": 1, "c.py": 2}, self.composer.slots)
+        self.assertEqual((2 * 6, 2 * 8), self.composer.canvas_size())
+
+    def test_only_changed_cells_are_repainted(self):
+        frames = [{"a.py": "a1", "b.py": "b1"}, {"a.py": "a2", "b.py": "b1"}, {"b.py": "b1"}]
+        self.composer.assign_slots(frames)
+
+        images = list(self.composer.compose_frames(frames))
+
+        self.assertEqual(3, len(images))
+        self.assertEqual(3, self.composer.cells_painted)
+        self.assertEqual((255, 0, 0), images[0].getpixel((2, 2)))
+        self.assertEqual((0, 255, 0), images[1].getpixel((2, 2)))
+        self.assertEqual(self.composer.border_color, images[2].getpixel((2, 2)))
+        self.assertEqual((0, 0, 255), images[2].getpixel((8, 2)))
+
+    def test_oversized_tiles_are_cropped_to_the_cell(self):
+        self.composer.add_thumbnail(Image.new("RGB", (4, 20), (9, 9, 9)), CodeFile(content="", object_id="long"))
+
+        self.assertEqual(self.composer.cell_size, self.composer.tiles["long"].size)
+
+    def test_palette_tiles_keep_the_palette_canvas(self):
+        composer = TimeLapseComposer(columns=2, max_thumbnail_size=(4, 6))
+        tile = InkPalette.new_like(Image.new(InkPalette.MODE, (1, 1)), (4, 6), (0, 0, 0))
+        composer.add_thumbnail(tile, CodeFile(content="", object_id="p1"))
+        frames = [{"a.py": "p1"}, {}]
+        composer.assign_slots(frames)
+
+        first, second = composer.compose_frames(frames)
+
+        self.assertEqual(InkPalette.MODE, first.mode)
+        self.assertEqual(InkPalette.BORDER_INDEX, second.getpixel((2, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
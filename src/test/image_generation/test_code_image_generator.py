@@ -1,6 +1,8 @@
 import hashlib
 import unittest
 
+import numpy as np
+
 from PIL import Image
 
 from src.main.python.code_loading.code_file import CodeFile
@@ -27,6 +29,77 @@ class TestCodeImageGenerator(unittest.TestCase):
             f"Result hash: {generated_hash}\n"
         )
 
+    def test_edge_cases_match_per_character_reference(self):
+        cases = [
+            (
+                "if x:\r\n\tif y:\r\n\t\treturn 1\r\n",
+                CodeImageGenerator(10, 10, 2, 3, tab_size=4),
+                "d1ba651f8ff73ea78a33b5db8e8423b6"
+            ),
+            (
+                "a\x0cb c\rdd\u2028e\n\n  \t x",
+                CodeImageGenerator(1, 1, 3, 2, tab_size=3),
+                "0aec301395343a711cda59c9419df068"
+            ),
+            (
+                "xxxxxxxxxx\n\tx\n  y",
+                CodeImageGenerator(200, 5, 4, 4, tab_size=2),
+                "ed10a3ad8f87ff11fec999a7a79b9855"
+            ),
+        ]
+
+        for content, generator, expected_hash in cases:
+            with self.subTest(content=content):
+                generated_image = generator.generate_image(CodeFile(content, "test.java"))
+                self.assertEqual(expected_hash, self._calculate_image_hash(generated_image))
+
+    def test_empty_content_uses_minimum_size(self):
+        generated_image = self.generator.generate_image(CodeFile("", "empty.java"))
+
+        self.assertEqual((500, 1000), generated_image.size)
+        self.assertEqual([(500 * 1000, self.generator.background_color)], generated_image.getcolors())
+
+    def test_non_positive_point_size_is_rejected(self):
+        with self.assertRaises(ValueError):
+            CodeImageGenerator(point_width=0)
+
+    def test_coverage_thumbnail_matches_resampled_thumbnail(self):
+        content = "\n".join(
+            "\t" * (index % 4) + "def function_%d(argument):  # comment %s" % (index, "x" * (index % 37))
+            for index in range(600)
+        )
+        code_file = CodeFile(content, "long.py")
+        coverage_generator = CodeImageGenerator(100, 100, 3, 5, coverage_thumbnails=True)
+
+        for max_size in [(120, 400), (50, 50), (500, 200)]:
+            with self.subTest(max_size=max_size):
+                expected = CodeImageGenerator(100, 100, 3, 5).generate_thumbnail(code_file, max_size)
+                thumbnail = coverage_generator.generate_thumbnail(code_file, max_size)
+
+                self.assertEqual(expected.size, thumbnail.size)
+                difference = np.abs(np.asarray(expected, dtype=np.int16) - np.asarray(thumbnail, dtype=np.int16))
+                self.assertLess(difference.mean(), 8)
+
+    def test_coverage_thumbnail_keeps_images_that_already_fit(self):
+        code_file = CodeFile("a = 1\n\tb = 2\n", "small.py")
+        coverage_generator = CodeImageGenerator(10, 10, 2, 2, coverage_thumbnails=True)
+
+        thumbnail = coverage_generator.generate_thumbnail(code_file, (100, 100))
+
+        self.assertEqual(coverage_generator.generate_image(code_file).tobytes(), thumbnail.tobytes())
+
+    def test_coverage_thumbnail_averages_ink(self):
+        code_file = CodeFile("x x\tab\n  yy\n\tz\nend  .\n")
+        generator = CodeImageGenerator(8, 4, 1, 1, background_color=(0, 0, 0), text_color=(200, 100, 40),
+                                       tab_size=2, coverage_thumbnails=True)
+
+        full_image = np.asarray(generator.generate_image(code_file), dtype=np.float64)
+        thumbnail = generator.generate_thumbnail(code_file, (4, 2))
+
+        expected = full_image.reshape(2, 2, 4, 2, 3).mean(axis=(1, 3))
+        self.assertEqual((8, 4), (full_image.shape[1], full_image.shape[0]))
+        np.testing.assert_allclose(expected, np.asarray(thumbnail), atol=0.5)
+
     def _calculate_image_hash(self, image: Image.Image) -> str:
         return hashlib.md5(image.convert('RGB').tobytes()).hexdigest()
 
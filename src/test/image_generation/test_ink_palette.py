@@ -0,0 +1,88 @@
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+from src.main.python.image_generation.ink_palette import InkPalette
+from src.main.python.image_generation.parallel_image_renderer import ParallelImageRenderer
+
+
+class TestInkPalette(unittest.TestCase):
+    CONTENT = "\n".join("\t" * (index % 3) + "value_%d = call(%s)" % (index, "x" * (index % 23)) for index in range(300))
+
+    def setUp(self):
+        self.code_file = CodeFile(self.CONTENT, "sample.py")
+        self.rgb_generator = CodeImageGenerator(100, 100, 3, 5)
+
+    def palette_generator(self, **kwargs) -> CodeImageGenerator:
+        return CodeImageGenerator(100, 100, 3, 5, image_mode="P", **kwargs)
+
+    def assert_close(self, expected: Image.Image, actual: Image.Image, mean_tolerance: float, max_tolerance: int):
+        self.assertEqual(expected.size, actual.size)
+        difference = np.abs(
+            np.asarray(expected.convert("RGB"), dtype=np.int16) - np.asarray(actual.convert("RGB"), dtype=np.int16)
+        )
+        self.assertLessEqual(difference.mean(), mean_tolerance)
+        self.assertLessEqual(difference.max(), max_tolerance)
+
+    def test_ramp_runs_from_background_to_ink(self):
+        palette = InkPalette.colors((30, 31, 34), (188, 190, 196), (1, 2, 3))
+
+        self.assertEqual(256 * 3, len(palette))
+        self.assertEqual([30, 31, 34], palette[:3])
+        self.assertEqual([188, 190, 196], palette[InkPalette.INK_INDEX * 3:InkPalette.INK_INDEX * 3 + 3])
+        self.assertEqual([1, 2, 3], palette[-3:])
+
+    def test_palette_image_shows_same_colors(self):
+        image = self.palette_generator().generate_image(self.code_file)
+
+        self.assertEqual("P", image.mode)
+        self.assertEqual(self.rgb_generator.generate_image(self.code_file).tobytes(), image.convert("RGB").tobytes())
+
+    def test_thumbnails_are_resampled_in_index_space(self):
+        expected = self.rgb_generator.generate_thumbnail(self.code_file, (40, 90))
+
+        resampled = self.palette_generator().generate_thumbnail(self.code_file, (40, 90))
+        coverage = self.palette_generator(coverage_thumbnails=True).generate_thumbnail(self.code_file, (40, 90))
+
+        self.assertEqual(("P", "P"), (resampled.mode, coverage.mode))
+        # Bicubic overshoot beyond the ink and background colors is clamped to the ramp ends.
+        self.assert_close(expected, resampled, 1, 16)
+        self.assert_close(
+            CodeImageGenerator(100, 100, 3, 5, coverage_thumbnails=True).generate_thumbnail(self.code_file, (40, 90)),
+            coverage,
+            1,
+            1
+        )
+
+    def test_empty_content_is_background(self):
+        image = self.palette_generator().generate_image(CodeFile(""))
+
+        self.assertEqual([(100 * 100, InkPalette.BACKGROUND_INDEX)], image.getcolors())
+
+    def test_border_canvas_keeps_palette(self):
+        image = self.palette_generator().generate_image(self.code_file)
+
+        canvas = InkPalette.new_like(image, (4, 4), (9, 9, 9))
+
+        self.assertEqual("P", canvas.mode)
+        self.assertEqual((9, 9, 9), canvas.convert("RGB").getpixel((0, 0)))
+        self.assertEqual(image.getpalette()[:30], canvas.getpalette()[:30])
+
+    def test_palette_survives_encoding_for_worker_processes(self):
+        image = self.palette_generator().generate_image(self.code_file)
+
+        decoded = ParallelImageRenderer.decode_image(ParallelImageRenderer.encode_image(image))
+
+        self.assertEqual("P", decoded.mode)
+        self.assertEqual(image.convert("RGB").tobytes(), decoded.convert("RGB").tobytes())
+
+    def test_rejects_unknown_image_mode(self):
+        with self.assertRaises(ValueError):
+            CodeImageGenerator(image_mode="CMYK")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+import numpy as np
+
+from src.main.python.image_generation.line_layout import LineLayout
+
+
+class TestLineLayout(unittest.TestCase):
+
+    def test_spans_are_run_length_encoded_per_line(self):
+        layout = LineLayout.from_content("ab  c\n\tx\n", tab_size=3, point_width=2, point_height=4)
+
+        self.assertEqual(2, layout.line_count)
+        self.assertEqual(
+            [(0, 2, LineLayout.INK), (2, 2, LineLayout.BLANK), (4, 1, LineLayout.INK), (5, 1, LineLayout.BLANK)],
+            layout.line_spans(0)
+        )
+        self.assertEqual(
+            [(0, 1, LineLayout.BLANK), (1, 2, LineLayout.TAB_PADDING), (3, 1, LineLayout.INK),
+             (4, 1, LineLayout.BLANK)],
+            layout.line_spans(1)
+        )
+
+    def test_pixel_size(self):
+        layout = LineLayout.from_content("abc\n\t\nx", tab_size=4, point_width=3, point_height=5)
+
+        self.assertEqual([4, 5, 1], layout.line_widths.tolist())
+        self.assertEqual([12, 15, 3], layout.line_pixel_widths.tolist())
+        self.assertEqual(15, layout.width)
+        self.assertEqual(15, layout.height)
+
+    def test_line_breaks_follow_splitlines(self):
+        content = "a\r\nb\rc\x0cd e"
+        layout = LineLayout.from_content(content, tab_size=4, point_width=1, point_height=1)
+
+        self.assertEqual(len(content.splitlines()), layout.line_count)
+        self.assertEqual([len(line) for line in content.splitlines(keepends=True)], layout.line_widths.tolist())
+
+    def test_utf8_bytes_match_decoded_content(self):
+        content = "caf\u00e9\t\u00fcber\r\nx\u0085y\u2028z \U0001f600\u2029\ufeffend"
+        expected = LineLayout.from_content(content, tab_size=4, point_width=1, point_height=1)
+        layout = LineLayout.from_bytes(content.encode("utf-8"), tab_size=4, point_width=1, point_height=1)
+
+        self.assertEqual(expected.line_widths.tolist(), layout.line_widths.tolist())
+        for line_index in range(expected.line_count):
+            self.assertEqual(expected.line_spans(line_index), layout.line_spans(line_index))
+
+    def test_non_utf8_bytes_are_laid_out_as_latin1(self):
+        data = "na\u00efve  \u00a9 caf\u00e9\nfa\u00e7ade\x85x".encode("latin-1")
+        expected = LineLayout.from_content(data.decode("latin-1"), tab_size=4, point_width=1, point_height=1)
+        layout = LineLayout.from_bytes(data, tab_size=4, point_width=1, point_height=1)
+
+        self.assertFalse(LineLayout.is_utf8(np.frombuffer(data, dtype=np.uint8)))
+        self.assertEqual(expected.line_widths.tolist(), layout.line_widths.tolist())
+        self.assertEqual(expected.line_spans(0), layout.line_spans(0))
+
+    def test_indentation_widths(self):
+        layout = LineLayout.from_content("a\n  b\n\n \t\tc\n   \n", tab_size=3, point_width=1, point_height=1)
+
+        self.assertEqual([0, 2, -1, 7, -1], layout.indentation_widths.tolist())
+        self.assertEqual([], LineLayout.empty(1, 1).indentation_widths.tolist())
+
+    def test_empty_content(self):
+        layout = LineLayout.from_content("", tab_size=4, point_width=3, point_height=3)
+
+        self.assertEqual(0, layout.line_count)
+        self.assertEqual((0, 0), (layout.width, layout.height))
+        self.assertEqual((0, 8), layout.to_occupancy_grid(8).shape)
+
+    def test_occupancy_grid(self):
+        layout = LineLayout.from_content("a \tb\nc", tab_size=2, point_width=1, point_height=1)
+
+        self.assertEqual(
+            [[1, 0, 0, -1, 1, 0, -1],
+             [1, -1, -1, -1, -1, -1, -1]],
+            layout.to_occupancy_grid(7).tolist()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
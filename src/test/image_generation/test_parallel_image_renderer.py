@@ -0,0 +1,49 @@
+import unittest
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+from src.main.python.image_generation.parallel_image_renderer import ParallelImageRenderer
+
+
+class TestParallelImageRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = CodeImageGenerator(10, 10, 2, 2)
+        self.code_files = [
+            CodeFile("x" * index + "\n\ty = 1\n" * (index % 4), f"file_{index}.py")
+            for index in range(11)
+        ]
+
+    def test_parallel_rendering_keeps_input_order(self):
+        renderer = ParallelImageRenderer(self.generator, workers=2, chunk_size=3, max_pending_chunks=2)
+
+        results = list(renderer.render(self.code_files))
+
+        self.assertEqual([code_file.filename for code_file in self.code_files],
+                         [code_file.filename for _, code_file in results])
+        for image, code_file in results:
+            expected = self.generator.generate_image(code_file)
+            self.assertEqual(expected.size, image.size)
+            self.assertEqual(expected.tobytes(), image.tobytes())
+
+    def test_single_worker_renders_in_process(self):
+        renderer = ParallelImageRenderer(self.generator, workers=1)
+
+        results = list(renderer.render(self.code_files[:2]))
+
+        self.assertEqual(self.code_files[:2], [code_file for _, code_file in results])
+
+    def test_encoding_round_trip(self):
+        image = self.generator.generate_image(self.code_files[5])
+
+        decoded = ParallelImageRenderer.decode_image(ParallelImageRenderer.encode_image(image))
+
+        self.assertEqual(image.tobytes(), decoded.tobytes())
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            ParallelImageRenderer(self.generator, chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import shutil
+import tempfile
+import unittest
+
+from PIL import Image
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+from src.main.python.image_generation.parallel_image_renderer import ParallelImageRenderer
+from src.main.python.image_generation.render_cache import RenderCache
+
+
+class CountingGenerator(CodeImageGenerator):
+    def __init__(self):
+        super().__init__(10, 10, 2, 2)
+        self.generated = 0
+
+    def generate_image(self, code_file: CodeFile) -> Image.Image:
+        self.generated += 1
+        return super().generate_image(code_file)
+
+
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.generator = CodeImageGenerator(10, 10, 2, 2)
+        self.code_file = CodeFile("def f():\n\treturn 1\n", "f.py")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_round_trip(self):
+        cache = RenderCache(self.cache_dir)
+        image = self.generator.generate_image(self.code_file)
+        key = cache.key_for(self.code_file, self.generator)
+
+        self.assertIsNone(cache.get(key))
+        cache.put(key, image)
+        cached_image = cache.get(key)
+
+        self.assertEqual(image.tobytes(), cached_image.tobytes())
+        statistics = cache.statistics()
+        self.assertEqual((1, 1, 1), (statistics.hits, statistics.misses, statistics.entry_count))
+        self.assertEqual(0.5, statistics.hit_rate)
+
+    def test_key_depends_on_content_parameters_and_thumbnail_size(self):
+        cache = RenderCache(self.cache_dir)
+        key = cache.key_for(self.code_file, self.generator)
+
+        self.assertEqual(key, cache.key_for(CodeFile(self.code_file.content, "other.py"), self.generator))
+        self.assertNotEqual(key, cache.key_for(CodeFile("changed", "f.py"), self.generator))
+        self.assertNotEqual(key, cache.key_for(self.code_file, CodeImageGenerator(10, 10, 2, 2, tab_size=2)))
+        self.assertNotEqual(key, cache.key_for(self.code_file, self.generator, (50, 50)))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        image = Image.new("RGB", (64, 64), (30, 31, 34))
+        cache = RenderCache(self.cache_dir)
+        cache.put("aa", image)
+        entry_size = cache.statistics().size_bytes
+
+        cache = RenderCache(self.cache_dir, max_bytes=2 * entry_size)
+        cache.put("bb", image)
+        cache.get("aa")
+        cache.put("cc", image)
+
+        self.assertIsNotNone(cache.get("aa"))
+        self.assertIsNone(cache.get("bb"))
+        self.assertIsNotNone(cache.get("cc"))
+        self.assertEqual(1, cache.statistics().evictions)
+
+    def test_entries_survive_restart(self):
+        key = RenderCache(self.cache_dir).key_for(self.code_file, self.generator)
+        RenderCache(self.cache_dir).put(key, self.generator.generate_image(self.code_file))
+
+        self.assertIsNotNone(RenderCache(self.cache_dir).get(key))
+
+    def test_renderer_skips_cached_files(self):
+        generator = CountingGenerator()
+        code_files = [CodeFile(f"x = {index}\n" * index, f"{index}.py") for index in range(5)]
+
+        first_run = ParallelImageRenderer(generator, workers=1, cache=RenderCache(self.cache_dir))
+        expected = [image.tobytes() for image, _ in first_run.render_thumbnails(code_files, (4, 4))]
+
+        second_run = ParallelImageRenderer(generator, workers=1, cache=RenderCache(self.cache_dir))
+        cached = [image.tobytes() for image, _ in second_run.render_thumbnails(code_files, (4, 4))]
+
+        self.assertEqual(expected, cached)
+        self.assertEqual(5, generator.generated)
+        self.assertEqual(5, second_run.cache.statistics().hits)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from src.main.python.image_generation.line_layout import LineLayout
+from src.main.python.metrics.code_metrics import CodeMetrics, NestingHotSpot
+
+
+class TestCodeMetrics(unittest.TestCase):
+
+    def metrics_for(self, content: str, tab_size: int = 4) -> CodeMetrics:
+        return CodeMetrics.from_layout("file.py", LineLayout.from_content(content, tab_size, 1, 1), tab_size)
+
+    def test_depth_from_spaces(self):
+        content = "def f():\n  if x:\n    y = 1\n\n  return y\n"
+
+        metrics = self.metrics_for(content)
+
+        self.assertEqual(5, metrics.line_count)
+        self.assertEqual(4, metrics.code_line_count)
+        self.assertEqual(2, metrics.indent_unit)
+        self.assertEqual(2, metrics.max_depth)
+        self.assertEqual(1.0, metrics.mean_depth)
+        self.assertEqual(len("  return y\n"), metrics.max_line_width)
+
+    def test_depth_from_tabs(self):
+        metrics = self.metrics_for("a\n\tb\n\t\tc\n", tab_size=4)
+
+        self.assertEqual(4, metrics.indent_unit)
+        self.assertEqual(2, metrics.max_depth)
+
+    def test_hot_spots_cover_deeply_nested_runs(self):
+        lines = ["top"] + [" " * depth + "x" for depth in range(1, 7)] + ["top", "", "      deep", "top"]
+
+        metrics = self.metrics_for("\n".join(lines) + "\n")
+
+        self.assertEqual(6, metrics.max_depth)
+        self.assertEqual((NestingHotSpot(5, 7, 6), NestingHotSpot(10, 10, 6)), metrics.hot_spots)
+        self.assertEqual(3, metrics.hot_spots[0].line_count)
+
+    def test_hot_spots_are_limited(self):
+        block = "x\n" + "".join(" " * depth + "y\n" for depth in range(1, 5))
+        content = block * (CodeMetrics.MAX_HOT_SPOTS + 3)
+
+        metrics = self.metrics_for(content)
+
+        self.assertEqual(CodeMetrics.MAX_HOT_SPOTS, len(metrics.hot_spots))
+        self.assertEqual(5, metrics.hot_spots[0].first_line)
+
+    def test_files_without_code(self):
+        for content in ("", "\n\n   \n"):
+            with self.subTest(content=content):
+                metrics = self.metrics_for(content)
+
+                self.assertEqual(0, metrics.code_line_count)
+                self.assertEqual(0, metrics.max_depth)
+                self.assertEqual((), metrics.hot_spots)
+
+
+if __name__ == '__main__':
+    unittest.main()
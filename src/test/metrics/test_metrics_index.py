@@ -0,0 +1,84 @@
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.main.python.metrics.code_metrics import CodeMetrics, NestingHotSpot
+from src.main.python.metrics.metrics_index import MetricsIndex
+
+
+class TestMetricsIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.index = MetricsIndex(str(Path(self.test_dir) / "report" / MetricsIndex.INDEX_FILENAME))
+        self.metrics = [
+            CodeMetrics("src/a.py", 10, 8, 40, 4, 1, 0.5, content_hash="0123abcd"),
+            CodeMetrics("src/b.py", 300, 250, 90, 4, 7, 2.5, (NestingHotSpot(20, 40, 7), NestingHotSpot(90, 91, 5))),
+            CodeMetrics("lib/c.js", 120, 100, 70, 2, 4, 1.5, (NestingHotSpot(3, 3, 4),)),
+            CodeMetrics(None, 5, 5, 5, 4, 0, 0.0)
+        ]
+        self.index.replace_all(self.metrics)
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_round_trip(self):
+        self.assertEqual(3, len(self.index))
+        self.assertEqual(self.metrics[1], self.index.get("src/b.py"))
+        self.assertIsNone(self.index.get("missing.py"))
+
+    def test_worst_files(self):
+        self.assertEqual(["src/b.py", "lib/c.js"], [entry.filename for entry in self.index.worst("max_depth", 2)])
+        self.assertEqual(["src/b.py"], [entry.filename for entry in self.index.worst("line_count", 1)])
+
+    def test_filtering_and_sorting(self):
+        results = self.index.query(order_by="line_count", descending=False, path_pattern="src/*")
+        self.assertEqual(["src/a.py", "src/b.py"], [entry.filename for entry in results])
+
+        deep = self.index.query(min_depth=4, min_lines=200)
+        self.assertEqual(["src/b.py"], [entry.filename for entry in deep])
+
+    def test_values(self):
+        self.assertEqual({"src/a.py": 10, "src/b.py": 300, "lib/c.js": 120}, self.index.values("line_count"))
+
+    def test_update_replaces_entries_and_hot_spots(self):
+        self.index.update([CodeMetrics("src/b.py", 12, 12, 10, 4, 1, 0.5)])
+
+        self.assertEqual((), self.index.get("src/b.py").hot_spots)
+        self.assertEqual(3, len(self.index))
+
+    def test_replace_all_drops_missing_files(self):
+        self.index.replace_all(self.metrics[:1])
+
+        self.assertEqual(1, len(self.index))
+        self.assertIsNone(self.index.get("lib/c.js"))
+
+    def test_persists_between_connections(self):
+        self.index.close()
+
+        with MetricsIndex(str(self.index.path)) as reopened:
+            self.assertEqual(self.metrics[2], reopened.get("lib/c.js"))
+
+        self.index = MetricsIndex(str(self.index.path))
+
+    def test_index_from_another_schema_version_is_rebuilt(self):
+        path = Path(self.test_dir) / "old.sqlite"
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE files (filename TEXT PRIMARY KEY, line_count INTEGER)")
+        connection.commit()
+        connection.close()
+
+        with MetricsIndex(str(path)) as index:
+            index.replace_all(self.metrics[:1])
+            self.assertEqual(self.metrics[0], index.get("src/a.py"))
+
+    def test_unknown_metric(self):
+        with self.assertRaises(ValueError):
+            self.index.worst("filename; DROP TABLE files", 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.code_loading.file_system_loader import FileSystemLoader
+from src.main.python.code_loading.git_file_loader import GitFileLoader
+from src.main.python.image_composition.html_image_composer import HtmlImageComposer
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+from src.main.python.metrics.metrics_index import MetricsIndex
+from src.main.python.pipeline.streaming_pipeline import FileMetadata, StreamingPipeline
+
+
+class RecordingSink:
+    def __init__(self):
+        self.thumbnail_size = (100, 100)
+        self.added = []
+
+    def add_thumbnail(self, thumbnail, code_file):
+        self.added.append((thumbnail.size, Path(code_file.filename).name))
+
+
+class CountingGenerator(CodeImageGenerator):
+    def __init__(self):
+        super().__init__(10, 1, 2, 2)
+        self.generated = 0
+
+    def generate_image(self, code_file):
+        self.generated += 1
+        return super().generate_image(code_file)
+
+
+class ReadCountingGitFileLoader(GitFileLoader):
+    def __init__(self):
+        super().__init__()
+        self.read_files = []
+
+    def _read_file(self, file_path):
+        self.read_files.append(str(file_path))
+        return super()._read_file(file_path)
+
+
+class TestStreamingPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.line_counts = {"short.py": 1, "long.py": 9, "medium.py": 4, "notes.txt": 20}
+        for filename, line_count in self.line_counts.items():
+            (Path(self.test_dir) / filename).write_text("x = 1\n" * line_count)
+
+        self.generator = CodeImageGenerator(10, 1, 2, 2)
+        self.pipeline = StreamingPipeline(FileSystemLoader(), self.generator)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_run_adds_images_tallest_first(self):
+        sink = RecordingSink()
+
+        metadata = self.pipeline.run([self.test_dir], ["*.py"], [], sink)
+
+        self.assertEqual(["long.py", "medium.py", "short.py"], [filename for _, filename in sink.added])
+        self.assertEqual([18, 8, 2], [entry.height for entry in metadata])
+        self.assertEqual([size[1] for size, _ in sink.added], [entry.height for entry in metadata])
+
+    def test_collect_metadata_does_not_keep_content(self):
+        metadata = self.pipeline.collect_metadata([self.test_dir], ["*.txt"])
+
+        self.assertEqual(1, len(metadata))
+        self.assertEqual(str(Path(self.test_dir).resolve() / "notes.txt"), metadata[0].filename)
+        self.assertEqual(40, metadata[0].height)
+        self.assertEqual(CodeFile("x = 1\n" * 20).content_hash(), metadata[0].content_hash)
+        self.assertEqual(metadata[0].filename, metadata[0].metrics.filename)
+        self.assertEqual(20, metadata[0].metrics.line_count)
+        self.assertEqual(0, metadata[0].metrics.max_depth)
+
+    def test_sort_by_height_is_stable(self):
+        metadata = [FileMetadata("a", 2), FileMetadata("b", 5), FileMetadata("c", 2)]
+
+        self.assertEqual(["b", "a", "c"], [entry.filename for entry in StreamingPipeline.sort_by_height(metadata)])
+
+    def test_incremental_run_renders_only_changed_files(self):
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+
+        first_composer = HtmlImageComposer(output_dir, thumbnail_size=(20, 20), incremental=True)
+        self.pipeline.run([self.test_dir], ["*.py"], [], first_composer)
+        first_composer.generate_html()
+
+        (Path(self.test_dir) / "medium.py").write_text("y = 2\n" * 6)
+        generator = CountingGenerator()
+        pipeline = StreamingPipeline(FileSystemLoader(), generator)
+        second_composer = HtmlImageComposer(output_dir, thumbnail_size=(20, 20), incremental=True)
+        pipeline.run([self.test_dir], ["*.py"], [], second_composer)
+
+        self.assertEqual(1, generator.generated)
+        self.assertEqual(["long.py", "medium.py", "short.py"],
+                         [Path(filename).name for _, filename in second_composer.image_paths])
+
+    def test_git_run_reads_only_files_changed_since_the_previous_run(self):
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+        git_environment = {**os.environ, "GIT_CONFIG_GLOBAL": os.devnull, "GIT_CONFIG_NOSYSTEM": "1",
+                           "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+                           "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com"}
+        for arguments in (["init", "-q"], ["add", "-A"], ["commit", "-q", "-m", "initial"]):
+            subprocess.run(["git", *arguments], cwd=self.test_dir, env=git_environment, check=True)
+
+        with MetricsIndex(str(Path(output_dir) / MetricsIndex.INDEX_FILENAME)) as metrics_index:
+            first_composer = HtmlImageComposer(output_dir, thumbnail_size=(20, 20), incremental=True)
+            pipeline = StreamingPipeline(GitFileLoader(), self.generator, previous_metrics=metrics_index)
+            first_metadata = pipeline.run([self.test_dir], ["*.py"], [], first_composer)
+            first_composer.generate_html()
+            metrics_index.replace_all(entry.metrics for entry in first_metadata)
+
+            (Path(self.test_dir) / "medium.py").write_text("y = 2\n" * 6)
+            loader = ReadCountingGitFileLoader()
+            generator = CountingGenerator()
+            second_composer = HtmlImageComposer(output_dir, thumbnail_size=(20, 20), incremental=True)
+            pipeline = StreamingPipeline(loader, generator, previous_metrics=metrics_index)
+            second_metadata = pipeline.run([self.test_dir], ["*.py"], [], second_composer)
+
+        # The changed file is read for its metadata and again for rendering; unchanged files are never opened.
+        self.assertEqual({"medium.py"}, {Path(filename).name for filename in loader.read_files})
+        self.assertEqual(1, generator.generated)
+        self.assertEqual([18, 12, 2], [entry.height for entry in second_metadata])
+        self.assertEqual(["long.py", "medium.py", "short.py"],
+                         [Path(filename).name for _, filename in second_composer.image_paths])
+
+    def test_git_run_after_a_commit_carries_unchanged_files_over(self):
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+        git_environment = {**os.environ, "GIT_CONFIG_GLOBAL": os.devnull, "GIT_CONFIG_NOSYSTEM": "1",
+                           "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+                           "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com"}
+
+        def git(*arguments):
+            subprocess.run(["git", *arguments], cwd=self.test_dir, env=git_environment, check=True)
+
+        git("init", "-q")
+        git("add", "-A")
+        git("commit", "-q", "-m", "initial")
+
+        with MetricsIndex(str(Path(output_dir) / MetricsIndex.INDEX_FILENAME)) as metrics_index:
+            first_composer = HtmlImageComposer(output_dir, thumbnail_size=(20, 20), incremental=True)
+            pipeline = StreamingPipeline(GitFileLoader(), self.generator, previous_metrics=metrics_index)
+            metrics_index.replace_all(entry.metrics for entry in pipeline.run([self.test_dir], ["*.py"], [],
+                                                                                first_composer))
+            first_composer.generate_html()
+
+            (Path(self.test_dir) / "short.py").write_text("y = 2\n" * 2)
+            git("commit", "-q", "-am", "change short")
+            loader = ReadCountingGitFileLoader()
+            second_composer = HtmlImageComposer(output_dir, thumbnail_size=(20, 20), incremental=True)
+            pipeline = StreamingPipeline(loader, self.generator, previous_metrics=metrics_index)
+            second_metadata = pipeline.run([self.test_dir], ["*.py"], [], second_composer)
+            second_composer.generate_html()
+            metrics_index.replace_all(entry.metrics for entry in second_metadata)
+
+            self.assertEqual(3, len(metrics_index))
+
+        self.assertEqual({"short.py"}, {Path(filename).name for filename in loader.read_files})
+        self.assertEqual(["long.py", "medium.py", "short.py"],
+                         [Path(filename).name for _, filename in second_composer.image_paths])
+        images_dir = Path(output_dir) / HtmlImageComposer.IMAGES_DIRECTORY_NAME
+        self.assertEqual(["long.png", "medium.png", "short.png"], sorted(path.name for path in images_dir.iterdir()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import json
+import pickle
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.main.python.code_loading.code_file import CodeFile
+from src.main.python.code_loading.file_system_loader import FileSystemLoader
+from src.main.python.image_composition.html_image_composer import HtmlImageComposer
+from src.main.python.image_composition.image_concatenator import ImageConcatenator
+from src.main.python.image_generation.code_image_generator import CodeImageGenerator
+from src.main.python.image_generation.parallel_image_renderer import ParallelImageRenderer
+from src.main.python.profiling.profiler import InstrumentedMethod, Profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for index in range(1, 4):
+            (Path(self.test_dir) / f"file_{index}.py").write_text("x = 1\n" * index * 10)
+        self.profiler = Profiler(slowest_file_count=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_stage_counters(self):
+        loader = self.profiler.instrument(FileSystemLoader())
+        generator = self.profiler.instrument(CodeImageGenerator(10, 1, 2, 2))
+        concatenator = self.profiler.instrument(ImageConcatenator(columns=2, max_thumbnail_size=(20, 20)))
+
+        code_files = loader.load_code_files([self.test_dir], ["*.py"])
+        for code_file in code_files:
+            concatenator.add_image(generator.generate_image(code_file), code_file)
+        composite = concatenator.concatenate()
+
+        stages = self.profiler.report()["stages"]
+        self.assertEqual(1, stages["FileSystemLoader.load_code_files"]["calls"])
+        self.assertEqual(3, stages["FileSystemLoader.load_code_files"]["files"])
+        self.assertEqual(3, stages["FileSystemLoader.iter_code_files"]["files"])
+        self.assertEqual(sum(len(code_file.content) for code_file in code_files),
+                         stages["FileSystemLoader.load_code_files"]["bytes"])
+        self.assertEqual(3, stages["CodeImageGenerator.generate_image"]["calls"])
+        self.assertGreater(stages["CodeImageGenerator.generate_image"]["pixels"], 0)
+        self.assertEqual(composite.width * composite.height, stages["ImageConcatenator.concatenate"]["pixels"])
+
+    def test_slowest_files_are_limited_and_sorted(self):
+        generator = self.profiler.instrument(CodeImageGenerator(10, 1, 2, 2))
+        for index in range(5):
+            generator.generate_image(CodeFile("x = 1\n" * index, f"file_{index}.py"))
+
+        slowest = self.profiler.slowest_files()
+
+        self.assertEqual(2, len(slowest))
+        self.assertGreaterEqual(slowest[0].seconds, slowest[1].seconds)
+
+    def test_generator_methods_stay_lazy(self):
+        loader = self.profiler.instrument(FileSystemLoader())
+
+        iterator = loader.iter_code_files([self.test_dir], ["*.py"])
+        self.assertNotIn("FileSystemLoader.iter_code_files", self.profiler.stages)
+
+        next(iterator)
+        self.assertEqual(1, self.profiler.stages["FileSystemLoader.iter_code_files"].files)
+
+    def test_html_composition_and_exports(self):
+        output_directory = Path(self.test_dir) / "html"
+        composer = self.profiler.instrument(HtmlImageComposer(str(output_directory), columns=2))
+        generator = CodeImageGenerator(10, 1, 2, 2)
+        code_file = CodeFile("x = 1\n", "file.py")
+
+        with self.profiler.stage("run") as measurement:
+            composer.add_image(generator.generate_image(code_file), code_file)
+            composer.generate_html()
+            measurement.add(code_file)
+
+        report_path = Path(self.test_dir) / "profile.json"
+        trace_path = Path(self.test_dir) / "trace.json"
+        self.profiler.write_report(str(report_path))
+        self.profiler.write_chrome_trace(str(trace_path))
+
+        report = json.loads(report_path.read_text())
+        self.assertIn("HtmlImageComposer.add_image", report["stages"])
+        self.assertIn("HtmlImageComposer.generate_html", report["stages"])
+        self.assertEqual(1, report["stages"]["run"]["files"])
+
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        complete_events = [event for event in events if event["ph"] == "X"]
+        self.assertEqual({"HtmlImageComposer.add_image", "HtmlImageComposer.add_thumbnail",
+                          "HtmlImageComposer.generate_html", "run"},
+                         {event["name"] for event in complete_events})
+        self.assertTrue(all(event["dur"] >= 0 for event in complete_events))
+
+    def test_instrumenting_twice_does_not_double_count(self):
+        generator = CodeImageGenerator(10, 1, 2, 2)
+        self.profiler.instrument(generator)
+        self.profiler.instrument(generator)
+
+        generator.generate_image(CodeFile("x = 1\n", "file.py"))
+
+        self.assertEqual(1, self.profiler.stages["CodeImageGenerator.generate_image"].calls)
+
+    def test_instrumented_generator_can_be_sent_to_workers(self):
+        generator = self.profiler.instrument(CodeImageGenerator(10, 1, 2, 2))
+
+        restored = pickle.loads(pickle.dumps(generator))
+        self.assertNotIsInstance(restored.generate_image, InstrumentedMethod)
+
+        renderer = ParallelImageRenderer(generator, workers=2, chunk_size=1)
+        code_files = [CodeFile("x = 1\n" * index, f"file_{index}.py") for index in range(1, 4)]
+        rendered = list(renderer.render(code_files))
+
+        self.assertEqual(code_files, [code_file for _, code_file in rendered])
+
+    def test_uninstrumented_objects_are_untouched(self):
+        generator = CodeImageGenerator(10, 1, 2, 2)
+
+        generator.generate_image(CodeFile("x = 1\n", "file.py"))
+
+        self.assertNotIn("generate_image", vars(generator))
+        self.assertEqual({}, self.profiler.stages)
+
+
+if __name__ == '__main__':
+    unittest.main()
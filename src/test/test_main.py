@@ -0,0 +1,182 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+from src.main.python import main
+from src.main.python.metrics.metrics_index import MetricsIndex
+
+
+class TestMain(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.test_dir / "source"
+        self.source_dir.mkdir()
+        for index in range(1, 4):
+            (self.source_dir / f"file_{index}.py").write_text("if x:\n\ty = 1\n" * index)
+        (self.source_dir / "notes.txt").write_text("not code\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def run_main(self, *arguments: str) -> str:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(0, main.main([str(self.source_dir), "--workers", "1", *arguments]))
+        return output.getvalue()
+
+    def test_html_output(self):
+        output_dir = self.test_dir / "html"
+
+        self.run_main("--output", str(output_dir), "--min-size", "1x1", "--point-size", "1x1", "--incremental")
+
+        manifest = json.loads((output_dir / "manifest.json").read_text())
+        self.assertEqual(["file_3.py", "file_2.py", "file_1.py"],
+                         [Path(entry["source"]).name for entry in manifest["entries"]])
+        self.assertTrue((output_dir / "index.html").is_file())
+
+    def test_image_format_is_case_insensitive(self):
+        output_dir = self.test_dir / "html"
+
+        self.run_main("--output", str(output_dir), "--image-format", "webp")
+
+        self.assertEqual(3, len(list((output_dir / "images").glob("*.webp"))))
+
+    def test_metrics_index_is_written_next_to_the_report(self):
+        output_dir = self.test_dir / "html"
+        (self.source_dir / "deep.py").write_text("".join(" " * depth + "x\n" for depth in range(8)))
+
+        printed = self.run_main("--output", str(output_dir), "--worst", "1")
+
+        with MetricsIndex(str(output_dir / MetricsIndex.INDEX_FILENAME)) as index:
+            self.assertEqual(4, len(index))
+            worst = index.worst("max_depth", 1)[0]
+        self.assertEqual("deep.py", Path(worst.filename).name)
+        self.assertEqual(7, worst.max_depth)
+        self.assertIn("deep.py  (hot spots: 5-8)", printed)
+
+    def test_git_loader_lists_files_through_git(self):
+        environment = {**os.environ, "GIT_CONFIG_GLOBAL": os.devnull, "GIT_CONFIG_NOSYSTEM": "1"}
+        (self.source_dir / ".gitignore").write_text("file_3.py\n")
+        subprocess.run(["git", "init", "-q"], cwd=self.source_dir, env=environment, check=True)
+        output_dir = self.test_dir / "html"
+
+        self.run_main("--loader", "git", "--output", str(output_dir), "--incremental")
+        self.run_main("--loader", "git", "--output", str(output_dir), "--incremental")
+
+        manifest = json.loads((output_dir / "manifest.json").read_text())
+        self.assertEqual({"file_1.py", "file_2.py"}, {Path(entry["source"]).name for entry in manifest["entries"]})
+
+    def test_git_objects_loader_renders_a_revision_without_checkout(self):
+        environment = {**os.environ, "GIT_CONFIG_GLOBAL": os.devnull, "GIT_CONFIG_NOSYSTEM": "1",
+                       "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+                       "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com"}
+        for arguments in (["init", "-q"], ["add", "-A"], ["commit", "-q", "-m", "initial"]):
+            subprocess.run(["git", *arguments], cwd=self.source_dir, env=environment, check=True)
+        (self.source_dir / "file_1.py").unlink()
+        output_dir = self.test_dir / "html"
+
+        self.run_main("--loader", "git-objects", "--revision", "HEAD", "--output", str(output_dir), "--incremental")
+
+        manifest = json.loads((output_dir / "manifest.json").read_text())
+        self.assertEqual({"file_1.py", "file_2.py", "file_3.py"},
+                         {Path(entry["source"]).name for entry in manifest["entries"]})
+
+    def test_history_output_as_animation(self):
+        environment = {**os.environ, "GIT_CONFIG_GLOBAL": os.devnull, "GIT_CONFIG_NOSYSTEM": "1",
+                       "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+                       "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com"}
+        subprocess.run(["git", "init", "-q"], cwd=self.source_dir, env=environment, check=True)
+        for index in range(1, 4):
+            subprocess.run(["git", "add", f"file_{index}.py"], cwd=self.source_dir, env=environment, check=True)
+            subprocess.run(["git", "commit", "-q", "-m", f"add {index}"], cwd=self.source_dir, env=environment,
+                           check=True)
+        output_path = self.test_dir / "history.gif"
+
+        printed = self.run_main("--output-mode", "history", "--output", str(output_path), "--max-frames", "2")
+
+        with Image.open(output_path) as animation:
+            self.assertEqual(2, animation.n_frames)
+        self.assertIn("History: 2 frames", printed)
+
+    def test_git_objects_loader_is_closed_when_rendering_fails(self):
+        with patch.object(main, "render", side_effect=RuntimeError("render failed")), \
+                patch.object(main.GitObjectLoader, "close", autospec=True) as close, \
+                self.assertRaises(RuntimeError):
+            main.main([str(self.source_dir), "--loader", "git-objects", "--output", str(self.test_dir / "html")])
+
+        close.assert_called_once()
+
+    def test_concatenated_output(self):
+        output_path = self.test_dir / "overview.png"
+
+        self.run_main("--output-mode", "concatenated", "--output", str(output_path),
+                      "--columns", "2", "--thumbnail-size", "20x20", "--pattern", "*.py", "--pattern", "*.txt")
+
+        with Image.open(output_path) as overview:
+            # Four 20x15 thumbnails plus borders in two rows of two.
+            self.assertEqual((44, 34), overview.size)
+        self.assertTrue((self.test_dir / "overview.metrics.sqlite").is_file())
+
+    def test_profile_prints_stage_timings_and_writes_exports(self):
+        profile_dir = self.test_dir / "profile"
+
+        printed = self.run_main("--output", str(self.test_dir / "html"), "--profile",
+                                "--profile-output", str(profile_dir), "--memory-budget", "64M")
+
+        self.assertIn("ParallelImageRenderer.render_thumbnails", printed)
+        self.assertIn("HtmlImageComposer.generate_html", printed)
+        report = json.loads((profile_dir / "profile.json").read_text())
+        self.assertEqual(3, report["stages"]["HtmlImageComposer.add_thumbnail"]["files"])
+        self.assertIn("traceEvents", json.loads((profile_dir / "trace.json").read_text()))
+
+    def test_render_cache_and_incremental_runs(self):
+        arguments = ("--output", str(self.test_dir / "html"), "--cache-dir", str(self.test_dir / "cache"),
+                     "--incremental")
+
+        self.run_main(*arguments)
+        printed = self.run_main(*arguments)
+
+        self.assertIn("Render cache:", printed)
+        self.assertTrue(any((self.test_dir / "cache").iterdir()))
+
+    def test_incremental_requires_html_output(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main.main([str(self.source_dir), "--output-mode", "tiles", "--incremental"])
+
+    def test_virtual_report(self):
+        output_dir = self.test_dir / "html"
+
+        self.run_main("--output", str(output_dir), "--virtual")
+
+        script = (output_dir / "report.js").read_text()
+        self.assertEqual(3, script.count("images/file_"))
+
+    def test_virtual_report_requires_grid_html_output(self):
+        for arguments in (["--output-mode", "tiles"], ["--packer", "skyline"]):
+            with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                main.main([str(self.source_dir), "--virtual", *arguments])
+
+    def test_argument_parsers(self):
+        self.assertEqual((400, 300), main.parse_size("400x300"))
+        self.assertEqual(512 * 1024 ** 2, main.parse_byte_count("512M"))
+        self.assertEqual(2 * 1024 ** 3, main.parse_byte_count("2GiB"))
+        self.assertEqual(100, main.parse_byte_count("100"))
+        with self.assertRaises(argparse.ArgumentTypeError):
+            main.parse_size("400")
+        with self.assertRaises(argparse.ArgumentTypeError):
+            main.parse_byte_count("lots")
+
+
+if __name__ == '__main__':
+    unittest.main()